@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Görüntü işleme benchmark'ı - Kamera gerektirmeden algılayıcıların süresini ölçer
+Kareler synthetic_track ile config.py'deki pist ölçülerinden üretilir.
+Her aşama için ortalama/yüzdelik süreler ve ulaşılabilir FPS JSON olarak kaydedilir,
+kayıtlı bir temel (baseline) sonuca göre gerileme varsa çıkış kodu 1 olur.
+
+Kullanım:
+    python3 benchmark_vision.py
+    python3 benchmark_vision.py --iterations 5000 --save-baseline
+    python3 benchmark_vision.py --baseline benchmark_results/vision_baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import argparse
+import platform
+import config
+import numpy as np
+from loguru import logger
+
+# Loglama ayarları - algılayıcıların logları ölçümü etkilemesin
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+import cv2
+from frame_context import FrameContext
+from line_detector import LineDetector
+from obstacle_detector import ObstacleDetector
+from synthetic_track import straight_track
+
+DEFAULT_OUTPUT = os.path.join("benchmark_results", "vision_latest.json")
+DEFAULT_BASELINE = os.path.join("benchmark_results", "vision_baseline.json")
+
+def log(message):
+    print(f"[BENCH] {message}")
+
+def generate_frames(count, seed=0, noise_sigma=3.0):
+    """
+    Rastgele robot pozlarından sentetik kareler üretir
+
+    Karelerin yaklaşık yarısı yalnızca şerit, dörtte biri zemin geçidi yakını,
+    dörtte biri engel yakını görüntülerdir.
+
+    Returns:
+        frames: BGR görüntü listesi
+    """
+    rng = np.random.default_rng(seed)
+    world = straight_track()
+    lane_center = -config.TRACK_WIDTH / 4
+    frames = []
+
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            # Zemin geçidi alt ROI'de (kamera ~22-30 cm önünü görür)
+            s = world.crosswalks[0] + rng.uniform(-20, 15)
+        elif kind == 1:
+            # Engelin önü (algılama mesafesinde)
+            s = world.obstacles[0].s - rng.uniform(60, 200)
+        else:
+            # Yalnızca şerit
+            s = rng.uniform(20, world.crosswalks[0] - 120)
+
+        pose = world.pose_at(s, lane_center + rng.uniform(-10, 10), math.radians(rng.uniform(-10, 10)))
+        frames.append(world.render_view(pose, noise_sigma=noise_sigma, rng=rng))
+
+    return frames
+
+def time_stage(function, frames, iterations):
+    """
+    Bir aşamayı kareler üzerinde döngüyle çalıştırır ve süreleri ölçer
+
+    Returns:
+        durations_ms: Her çağrının süresi (ms)
+    """
+    durations = np.empty(iterations, dtype=np.float64)
+    count = len(frames)
+    for i in range(iterations):
+        frame = frames[i % count]
+        start = time.perf_counter_ns()
+        function(frame)
+        durations[i] = (time.perf_counter_ns() - start) / 1e6
+    return durations
+
+def summarize(durations_ms):
+    """
+    Süre dizisinin özetini döndürür
+    """
+    p50, p95, p99 = np.percentile(durations_ms, [50, 95, 99])
+    mean = float(durations_ms.mean())
+    return {
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(durations_ms.max()), 4),
+        "fps": round(1000.0 / mean, 1) if mean > 0 else None,
+    }
+
+def build_stages(line_detector, obstacle_detector, lores):
+    """
+    Ölçülecek aşamaları oluşturur
+
+    Tek aşamalar ham kare alır (kendi dönüşümleri dahil). "pipeline" aşaması main.py'deki
+    gibi tek bir FrameContext paylaşarak engel, zemin geçidi ve şerit algılamayı çalıştırır.
+    """
+    lores_size = config.CAMERA_LORES_RESOLUTION
+    frame_gray = {}
+
+    def make_context(frame):
+        if lores:
+            # Lores Y düzlemini taklit et (ölçüme dahil değil, kamera donanımı üretir)
+            return FrameContext(frame, gray=frame_gray[id(frame)])
+        return FrameContext(frame)
+
+    def pipeline(frame):
+        ctx = make_context(frame)
+        obstacle_detector.detect_blobs(ctx)
+        line_detector.is_crosswalk(ctx)
+        line_detector.detect_line(ctx)
+
+    stages = {
+        "detect_line": line_detector.detect_line,
+        "is_crosswalk": line_detector.is_crosswalk,
+        "detect_obstacles": obstacle_detector.detect_obstacles,
+        "detect_obstacle_color": obstacle_detector.detect_obstacle_color,
+        "pipeline": pipeline,
+    }
+
+    def prepare(frames):
+        if lores:
+            for frame in frames:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                frame_gray[id(frame)] = cv2.resize(gray, lores_size, interpolation=cv2.INTER_AREA)
+
+    return stages, prepare
+
+def compare_with_baseline(results, baseline, tolerance, min_delta_ms=0.05):
+    """
+    Sonuçları temel sonuçla karşılaştırır (p50 süreleri)
+
+    Returns:
+        regressions: Gerileyen aşamaların listesi (aşama, temel_ms, şimdiki_ms)
+    """
+    regressions = []
+    for stage, current in results["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if base is None:
+            continue
+        base_ms, current_ms = base["p50_ms"], current["p50_ms"]
+        if current_ms > base_ms * (1 + tolerance) and current_ms - base_ms > min_delta_ms:
+            regressions.append((stage, base_ms, current_ms))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Görüntü işleme aşamaları için benchmark")
+    parser.add_argument("--frames", type=int, default=200, help="Üretilecek farklı kare sayısı")
+    parser.add_argument("--iterations", type=int, default=2000, help="Aşama başına çağrı sayısı")
+    parser.add_argument("--warmup", type=int, default=50, help="Ölçülmeyen ısınma çağrısı sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgele sayı tohumu")
+    parser.add_argument("--lores", action="store_true", help="Pipeline'da lores Y düzlemini gri görüntü olarak kullan")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Sonuç JSON dosyası")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Karşılaştırılacak temel sonuç dosyası")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları temel sonuç olarak kaydet")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="İzin verilen gerileme oranı (p50)")
+    args = parser.parse_args()
+
+    log(f"{args.frames} sentetik kare üretiliyor...")
+    frames = generate_frames(args.frames, seed=args.seed)
+
+    stages, prepare = build_stages(LineDetector(), ObstacleDetector(), args.lores)
+    prepare(frames)
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "resolution": list(config.CAMERA_RESOLUTION),
+            "frames": args.frames,
+            "iterations": args.iterations,
+            "lores": args.lores,
+        },
+        "stages": {},
+    }
+
+    for name, function in stages.items():
+        time_stage(function, frames, args.warmup)
+        summary = summarize(time_stage(function, frames, args.iterations))
+        results["stages"][name] = summary
+        log(f"{name:<24} ort: {summary['mean_ms']:7.3f} ms  p50: {summary['p50_ms']:7.3f}  "
+            f"p95: {summary['p95_ms']:7.3f}  p99: {summary['p99_ms']:7.3f}  FPS: {summary['fps']}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    log(f"Sonuçlar kaydedildi: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        log(f"Temel sonuç kaydedildi: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        log("Temel sonuç bulunamadı, karşılaştırma yapılmadı (--save-baseline ile oluşturun)")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        for stage, base_ms, current_ms in regressions:
+            log(f"GERİLEME: {stage} p50 {base_ms:.3f} ms -> {current_ms:.3f} ms "
+                f"(+{(current_ms / base_ms - 1) * 100:.0f}%)")
+        return 1
+
+    log(f"Gerileme yok (tolerans: %{args.tolerance * 100:.0f})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Tampon havuzu - Kare başına işlemlerde yeniden kullanılan önceden ayrılmış görüntü tamponları
+OpenCV çağrılarına dst= olarak verilir; aynı ad ve boyut için her karede aynı bellek kullanılır,
+böylece döngüde bellek ayırma ve çöp toplama duraklamaları oluşmaz.
+
+Her ad için tek bir bellek bloğu tutulur ve istenen en büyük boyuta büyütülür; daha küçük
+boyutlar bloğun başındaki bitişik görünümü kullanır (ör. değişken genişlikli arama pencereleri).
+Bir tamponun içeriği, aynı adla bir sonraki isteğe (genellikle sonraki kare) kadar geçerlidir.
+"""
+
+import math
+import numpy as np
+
+class BufferPool:
+    def __init__(self):
+        """
+        Tampon havuzu başlatıcı
+        """
+        # (ad, tür) -> tek boyutlu bellek bloğu
+        self._buffers = {}
+
+        # Sayaçlar
+        self.allocations = 0
+        self.allocated_bytes = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Ad ve boyuta göre tamponu döndürür (blok yetmezse büyütülür, içerik başlatılmaz)
+
+        Args:
+            name (str): Tamponun kullanım yeri (aynı karede birlikte kullanılan tamponlar farklı adlı olmalı)
+            shape (tuple): Tampon boyutu
+            dtype: Eleman türü
+
+        Returns:
+            buffer: Bitişik numpy dizisi (havuzdaki bloğun görünümü)
+        """
+        dtype = np.dtype(dtype)
+        size = math.prod(shape)
+        key = (name, dtype)
+        block = self._buffers.get(key)
+        if block is None or block.size < size:
+            if block is not None:
+                self.allocated_bytes -= block.nbytes
+            block = np.empty(size, dtype)
+            self._buffers[key] = block
+            self.allocations += 1
+            self.allocated_bytes += block.nbytes
+        return block[:size].reshape(shape)
+
+    def like(self, name, image):
+        """
+        Verilen görüntüyle aynı boyut ve türde tamponu döndürür
+        """
+        return self.get(name, image.shape, image.dtype)
+
+    def clear(self):
+        """
+        Tüm tamponları bırakır (ör. çözünürlük değişince)
+        """
+        self._buffers.clear()
+        self.allocated_bytes = 0
+
+    def format_stats(self):
+        """
+        Havuz istatistiklerini okunabilir metin olarak döndürür
+        """
+        return f"{len(self._buffers)} tampon, {self.allocated_bytes / 1024:.0f} KB"
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Kamera kalibrasyon aracı - Dama tahtası görüntülerinden iç parametreleri ve lens bozulmasını hesaplar
+Sonuç config.CAMERA_CALIBRATION_FILE dosyasına yazılır; çalışma sırasında lens_correction.py
+bu dosyayı yükler ve düzeltme tablolarını önbelleğe alır.
+
+Görüntüler kameranın çalışma çözünürlüğünde (config.CAMERA_RESOLUTION) ve farklı açı/konumlardan
+çekilmelidir; dama tahtası özellikle görüntü kenarlarında da görünmelidir.
+
+Kullanım:
+    python3 calibrate_camera.py calibration_images/
+    python3 calibrate_camera.py calibration_images/ --pattern 9x6 --square 2.5 --show-undistorted kontrol/
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import config
+from frame_source import IMAGE_EXTENSIONS
+
+import cv2
+
+def log(message):
+    print(f"[CAL] {message}")
+
+def find_image_files(directory):
+    """
+    Klasördeki görüntü dosyalarını ada göre sıralı döndürür
+    """
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS)
+
+def find_corners(paths, pattern):
+    """
+    Görüntülerdeki dama tahtası iç köşelerini bulur
+
+    Args:
+        paths: Görüntü dosyaları
+        pattern (tuple): İç köşe sayısı (sütun, satır)
+
+    Returns:
+        corners: Her başarılı görüntü için köşe koordinatları
+        resolution: Görüntü çözünürlüğü (genişlik, yükseklik)
+        used: Köşeleri bulunan dosyalar
+    """
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+    flags = cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE
+    corners, used = [], []
+    resolution = None
+
+    for path in paths:
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            log(f"Okunamadı, atlandı: {path}")
+            continue
+
+        size = (gray.shape[1], gray.shape[0])
+        if resolution is None:
+            resolution = size
+        elif size != resolution:
+            log(f"Farklı çözünürlük ({size[0]}x{size[1]}), atlandı: {path}")
+            continue
+
+        found, points = cv2.findChessboardCorners(gray, pattern, flags)
+        if not found:
+            log(f"Dama tahtası bulunamadı: {os.path.basename(path)}")
+            continue
+
+        points = cv2.cornerSubPix(gray, points, (11, 11), (-1, -1), criteria)
+        corners.append(points)
+        used.append(path)
+
+    return corners, resolution, used
+
+def calibrate(corners, resolution, pattern, square_size):
+    """
+    Köşelerden kamera iç parametrelerini ve bozulma katsayılarını hesaplar
+
+    Returns:
+        rms: Ortalama yeniden izdüşüm hatası (piksel)
+        camera_matrix: 3x3 iç parametre matrisi
+        dist_coeffs: Bozulma katsayıları (k1, k2, p1, p2, k3)
+        per_view_errors: Görüntü başına yeniden izdüşüm hatası (piksel)
+    """
+    # Dama tahtası köşelerinin düzlemdeki koordinatları (cm)
+    board = np.zeros((pattern[0] * pattern[1], 3), np.float32)
+    board[:, :2] = np.mgrid[0:pattern[0], 0:pattern[1]].T.reshape(-1, 2) * square_size
+    object_points = [board] * len(corners)
+
+    rms, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.calibrateCamera(
+        object_points, corners, resolution, None, None)
+
+    per_view_errors = []
+    for points, rvec, tvec in zip(corners, rvecs, tvecs):
+        projected, _ = cv2.projectPoints(board, rvec, tvec, camera_matrix, dist_coeffs)
+        residuals = projected.reshape(-1, 2) - points.reshape(-1, 2)
+        per_view_errors.append(float(np.sqrt(np.mean(np.sum(residuals ** 2, axis=1)))))
+
+    return rms, camera_matrix, dist_coeffs.ravel(), per_view_errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Dama tahtası görüntülerinden kamera kalibrasyonu")
+    parser.add_argument("images", help="Kalibrasyon görüntülerinin bulunduğu klasör")
+    parser.add_argument("--pattern", default="9x6", help="Dama tahtası iç köşe sayısı (sütun x satır)")
+    parser.add_argument("--square", type=float, default=2.5, help="Kare kenar uzunluğu (cm)")
+    parser.add_argument("--min-images", type=int, default=8, help="Gereken en az başarılı görüntü sayısı")
+    parser.add_argument("--output", default=config.CAMERA_CALIBRATION_FILE, help="Kalibrasyon dosyası")
+    parser.add_argument("--show-undistorted", metavar="KLASÖR",
+                        help="Düzeltilmiş görüntüleri kontrol için bu klasöre kaydet")
+    args = parser.parse_args()
+
+    try:
+        pattern = tuple(int(v) for v in args.pattern.lower().split("x"))
+        if len(pattern) != 2:
+            raise ValueError
+    except ValueError:
+        log(f"Geçersiz dama tahtası boyutu: {args.pattern} (örnek: 9x6)")
+        return 1
+
+    paths = find_image_files(args.images)
+    log(f"{len(paths)} görüntü bulundu, köşeler aranıyor ({pattern[0]}x{pattern[1]})...")
+    corners, resolution, used = find_corners(paths, pattern)
+
+    if len(corners) < args.min_images:
+        log(f"Yetersiz görüntü: {len(corners)} / {args.min_images} (farklı açılardan daha fazla görüntü çekin)")
+        return 1
+
+    rms, camera_matrix, dist_coeffs, per_view_errors = calibrate(corners, resolution, pattern, args.square)
+
+    log(f"Kalibrasyon tamamlandı. Görüntü: {len(corners)}, Çözünürlük: {resolution[0]}x{resolution[1]}, RMS: {rms:.3f} px")
+    log(f"fx: {camera_matrix[0, 0]:.1f}, fy: {camera_matrix[1, 1]:.1f}, "
+        f"cx: {camera_matrix[0, 2]:.1f}, cy: {camera_matrix[1, 2]:.1f}")
+    log(f"Bozulma katsayıları: {', '.join(f'{v:.4f}' for v in dist_coeffs)}")
+    for path, error in sorted(zip(used, per_view_errors), key=lambda item: -item[1])[:3]:
+        log(f"En yüksek hata: {os.path.basename(path)} ({error:.3f} px)")
+
+    if tuple(resolution) != tuple(config.CAMERA_RESOLUTION):
+        log(f"Uyarı: kalibrasyon çözünürlüğü config.CAMERA_RESOLUTION'dan farklı "
+            f"({config.CAMERA_RESOLUTION[0]}x{config.CAMERA_RESOLUTION[1]}), parametreler orantılı ölçeklenecek")
+
+    calibration = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "resolution": list(resolution),
+        "camera_matrix": camera_matrix.tolist(),
+        "dist_coeffs": dist_coeffs.tolist(),
+        "rms": float(rms),
+        "pattern": list(pattern),
+        "square_size_cm": args.square,
+        "images": len(corners),
+    }
+    with open(args.output, "w") as f:
+        json.dump(calibration, f, indent=2)
+    log(f"Kalibrasyon kaydedildi: {args.output}")
+
+    if args.show_undistorted:
+        os.makedirs(args.show_undistorted, exist_ok=True)
+        for path in used:
+            image = cv2.imread(path)
+            undistorted = cv2.undistort(image, camera_matrix, dist_coeffs)
+            cv2.imwrite(os.path.join(args.show_undistorted, os.path.basename(path)),
+                        np.hstack([image, undistorted]))
+        log(f"Düzeltilmiş görüntüler kaydedildi: {args.show_undistorted}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
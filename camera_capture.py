@@ -0,0 +1,204 @@
+"""
+Arka plan kamera yakalama sınıfı - Görüntü alma işlemini kontrol döngüsünden ayırır
+Üretici iş parçacığı kareleri sürekli olarak küçük bir halka tampona yazar,
+kontrol döngüsü ise beklemeden her zaman en yeni kareyi alır (Picamera2 kare kaynağı)
+"""
+
+import time
+import threading
+from collections import deque
+import config
+from loguru import logger
+from frame_context import FrameContext
+from frame_source import FrameSource
+
+class CameraCapture(FrameSource):
+    def __init__(self, camera, buffer_size=config.CAPTURE_BUFFER_SIZE, lores_size=None):
+        """
+        Arka plan kamera yakalama sınıfı başlatıcı
+
+        Args:
+            camera: Başlatılmış Picamera2 nesnesi
+            buffer_size (int): Halka tampon boyutu (kare)
+            lores_size (tuple): YUV420 lores akışının boyutu (genişlik, yükseklik).
+                                Verilirse Y düzlemi gri görüntü olarak kullanılır.
+        """
+        self.camera = camera
+        self.lores_size = lores_size
+
+        # Halka tampon: (kare_no, zaman_damgası, FrameContext)
+        self._buffer = deque(maxlen=max(1, buffer_size))
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+
+        self._thread = None
+        self._running = False
+
+        # Kareler arası minimum süre (saniye) - bekleme durumunda yakalamayı seyreltmek için
+        self._throttle_interval = 0.0
+
+        # Sayaçlar
+        self.frames_captured = 0   # Üreticinin aldığı kare sayısı
+        self.frames_dropped = 0    # Tüketici tarafından hiç görülmeden geçilen kareler
+        self.frames_reused = 0     # Tüketiciye tekrar verilen (yeni olmayan) kareler
+        self.capture_errors = 0
+        self._last_read_id = 0
+
+    def start(self):
+        """
+        Yakalama iş parçacığını başlatır
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+        logger.info(f"Arka plan kamera yakalama başlatıldı. Tampon boyutu: {self._buffer.maxlen}")
+
+    def stop(self, timeout=1.0):
+        """
+        Yakalama iş parçacığını durdurur
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        with self._new_frame:
+            self._new_frame.notify_all()
+
+        logger.info(f"Arka plan kamera yakalama durduruldu. {self.format_stats()}")
+
+    def set_throttle(self, interval):
+        """
+        Yakalamayı seyreltir
+
+        Args:
+            interval (float): Kareler arası minimum süre (saniye). 0 veya None: tam hız
+        """
+        self._throttle_interval = interval or 0.0
+
+    def _grab(self):
+        """
+        Kameradan tek bir kare alır - farklı görüntü alma yöntemlerini dener
+
+        Returns:
+            frame: Ana akış görüntüsü (BGR)
+            gray: Lores akışının Y düzlemi (lores kapalıysa None)
+        """
+        if self.lores_size is not None:
+            # Ana ve lores akışlarını aynı istekten al
+            (frame, lores), _ = self.camera.capture_arrays(["main", "lores"])
+
+            # YUV420 düzeninde ilk "yükseklik" satır Y düzlemidir - kopyasız dilim
+            width, height = self.lores_size
+            return frame, lores[:height, :width]
+
+        return self._grab_main(), None
+
+    def _grab_main(self):
+        """
+        Yalnızca ana akıştan kare alır
+        """
+        try:
+            # Birincil yöntem: capture_array()
+            return self.camera.capture_array()
+        except Exception as e1:
+            logger.warning(f"capture_array() hatası: {e1}")
+
+        try:
+            # İkincil yöntem: capture_array("main")
+            return self.camera.capture_array("main")
+        except Exception as e2:
+            logger.warning(f"capture_array('main') hatası: {e2}")
+
+        # Üçüncü yöntem: capture_image ve numpy dönüşümü
+        import numpy as np
+        img = self.camera.capture_image()
+        return np.array(img)
+
+    def _capture_loop(self):
+        """
+        Üretici döngüsü - kareleri sürekli olarak tampona yazar
+        """
+        while self._running:
+            try:
+                frame, gray = self._grab()
+            except Exception as e:
+                self.capture_errors += 1
+                logger.error(f"Tüm görüntü alma yöntemleri başarısız: {e}")
+                time.sleep(1)
+                continue
+
+            if frame is None or frame.size == 0:
+                self.capture_errors += 1
+                logger.warning("Boş kamera görüntüsü alındı, yeniden deneniyor...")
+                time.sleep(0.5)
+                continue
+
+            timestamp = time.monotonic()
+            with self._new_frame:
+                self.frames_captured += 1
+                self._buffer.append((self.frames_captured, timestamp, FrameContext(frame, gray)))
+                self._new_frame.notify_all()
+
+            # Seyreltilmiş modda bir sonraki kareye kadar bekle
+            if self._throttle_interval > 0:
+                time.sleep(self._throttle_interval)
+
+    def read(self, wait_new=False, timeout=None):
+        """
+        En yeni kareyi döndürür
+
+        Args:
+            wait_new (bool): True ise daha önce okunmamış bir kare gelene kadar bekler
+            timeout (float): Bekleme için zaman aşımı (saniye)
+
+        Returns:
+            frame: En yeni karenin FrameContext nesnesi (henüz kare yoksa None).
+                   Tekrar okunan kare aynı bağlamı döndürür, böylece önbellekteki dönüşümler yeniden kullanılır.
+            frame_id: Karenin sıra numarası
+            timestamp: Karenin alındığı zaman (time.monotonic)
+            is_new: Kare daha önce okunmamışsa True
+        """
+        with self._new_frame:
+            if wait_new:
+                self._new_frame.wait_for(
+                    lambda: not self._running or (self._buffer and self._buffer[-1][0] != self._last_read_id),
+                    timeout
+                )
+
+            if not self._buffer:
+                return None, 0, 0.0, False
+
+            frame_id, timestamp, frame = self._buffer[-1]
+
+            if frame_id == self._last_read_id:
+                self.frames_reused += 1
+                return frame, frame_id, timestamp, False
+
+            # Son okumadan bu yana görülmeden geçilen kareler
+            if self._last_read_id:
+                self.frames_dropped += frame_id - self._last_read_id - 1
+            self._last_read_id = frame_id
+
+            return frame, frame_id, timestamp, True
+
+    def get_stats(self):
+        """
+        Yakalama sayaçlarını döndürür
+        """
+        return {
+            "captured": self.frames_captured,
+            "dropped": self.frames_dropped,
+            "reused": self.frames_reused,
+            "errors": self.capture_errors,
+        }
+
+    def format_stats(self):
+        """
+        Yakalama sayaçlarını log için biçimlendirir
+        """
+        return (f"Alınan: {self.frames_captured}, Atlanan: {self.frames_dropped}, "
+                f"Tekrar kullanılan: {self.frames_reused}, Hata: {self.capture_errors}")
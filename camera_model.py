@@ -0,0 +1,93 @@
+"""
+Kamera geometri modeli - Zemin düzlemi ile görüntü arasındaki dönüşümler
+Kamera config.CAMERA_HEIGHT yüksekliğinde, config.CAMERA_TILT_ANGLE kadar aşağı bakar
+
+Robot koordinatları (cm): X ileri, Y sola, Z yukarı; orijin kameranın zemindeki izdüşümü
+"""
+
+import math
+import config
+import numpy as np
+
+class CameraModel:
+    def __init__(self, resolution=config.CAMERA_RESOLUTION, height=config.CAMERA_HEIGHT,
+                 tilt_deg=config.CAMERA_TILT_ANGLE, hfov_deg=config.CAMERA_HFOV, camera_matrix=None):
+        """
+        İğne deliği (pinhole) kamera modeli başlatıcı
+
+        Args:
+            resolution (tuple): Görüntü çözünürlüğü (genişlik, yükseklik)
+            height (float): Kameranın yerden yüksekliği (cm)
+            tilt_deg (float): Kameranın aşağı eğim açısı (derece)
+            hfov_deg (float): Yatay görüş açısı (derece)
+            camera_matrix: Kalibre edilmiş 3x3 iç parametre matrisi (verilirse hfov_deg yerine kullanılır)
+        """
+        self.width, self.height_px = resolution
+        self.camera_height = height
+        self.tilt = math.radians(tilt_deg)
+
+        if camera_matrix is not None:
+            # Kalibrasyondan gelen iç parametreler (odak uzaklıkları ortalanır, kare piksel varsayımı)
+            self.focal = (camera_matrix[0][0] + camera_matrix[1][1]) / 2
+            self.cx = camera_matrix[0][2]
+            self.cy = camera_matrix[1][2]
+        else:
+            # İç parametreler (kare pikseller, optik merkez görüntü ortasında)
+            self.focal = (self.width / 2) / math.tan(math.radians(hfov_deg) / 2)
+            self.cx = self.width / 2
+            self.cy = self.height_px / 2
+
+    @property
+    def camera_matrix(self):
+        """
+        3x3 kamera iç parametre matrisi (K)
+        """
+        return np.array([[self.focal, 0, self.cx],
+                         [0, self.focal, self.cy],
+                         [0, 0, 1]], dtype=np.float64)
+
+    @property
+    def horizon_row(self):
+        """
+        Ufuk çizgisinin görüntüdeki satırı (bu satırın üstü zemin değildir)
+        """
+        return self.cy - self.focal * math.tan(self.tilt)
+
+    def ground_to_image_homography(self):
+        """
+        Zemin düzlemi (X ileri, Y sola, cm) -> görüntü pikseli homografisi
+
+        Returns:
+            H: 3x3 homografi matrisi
+        """
+        c, s, h = math.cos(self.tilt), math.sin(self.tilt), self.camera_height
+        f, cx, cy = self.focal, self.cx, self.cy
+        return np.array([[cx * c, -f, cx * h * s],
+                         [cy * c - f * s, 0, cy * h * s + f * h * c],
+                         [c, 0, h * s]], dtype=np.float64)
+
+    def project_points(self, points):
+        """
+        Robot koordinatlarındaki 3B noktaları görüntüye izdüşürür
+
+        Args:
+            points: (N, 3) dizi - X ileri, Y sola, Z yukarı (cm)
+
+        Returns:
+            pixels: (N, 2) görüntü koordinatları
+            depth: (N,) kamera eksenindeki derinlik (<= 0 ise nokta kameranın arkasında)
+        """
+        points = np.asarray(points, dtype=np.float64)
+        c, s = math.cos(self.tilt), math.sin(self.tilt)
+
+        # Kamera koordinatları: x sağa, y aşağı, z ileri (eğim uygulanmış)
+        x = -points[:, 1]
+        y_level = self.camera_height - points[:, 2]
+        z_level = points[:, 0]
+        y = y_level * c - z_level * s
+        z = y_level * s + z_level * c
+
+        safe_z = np.where(np.abs(z) < 1e-6, 1e-6, z)
+        u = self.cx + self.focal * x / safe_z
+        v = self.cy + self.focal * y / safe_z
+        return np.stack([u, v], axis=1), z
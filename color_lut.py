@@ -0,0 +1,149 @@
+"""
+Renk sınıfı tablosu - BGR pikselini doğrudan engel rengi sınıfına çeviren arama tablosu
+Tablo config.OBSTACLE_COLOR_RANGES HSV aralıklarından bir kez üretilir: her kanal
+OBSTACLE_COLOR_LUT_BITS bite nicemlenir ve her hücrenin merkez rengi HSV'ye çevrilip
+aralıklarla karşılaştırılır. Çalışma sırasında her piksel tek tablo okumasıyla sınıflanır
+(HSV dönüşümü ve renk başına inRange geçişi yok). Tablo aralıklara göre anahtarlanıp
+diske önbelleklenir; aralıklar değişince yeniden üretilir.
+
+Sınıflar: 0 = renk yok, 1.. = aralıkların sırası (çakışmada sonraki aralık geçerli)
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+import config
+from loguru import logger
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+# Tablo biçimi değişirse önbellek dosyaları geçersiz olsun
+LUT_VERSION = 1
+
+def normalize_ranges(color_ranges):
+    """
+    Renk aralıklarını karşılaştırılabilir değişmez biçime çevirir
+
+    Returns:
+        ranges: ((ad, (h, s, v), (h, s, v)), ...) demeti
+    """
+    return tuple((name, tuple(int(v) for v in lower), tuple(int(v) for v in upper))
+                 for name, (lower, upper) in color_ranges.items())
+
+class ColorLUT:
+    def __init__(self, color_ranges, bits=config.OBSTACLE_COLOR_LUT_BITS,
+                 cache_dir=config.OBSTACLE_COLOR_LUT_CACHE_DIR):
+        """
+        Renk sınıfı tablosu başlatıcı
+
+        Args:
+            color_ranges (dict): Renk adı -> (alt HSV, üst HSV) aralıkları
+            bits (int): Kanal başına nicemleme biti (5: 32 KB, 6: 256 KB tablo)
+            cache_dir (str): Tabloların önbelleklendiği klasör (None ise diske yazılmaz)
+        """
+        self.ranges = normalize_ranges(color_ranges)
+        self.names = [name for name, _, _ in self.ranges]
+        self.bits = int(bits)
+        self.shift = 8 - self.bits
+        self.cache_dir = cache_dir
+
+        # Aralıkların özeti - önbellek dosyaları aralıklar değişince geçersiz olur
+        digest = hashlib.sha1(json.dumps([LUT_VERSION, self.bits, self.ranges]).encode())
+        self.key = digest.hexdigest()[:12]
+
+        self.table = self._load_or_build()
+
+    def matches(self, color_ranges):
+        """
+        Tablonun verilen aralıklardan üretilip üretilmediğini kontrol eder
+        """
+        return normalize_ranges(color_ranges) == self.ranges
+
+    def _load_or_build(self):
+        """
+        Tabloyu disk önbelleğinden yükler, yoksa üretir ve kaydeder
+        """
+        size = 1 << (3 * self.bits)
+        path = None
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"color_lut_{self.bits}bit_{self.key}.npy")
+            if os.path.exists(path):
+                try:
+                    table = np.load(path)
+                    if table.shape == (size,) and table.dtype == np.uint8:
+                        return table
+                    logger.warning(f"Renk tablosu önbelleği geçersiz, yeniden üretiliyor: {path}")
+                except Exception as e:
+                    logger.warning(f"Renk tablosu önbelleği okunamadı ({path}): {e}")
+
+        table = self.build_table()
+        logger.info(f"Renk sınıfı tablosu üretildi. Sınıflar: {', '.join(self.names)}, "
+                    f"Nicemleme: {self.bits} bit/kanal ({size // 1024} KB)")
+
+        if path is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.save(path, table)
+            except OSError as e:
+                logger.warning(f"Renk tablosu önbelleğe yazılamadı ({path}): {e}")
+        return table
+
+    def build_table(self):
+        """
+        Her nicemlenmiş BGR hücresinin merkez rengini HSV aralıklarıyla sınıflar
+
+        Returns:
+            table: (2^(3*bits),) uint8 sınıf tablosu - indeks (b << 2*bits) | (g << bits) | r
+        """
+        levels = 1 << self.bits
+        centers = ((np.arange(levels) << self.shift) + ((1 << self.shift) >> 1)).astype(np.uint8)
+        b, g, r = np.meshgrid(centers, centers, centers, indexing="ij")
+        bgr = np.stack([b.ravel(), g.ravel(), r.ravel()], axis=1).reshape(-1, 1, 3)
+        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+
+        table = np.zeros(levels ** 3, np.uint8)
+        for class_id, (_, lower, upper) in enumerate(self.ranges, start=1):
+            mask = cv2.inRange(hsv, np.array(lower, np.uint8), np.array(upper, np.uint8))
+            table[mask.ravel() > 0] = class_id
+        return table
+
+    def classify(self, bgr, buffers=None):
+        """
+        BGR görüntünün her pikselini renk sınıfına çevirir
+
+        Args:
+            bgr: (yükseklik, genişlik, 3) uint8 BGR görüntü
+            buffers: Ara ve çıktı görüntüleri için BufferPool (None ise yeni bellek ayrılır)
+
+        Returns:
+            class_map: (yükseklik, genişlik) uint8 sınıf görüntüsü
+        """
+        shape = bgr.shape[:2]
+        if buffers is None:
+            quantized = bgr >> self.shift
+            index = np.empty(shape, np.intp)
+            channel = np.empty(shape, np.intp)
+            class_map = None
+        else:
+            quantized = np.right_shift(bgr, self.shift, out=buffers.get("color_lut_quantized", bgr.shape))
+            index = buffers.get("color_lut_index", shape, np.intp)
+            channel = buffers.get("color_lut_channel", shape, np.intp)
+            class_map = buffers.get("color_lut_classes", shape)
+
+        # Kanallar önce indeks türüne kopyalanır (karışık türlü yerinde işlem geçici tampon ayırır)
+        np.copyto(index, quantized[:, :, 0])
+        index <<= self.bits
+        np.copyto(channel, quantized[:, :, 1])
+        index |= channel
+        index <<= self.bits
+        np.copyto(channel, quantized[:, :, 2])
+        index |= channel
+        return np.take(self.table, index, out=class_map, mode="clip")
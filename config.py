@@ -67,6 +67,19 @@ CAMERA_FRAMERATE = 30           # FPS
 CAMERA_ROTATION = 0             # Kamera açısı (derece)
 CAMERA_HFLIP = False            # Yatay çevirme
 CAMERA_VFLIP = False            # Dikey çevirme
+CAMERA_TILT_ANGLE = 20          # Kameranın aşağı eğim açısı (derece)
+CAMERA_HFOV = 66                # Yatay görüş açısı (derece) - Pi Camera 3 standart lens
+CAPTURE_BUFFER_SIZE = 3         # Arka plan yakalama halka tampon boyutu (kare)
+CAMERA_MODE = "video"           # "video": düşük gecikmeli akış modu, "still": fotoğraf yapılandırması
+CAMERA_LORES_RESOLUTION = (320, 240)  # Şerit/zemin geçidi algılama için YUV420 lores akış çözünürlüğü
+CAMERA_BUFFER_COUNT = 4         # Video akışı için kamera tampon sayısı
+CAMERA_LOCK_EXPOSURE = False    # Yakınsama sonrası pozlama, kazanç ve beyaz dengesini kilitle
+CAMERA_EXPOSURE_SETTLE_TIME = 2.0  # Otomatik pozlama/beyaz dengesi yakınsama süresi (saniye)
+FRAME_SOURCE = "camera"         # Kare kaynağı: "camera" veya video dosyası / görüntü klasörü / kayıt klasörü yolu (FRAME_SOURCE ortam değişkeni ile de seçilebilir)
+
+# Kontrol Döngüsü Ayarları
+CONTROL_LOOP_RATE = CAMERA_FRAMERATE  # Hedef kontrol döngüsü hızı (Hz)
+LOOP_STATS_INTERVAL = 10        # Döngü zamanlama istatistiklerinin loglanma aralığı (saniye)
 
 # Görüntü İşleme Ayarları
 ROI_HEIGHT = 150     # İlgi alanı yüksekliği (alt kısımdan) - arttırıldı
@@ -76,18 +89,115 @@ BINARY_THRESHOLD = 150  # İkili görüntü eşik değeri (0-255) - beyaz şerit
 # Şerit Takip Ayarları
 LINE_POSITION_THRESHOLD = 25  # Merkez pozisyondan sapma eşiği (piksel)
 LINE_DETECTION_MIN_PIXELS = 50  # Minimum şerit piksel sayısı
+LINE_TRACKING_ENABLED = True  # Son pozisyon etrafında pencereli arama (güven düşünce tam genişlik)
+LINE_SEARCH_WINDOW = 80  # Arama penceresinin yarı genişliği (piksel, tahmin edilen pozisyonun iki yanı)
+LINE_TRACKING_MIN_CONFIDENCE = 0.3  # Pencereli aramanın geçerli sayılması için tepe sütun doluluk oranı (0-1)
+LANE_MODEL_ENABLED = True  # Şerit polinom modeli ile ileri bakış (virajları erken fark etmek için)
+LANE_MODEL_ROI_HEIGHT = 240  # Şerit modeli ROI yüksekliği (alt kısımdan, ~22-63 cm ileriyi görür)
+LANE_MODEL_BANDS = 8  # ROI'nin bölündüğü yatay bant sayısı
+LANE_MODEL_BAND_WINDOW = 30  # Bant merkezinin hesaplandığı tepe çevresi yarı genişliği (piksel)
+LANE_MODEL_MIN_BAND_PIXELS = 20  # Bandın modele katılması için gereken minimum beyaz piksel sayısı
+LANE_MODEL_MAX_BAND_STEP = 80  # Ardışık bant merkezleri arasındaki en büyük yatay fark (piksel)
+LANE_MODEL_DEGREE = 2  # Polinom derecesi (1: doğru, 2: parabol)
+LANE_MODEL_LOOKAHEAD = 45  # İleri bakış mesafesi (cm)
+LANE_MODEL_MAX_EXTRAPOLATION = 5  # İleri bakış noktası bantların zemin aralığının en fazla bu kadar dışında olabilir (cm)
+LANE_MODEL_MAX_HEADING = 45  # İleri bakış noktasında kabul edilen en büyük şerit yönü (derece)
+LANE_MODEL_WEIGHT = 0.5  # Yön kararında ileri bakış pozisyonunun ağırlığı (0: yalnızca alt ROI)
+
+# Çok Çözünürlüklü İşleme (kare başına bir kez üretilen piramit, aşama başına çalışma ölçeği - CAMERA_RESOLUTION'a göre)
+# config.py'deki piksel değerleri CAMERA_RESOLUTION'a göredir, algılayıcılar gerçek kare boyutuna ölçekler
+LINE_DETECTION_SCALE = 0.25  # Şerit takibi çalışma ölçeği (1.0: tam çözünürlük)
+CROSSWALK_DETECTION_SCALE = 0.5  # Zemin geçidi kontrolü çalışma ölçeği
+LANE_MODEL_SCALE = 0.5  # Şerit modeli çalışma ölçeği
+OBSTACLE_DETECTION_SCALE = 0.5  # Engel algılama çalışma ölçeği
+LINE_REFINE_MARGIN = 8  # Kaba şerit pozisyonu karar eşiğine bu kadar yakınsa tam çözünürlükte iyileştir (piksel)
+OBSTACLE_REFINE_MARGIN = 0.25  # Alan eşiğe / merkez bölge sınırına bu oranda yakınsa tam çözünürlükte iyileştir
+
+# Lens Bozulması Düzeltme (calibrate_camera.py ile kalibrasyon dosyası oluşturulur)
+LENS_CORRECTION_ENABLED = True  # Kalibrasyon dosyası varsa ROI'leri ve zemin ızgarasını düzelt
+CAMERA_CALIBRATION_FILE = "camera_calibration.json"  # Kamera iç parametreleri ve bozulma katsayıları
+CAMERA_UNDISTORT_CACHE_DIR = "calibration_cache"  # Hesaplanan düzeltme tablolarının önbelleği
+
+# Kuş Bakışı Zemin Görünümü (ground_view.py - remap tabloları ile IPM)
+GROUND_VIEW_ENABLED = False  # Şerit algılamayı zemin ızgarasında cm cinsinden yap
+GROUND_VIEW_NEAR = 22  # Izgaranın en yakın kenarı (cm, kameranın zemindeki izdüşümünden ileri)
+GROUND_VIEW_FAR = 62  # Izgaranın en uzak kenarı (cm)
+GROUND_VIEW_HALF_WIDTH = 50  # Izgaranın merkezden her iki yana genişliği (cm)
+GROUND_VIEW_CELL_SIZE = 1.0  # Hücre boyutu (cm/piksel) - 40x100 ızgara
+LINE_POSITION_THRESHOLD_CM = 4.0  # Zemin görünümünde merkezden sapma eşiği (cm)
+GROUND_LINE_MIN_LENGTH_CM = 8  # Şerit sayılması için sütunda gereken en kısa çizgi uzunluğu (cm)
+GROUND_LINE_MIN_WIDTH_CM = 2  # Gürültü temizleme çekirdeği (cm) - daha ince lekeler atılır
+GROUND_LINE_MAX_CHANGE_CM = 6.0  # Kare başına izin verilen en büyük pozisyon değişimi (cm)
 
 # Zemin Geçit Ayarları
 CROSSWALK_STOP_TIME = 5  # Durma süresi (saniye)
+CROSSWALK_COOLDOWN_TIME = 2.0  # Geçit sonrası aynı geçidin yeniden algılanmayacağı süre (saniye)
 CROSSWALK_DETECTION_THRESHOLD = 0.5  # Zemin geçit algılama eşiği (0-1)
 CROSSWALK_APPROACH_DISTANCE = 30  # Zemin geçidine yaklaşma mesafesi (cm)
 CROSSWALK_ROI_HEIGHT = 100  # Zemin geçidi ROI yüksekliği
 
+# Bekleme Modu Ayarları (zemin geçidinde zamanlı duruş)
+IDLE_LOOP_RATE = 4          # Bekleme sırasında döngü ve yakalama hızı (Hz)
+IDLE_WAKE_THRESHOLD = 12.0  # Sahne değişimi uyanma eşiği - ortalama gri fark (0-255)
+
 # Engel Algılama Ayarları
 OBSTACLE_DETECTION_THRESHOLD = 0.4  # Engel algılama eşiği (0-1) - daha hassas
 OBSTACLE_AVOIDANCE_TIME = 2.5  # Engelden kaçınma manevra süresi (saniye)
+OBSTACLE_REVERSE_TIME = 1.0    # Merkezdeki engel için geri gitme süresi (saniye, manevra süresine dahil)
+OBSTACLE_AVOIDANCE_EARLY_EXIT = False  # Son adımda şerit merkezde bulunursa ve engel görünmüyorsa manevrayı erken bitir
+OBSTACLE_EARLY_EXIT_MIN_TIME = 0.5  # Erken bitirme için son adımda geçmesi gereken en kısa süre (saniye)
 OBSTACLE_COLOR_RANGES = {
     'orange': ([5, 100, 150], [15, 255, 255]),  # Turuncu engel için HSV aralığı
     'yellow': ([20, 100, 150], [30, 255, 255])  # Sarı engel için HSV aralığı
 }
 OBSTACLE_MIN_AREA = 500  # Minimum engel alanı (piksel kare)
+OBSTACLE_AVOIDANCE_DISTANCE = 70  # Kaçınma bu uzaklıktan yakın engeller için başlar (cm) - ROI alt sınırı ~63 cm ileride
+OBSTACLE_PATH_MARGIN = 0  # Robot genişliğine eklenen yanal pay (cm) - bu koridorla örtüşmeyen engeller atlanır
+OBSTACLE_COLOR_LUT_BITS = 6  # Renk sınıfı tablosunda kanal başına nicemleme biti (5: 32 KB, 6: 256 KB)
+OBSTACLE_COLOR_LUT_CACHE_DIR = "calibration_cache"  # Renk sınıfı tablosu önbellek klasörü (aralıklar değişince yeniden üretilir)
+OBSTACLE_SIZES = {
+    'orange': (20, 30, 25),  # Sollanacak araç: genişlik x uzunluk x yükseklik (cm)
+    'yellow': (20, 45, 25)   # Sol şeritteki engel araç: genişlik x uzunluk x yükseklik (cm)
+}
+
+# Debug Görüntü Ayarları
+DEBUG_IMAGE_DIR = "debug_images"  # Debug görüntülerinin kaydedileceği klasör
+DEBUG_IMAGE_FORMAT = "jpg"        # Görüntü formatı (jpg, png, webp)
+DEBUG_IMAGE_QUALITY = 80          # Kodlama kalitesi (jpg/webp: 0-100, png: sıkıştırma 0-9)
+DEBUG_IMAGE_QUEUE_SIZE = 8        # Bekleyen görüntü kuyruğu - dolduğunda en eski atılır
+DEBUG_IMAGE_QUOTA_MB = 200        # debug_images klasörü için disk kotası (MB)
+
+# Canlı İzleme Ayarları (live_view.py - LIVE_VIEW=true ortam değişkeni ile de açılabilir)
+LIVE_VIEW_ENABLED = False         # Kamera ve algılayıcı görsellerini HTTP üzerinden MJPEG olarak yayınla
+LIVE_VIEW_HOST = "127.0.0.1"      # Dinlenecek adres ("0.0.0.0": yerel ağdaki bilgisayarlardan izleme)
+LIVE_VIEW_PORT = 8080             # HTTP portu
+LIVE_VIEW_FPS = 5                 # Görsellerin en yüksek güncellenme hızı (kontrol döngüsünden seyreltilir)
+LIVE_VIEW_QUALITY = 70            # JPEG kalitesi (0-100)
+
+# Telemetri Ayarları (telemetry.py - TELEMETRY=false ortam değişkeni ile kapatılabilir)
+TELEMETRY_ENABLED = True          # Her turun durumunu yapılı kayıt olarak tut, parçalar halinde diske yaz
+TELEMETRY_DIR = "telemetry"       # Telemetri klasörü (her çalışma için alt klasör oluşturulur)
+TELEMETRY_BUFFER_SIZE = 4096      # Halka tampon kayıt sayısı (51 B/kayıt, ~200 KB; 30 FPS'te ~2 dakika)
+TELEMETRY_FLUSH_INTERVAL = 5.0    # Diske yazma aralığı (saniye) - tampon yarıya dolarsa daha erken
+
+# Çalışma Kaydı Ayarları (RECORD_RUN=true ortam değişkeni ile de açılabilir)
+RUN_RECORD_ENABLED = False        # Ham kareleri ve kararları bellek eşlemeli dosyaya kaydet
+RUN_RECORD_DIR = "recordings"     # Kayıt klasörü (her çalışma için alt klasör oluşturulur)
+RUN_RECORD_MAX_FRAMES = 3000      # Önceden ayrılan kare kaydı sayısı (640x480 BGR ~2.7 GB)
+RUN_RECORD_SOURCE = "main"        # "main": tam BGR kare, "gray": gri/lores Y düzlemi (çok daha küçük)
+
+# Simülatör Ayarları (track_simulator.py - kapalı döngü pist simülasyonu)
+SIM_MAX_WHEEL_SPEED = 95.0        # Tam PWM'de tekerlek hızı (cm/s) - 280 RPM, ~6.5 cm tekerlek
+SIM_MOTOR_TIME_CONSTANT = 0.08    # Motor tepki zaman sabiti (saniye, birinci dereceden gecikme)
+SIM_WHEEL_BASE = ROBOT_WIDTH      # Tekerlekler arası mesafe (cm)
+SIM_PHYSICS_STEP = 0.005          # Fizik entegrasyon adımı (saniye)
+SIM_NOISE_SIGMA = 3.0             # Sentetik görüntü gürültüsü (standart sapma)
+SIM_FINISH_MARGIN = 50.0          # Bitiş çizgisinin pist çizgilerinin bitiminden önceki mesafesi (cm) - kamera ~22 cm ileriden görür
+
+# Loglama Ayarları (LOG_MODE=production ortam değişkeni ile de seçilebilir)
+LOG_MODE = "debug"                # "debug": senkron, dosyaya DEBUG / "production": asenkron, sınırlı kuyruk
+LOG_FILE = "robot_log.txt"        # Log dosyası
+LOG_ROTATION_MB = 10              # Log dosyası döndürme boyutu (MB)
+LOG_PRODUCTION_LEVEL = "INFO"     # Üretim modunda konsol ve dosya log seviyesi
+LOG_QUEUE_SIZE = 2000             # Asenkron yazıcı kuyruğu - dolduğunda en eski satır atılır
+LOG_COALESCE_INTERVAL = 5.0       # Tekrarlanan mesajların birleştirilme aralığı (saniye)
@@ -0,0 +1,127 @@
+"""
+Debug görselleri - Algılayıcı sonuçlarının üzerine çizilmiş görüntüler
+Algılayıcılar yalnızca sonuç nesnesi döndürür; görüntüler bir tüketici (debug görüntü yazıcısı,
+canlı izleme) istediğinde burada üretilir. Sonuçtaki görüntü alanları algılayıcının tamponlarıdır,
+bu nedenle çizim aynı karede, algılayıcı tekrar çağrılmadan önce yapılmalıdır.
+"""
+
+import numpy as np
+from loguru import logger
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+def render_line(result):
+    """
+    Şerit takibi sonucunu çizer: ikili görüntü, arama penceresi, merkez ve şerit çizgileri
+
+    Args:
+        result: LineResult
+
+    Returns:
+        image: BGR görüntü (çalışma ölçeğinde) veya sonuçta görüntü yoksa None
+    """
+    if result.mask is None:
+        return None
+
+    if result.ground_view is not None:
+        return _render_line_ground(result)
+
+    mask = result.mask
+    roi_height, mask_width = mask.shape
+    offset = result.mask_offset
+    image = np.zeros((roi_height, result.width, 3), np.uint8)
+    image[:, offset:offset + mask_width] = mask[:, :, None]
+
+    # Pencereli aramada işlenen bölge
+    if offset or mask_width < result.width:
+        cv2.rectangle(image, (offset, 0), (offset + mask_width - 1, roi_height - 1), (255, 0, 0), 1)
+
+    # Merkez çizgisini çiz
+    center = int(result.center * result.scale)
+    cv2.line(image, (center, 0), (center, roi_height), (0, 0, 255), 2)
+
+    # Tespit edilen şerit pozisyonunu çiz
+    if result.position is not None:
+        position = int((result.center + result.position) * result.scale)
+        cv2.line(image, (position, 0), (position, roi_height), (0, 255, 0), 2)
+
+        # Şerit genişliğini göster
+        half_width = int(result.line_width * result.scale) // 2
+        cv2.rectangle(image, (position - half_width, roi_height // 2),
+                      (position + half_width, roi_height // 2 + 20), (0, 255, 255), 2)
+
+    return image
+
+def _render_line_ground(result):
+    """
+    Zemin ızgarasındaki şerit sonucunu çizer (sütunlar sabit yanal mesafe)
+    """
+    view = result.ground_view
+    image = cv2.cvtColor(result.mask, cv2.COLOR_GRAY2BGR)
+    center = view.cols // 2
+    cv2.line(image, (center, 0), (center, view.rows), (0, 0, 255), 1)
+    if result.position is not None:
+        column = int((result.position + view.half_width) / view.cell_size)
+        cv2.line(image, (column, 0), (column, view.rows), (0, 255, 0), 1)
+    return image
+
+def render_crosswalk(result):
+    """
+    Zemin geçidi sonucunu çizer: filtrelenmiş ikili görüntü ve tespit edildiyse oran
+
+    Args:
+        result: CrosswalkResult
+
+    Returns:
+        image: BGR görüntü veya sonuçta görüntü yoksa None
+    """
+    if result.mask is None:
+        return None
+
+    image = cv2.cvtColor(result.mask, cv2.COLOR_GRAY2BGR)
+    if result.detected:
+        cv2.putText(image, f"Crosswalk: {result.ratio:.2f}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    return image
+
+def render_obstacles(result):
+    """
+    Engel sonucunu çizer: ROI, bölge sınırları, engel kutuları ve renkleri
+
+    Args:
+        result: ObstacleResult
+
+    Returns:
+        image: BGR görüntü (çalışma ölçeğinde) veya sonuçta görüntü yoksa None
+    """
+    if result.roi is None:
+        return None
+
+    image = result.roi.copy()
+    scale = result.scale
+    third = int(result.frame_width * scale) // 3
+    roi_height = image.shape[0]
+
+    # Bölgeleri çiz
+    cv2.line(image, (third, 0), (third, roi_height), (0, 0, 255), 2)
+    cv2.line(image, (2 * third, 0), (2 * third, roi_height), (0, 0, 255), 2)
+
+    for blob in result.blobs:
+        x, y, w, h = (int(v * scale) for v in blob.bbox)
+        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(image, blob.color, (x, max(y - 5, 10)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+
+    # En büyük engelin bölgesi
+    if result.detected:
+        cv2.putText(image, f"Obstacle: {result.position}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+    return image
@@ -0,0 +1,212 @@
+"""
+Asenkron debug görüntü yazıcısı - Kodlama ve diske yazma işlemini kontrol döngüsünden ayırır
+Sınırlı kuyruk dolduğunda en eski görüntü atılır, klasör boyutu disk kotası ile sınırlandırılır
+"""
+
+import os
+import time
+import threading
+from collections import deque, OrderedDict
+import config
+from loguru import logger
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+class DebugImageWriter:
+    def __init__(self, directory=config.DEBUG_IMAGE_DIR, queue_size=config.DEBUG_IMAGE_QUEUE_SIZE,
+                 image_format=config.DEBUG_IMAGE_FORMAT, quality=config.DEBUG_IMAGE_QUALITY,
+                 quota_mb=config.DEBUG_IMAGE_QUOTA_MB):
+        """
+        Debug görüntü yazıcısı başlatıcı
+
+        Args:
+            directory (str): Görüntülerin kaydedileceği klasör
+            queue_size (int): Bekleyen görüntü kuyruğu boyutu
+            image_format (str): Görüntü formatı ("jpg", "png", "webp")
+            quality (int): Kodlama kalitesi (jpg/webp için 0-100, png için sıkıştırma 0-9)
+            quota_mb (float): Klasör için disk kotası (MB)
+        """
+        self.directory = directory
+        self.extension = "." + image_format.lower().lstrip(".")
+
+        # Çalışma kimliği dosya adlarının önüne eklenir, önceki çalışmaların dosyaları ezilmez
+        self.run_id = time.strftime("%Y%m%d_%H%M%S")
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+
+        # Kodlama parametreleri
+        if self.extension in (".jpg", ".jpeg"):
+            self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        elif self.extension == ".webp":
+            self.encode_params = [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+        elif self.extension == ".png":
+            self.encode_params = [cv2.IMWRITE_PNG_COMPRESSION, min(9, int(quality))]
+        else:
+            self.encode_params = []
+
+        # Kuyruk: (dosya_adı, görüntü) - dolduğunda en eski atılır
+        self._queue = deque(maxlen=max(1, queue_size))
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        # Diskteki dosyalar (en eskiden en yeniye): yol -> boyut
+        self._files = OrderedDict()
+        self._total_bytes = 0
+
+        # Sayaçlar
+        self.images_written = 0
+        self.images_dropped = 0
+        self.files_deleted = 0
+        self.write_errors = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan_existing_files()
+
+        logger.info(f"Debug görüntü yazıcısı hazır. Klasör: {self.directory}, Format: {self.extension}, "
+                    f"Kuyruk: {self._queue.maxlen}, Kota: {quota_mb} MB")
+
+    def _scan_existing_files(self):
+        """
+        Önceki çalışmalardan kalan debug görüntülerini kotaya dahil eder (yalnızca bu formattaki dosyalar)
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.lower().endswith(self.extension):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self._add_file(path, size)
+
+        self._enforce_quota()
+
+    def start(self):
+        """
+        Yazıcı iş parçacığını başlatır
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, name="debug-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """
+        Kuyruktaki görüntüleri yazar ve iş parçacığını durdurur
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        logger.info(f"Debug görüntü yazıcısı durduruldu. {self.format_stats()}")
+
+    def submit(self, name, image):
+        """
+        Görüntüyü yazma kuyruğuna ekler (beklemeden döner)
+
+        Görüntü kopyalanır, böylece çağıran taraf tamponu yeniden kullanabilir.
+        Kuyruk doluysa en eski görüntü atılır.
+
+        Args:
+            name (str): Dosya adı (uzantısız, önüne çalışma kimliği eklenir)
+            image: Kaydedilecek görüntü
+        """
+        if image is None:
+            return
+
+        item = (name, image.copy())
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.images_dropped += 1
+            self._queue.append(item)
+            self._condition.notify()
+
+    def _write_loop(self):
+        """
+        Yazıcı döngüsü - kuyruktaki görüntüleri kodlar ve diske yazar
+        """
+        while True:
+            with self._condition:
+                while not self._queue and self._running:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                name, image = self._queue.popleft()
+
+            self._write(name, image)
+
+    def _write(self, name, image):
+        """
+        Tek bir görüntüyü kodlar, yazar ve kotayı uygular
+        """
+        path = os.path.join(self.directory, f"{self.run_id}_{name}{self.extension}")
+        try:
+            ok, encoded = cv2.imencode(self.extension, image, self.encode_params)
+            if not ok:
+                raise ValueError("görüntü kodlanamadı")
+
+            with open(path, "wb") as f:
+                f.write(encoded.tobytes())
+
+            self._add_file(path, encoded.size)
+            self.images_written += 1
+
+            self._enforce_quota()
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"Debug görüntüsü yazılamadı ({path}): {e}")
+
+    def _add_file(self, path, size):
+        """
+        Dosyayı en yeni olarak kaydeder (aynı yol yeniden yazıldıysa eski boyutu düşülür)
+        """
+        previous = self._files.pop(path, None)
+        if previous is not None:
+            self._total_bytes -= previous
+        self._files[path] = size
+        self._total_bytes += size
+
+    def _enforce_quota(self):
+        """
+        Kota aşıldıysa en eski dosyaları siler
+        """
+        while self._total_bytes > self.quota_bytes and self._files:
+            path, size = self._files.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+                self.files_deleted += 1
+            except OSError as e:
+                logger.warning(f"Eski debug görüntüsü silinemedi ({path}): {e}")
+
+    def get_stats(self):
+        """
+        Yazıcı sayaçlarını döndürür
+        """
+        return {
+            "written": self.images_written,
+            "dropped": self.images_dropped,
+            "deleted": self.files_deleted,
+            "errors": self.write_errors,
+            "disk_bytes": self._total_bytes,
+        }
+
+    def format_stats(self):
+        """
+        Yazıcı sayaçlarını log için biçimlendirir
+        """
+        return (f"Yazılan: {self.images_written}, Atılan: {self.images_dropped}, "
+                f"Silinen: {self.files_deleted}, Hata: {self.write_errors}, "
+                f"Disk: {self._total_bytes / (1024 * 1024):.1f} MB")
@@ -0,0 +1,224 @@
+"""
+Kare bağlamı - Her kare için ortak ön işleme sonuçlarını tutar
+Gri ve HSV dönüşümleri ile çözünürlük piramidi kare başına yalnızca bir kez yapılır ve
+algılayıcılar arasında paylaşılır
+"""
+
+from loguru import logger
+from lens_correction import get_lens_correction
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+class FrameContext:
+    def __init__(self, frame, gray=None, buffers=None):
+        """
+        Kare bağlamı başlatıcı
+
+        Args:
+            frame: Kameradan alınan BGR görüntü
+            gray: Hazır gri görüntü (örn. lores YUV420 akışının Y düzlemi).
+                  Verilirse BGR->gri dönüşümü yapılmaz; ana görüntüden küçük olabilir.
+            buffers: Türetilen görüntüler için BufferPool (None ise her kare yeni bellek ayrılır)
+        """
+        self.frame = frame
+        self.height, self.width = frame.shape[:2]
+        self.buffers = buffers
+
+        # Tembel hesaplanan görüntüler
+        self._gray = gray
+        self._hsv = None
+
+        # Gri görüntünün ana görüntüye göre ölçeği (lores akışta < 1.0)
+        self.gray_scale = gray.shape[0] / self.height if gray is not None else 1.0
+
+        # ROI önbelleği: (tür, üst, alt, piramit seviyesi) -> görüntü dilimi
+        self._roi_cache = {}
+
+        # Gri görüntü piramidi (seviye 0 gri görüntünün kendisi, tembel üretilir)
+        self._gray_levels = []
+
+        # Kuş bakışı ızgara önbelleği: id(GroundView) -> ızgara görüntüsü
+        self._ground_cache = {}
+
+    @classmethod
+    def wrap(cls, frame_or_context):
+        """
+        Ham kare verildiyse bağlama sarar, bağlam verildiyse aynen döndürür
+
+        Args:
+            frame_or_context: Ham görüntü veya FrameContext
+
+        Returns:
+            context: FrameContext nesnesi
+        """
+        if isinstance(frame_or_context, cls):
+            return frame_or_context
+        return cls(frame_or_context)
+
+    def use_buffers(self, buffers):
+        """
+        Türetilen görüntüler (gri, piramit, ROI) için uzun ömürlü tampon havuzu bağlar
+
+        Kareler sırayla işlendiğinde her kare bir öncekinin tamponlarını yeniden kullanır;
+        türetilen görüntüler yalnızca sonraki kare işlenene kadar geçerlidir.
+        """
+        if self.buffers is None:
+            self.buffers = buffers
+
+    def _dst(self, name, shape):
+        """
+        Havuz bağlıysa OpenCV çıktısı için tampon, değilse None (OpenCV yeni bellek ayırır)
+        """
+        if self.buffers is None:
+            return None
+        return self.buffers.get(name, shape)
+
+    @property
+    def gray(self):
+        """
+        Tüm karenin gri tonlamalı hali (ilk erişimde hesaplanır)
+        """
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY,
+                                      dst=self._dst("gray", (self.height, self.width)))
+        return self._gray
+
+    @property
+    def hsv(self):
+        """
+        Tüm karenin HSV hali (ilk erişimde hesaplanır)
+        """
+        if self._hsv is None:
+            self._hsv = cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV, dst=self._dst("hsv", self.frame.shape))
+        return self._hsv
+
+    def gray_level(self, level):
+        """
+        Gri görüntü piramidinin seviyesini döndürür (0: gri görüntü, her seviye yarı boyut)
+
+        Seviyeler ilk erişimde cv2.pyrDown ile üretilir ve tüm algılayıcılar arasında paylaşılır.
+        """
+        if not self._gray_levels:
+            self._gray_levels.append(self.gray)
+        while len(self._gray_levels) <= level:
+            previous = self._gray_levels[-1]
+            shape = ((previous.shape[0] + 1) // 2, (previous.shape[1] + 1) // 2)
+            self._gray_levels.append(cv2.pyrDown(previous, dst=self._dst(("gray", len(self._gray_levels)), shape)))
+        return self._gray_levels[level]
+
+    def gray_level_scale(self, level):
+        """
+        Gri piramit seviyesinin ana görüntüye göre ölçeği
+        """
+        return self.gray_level(level).shape[0] / self.height
+
+    def gray_level_for(self, scale):
+        """
+        İstenen çalışma ölçeğine en yakın (ondan küçük olmayan) gri piramit seviyesi
+        """
+        return self._level_for(self.gray_scale, scale)
+
+    @staticmethod
+    def _level_for(base_scale, scale):
+        level = 0
+        while base_scale / 2 >= scale * 0.99:
+            base_scale /= 2
+            level += 1
+        return level
+
+    def bgr_level_for(self, scale):
+        """
+        İstenen çalışma ölçeğine en yakın (ondan küçük olmayan) BGR piramit seviyesi
+        """
+        return self._level_for(1.0, scale)
+
+    def bgr_roi(self, top, bottom, level=0):
+        """
+        BGR görüntünün satır aralığını döndürür (seviye 0'da kopyasız dilim)
+
+        Lens kalibrasyonu varsa yalnızca bu satırlar bozulmadan arındırılır (kopya üretilir).
+        Seviye > 0 için ROI piramidi (cv2.pyrDown) bir önceki seviyeden üretilir.
+        """
+        key = ("bgr", top, bottom, level)
+        roi = self._roi_cache.get(key)
+        if roi is None:
+            if level > 0:
+                previous = self.bgr_roi(top, bottom, level - 1)
+                shape = ((previous.shape[0] + 1) // 2, (previous.shape[1] + 1) // 2, previous.shape[2])
+                roi = cv2.pyrDown(previous, dst=self._dst(key, shape))
+            else:
+                lens = get_lens_correction()
+                if lens is not None:
+                    roi = lens.undistort_rows(self.frame, top, bottom,
+                                              dst=self._dst(key, (bottom - top,) + self.frame.shape[1:]))
+                else:
+                    roi = self.frame[top:bottom, :]
+            self._roi_cache[key] = roi
+        return roi
+
+    def gray_roi(self, top, bottom, level=0):
+        """
+        Gri görüntünün (veya piramit seviyesinin) satır aralığını döndürür (kopyasız dilim)
+
+        Satır sınırları ana görüntü koordinatlarındadır; gri görüntü farklı ölçekteyse
+        sınırlar seviyenin ölçeği ile ölçeklenir. Lens kalibrasyonu varsa yalnızca bu satırlar
+        bozulmadan arındırılır.
+        """
+        key = ("gray", top, bottom, level)
+        roi = self._roi_cache.get(key)
+        if roi is None:
+            image = self.gray_level(level)
+            scale = image.shape[0] / self.height
+            lens = get_lens_correction()
+            if lens is not None:
+                roi = lens.undistort_rows(image, int(top * scale), int(bottom * scale),
+                                          dst=self._dst(key, (int(bottom * scale) - int(top * scale), image.shape[1])))
+            else:
+                roi = image[int(top * scale):int(bottom * scale), :]
+            self._roi_cache[key] = roi
+        return roi
+
+    def hsv_roi(self, top, bottom, level=0):
+        """
+        HSV görüntünün satır aralığını döndürür
+
+        Tüm kare HSV'ye henüz çevrilmediyse yalnızca istenen satırlar dönüştürülür,
+        böylece sadece engel ROI'si kullanıldığında tam kare dönüşümü yapılmaz.
+        """
+        key = ("hsv", top, bottom, level)
+        roi = self._roi_cache.get(key)
+        if roi is None:
+            if level == 0 and self._hsv is not None and get_lens_correction() is None:
+                roi = self._hsv[top:bottom, :]
+            else:
+                bgr = self.bgr_roi(top, bottom, level)
+                roi = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV, dst=self._dst(key, bgr.shape))
+            self._roi_cache[key] = roi
+        return roi
+
+    def ground(self, view):
+        """
+        Gri görüntünün kuş bakışı zemin ızgarasını döndürür (kare başına bir kez hesaplanır)
+
+        Args:
+            view: GroundView nesnesi
+        """
+        grid = self._ground_cache.get(id(view))
+        if grid is None:
+            grid = view.warp(self.gray, dst=self._dst(("ground", id(view)), view.shape))
+            self._ground_cache[id(view)] = grid
+        return grid
+
+    def bottom_rows(self, rows):
+        """
+        Alt kısımdan başlayan ROI için (üst, alt) satır sınırlarını döndürür
+        """
+        rows = min(rows, self.height)
+        return self.height - rows, self.height
@@ -0,0 +1,388 @@
+"""
+Kare kaynakları - Kontrol döngüsünün görüntü aldığı ortak arayüz ve dosya tabanlı kaynaklar
+Kamera (camera_capture.CameraCapture), video dosyası, görüntü klasörü ve run_recorder kayıtları
+aynı read() arayüzünü sunar; böylece karar döngüsü kamera olmadan kayıtlı veri üzerinde çalışır.
+
+Dosya kaynaklarının iki modu vardır:
+    realtime=True:  Kareler kayıttaki zamanlamayla "yayınlanır", döngü yetişemezse kare atlanır (kamera gibi)
+    realtime=False: Her read() sıradaki kareyi beklemeden verir (olabildiğince hızlı, profil için)
+"""
+
+import os
+import time
+import config
+from loguru import logger
+from frame_context import FrameContext
+from run_recorder import load_recording
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+class FrameSource:
+    """
+    Kare kaynağı arayüzü - kontrol döngüsü yalnızca bu metotları kullanır
+    """
+    # False ise kaynak olabildiğince hızlı kare verir, döngü zamanlayıcısı beklemez
+    realtime = True
+
+    def start(self):
+        """
+        Kaynağı başlatır
+        """
+
+    def stop(self):
+        """
+        Kaynağı durdurur
+        """
+
+    def set_throttle(self, interval):
+        """
+        Kareler arası minimum süreyi ayarlar (0 veya None: tam hız)
+        """
+
+    @property
+    def exhausted(self):
+        """
+        Kaynakta başka kare kalmadıysa True (kamera için her zaman False)
+        """
+        return False
+
+    def read(self, wait_new=False, timeout=None):
+        """
+        En yeni kareyi döndürür
+
+        Returns:
+            frame: FrameContext (henüz kare yoksa None)
+            frame_id: Karenin sıra numarası
+            timestamp: Karenin alındığı zaman (time.monotonic)
+            is_new: Kare daha önce okunmamışsa True
+        """
+        raise NotImplementedError
+
+    def get_stats(self):
+        """
+        Kaynak sayaçlarını döndürür
+        """
+        return {}
+
+    def format_stats(self):
+        """
+        Kaynak sayaçlarını log için biçimlendirir
+        """
+        return ""
+
+class PlaybackSource(FrameSource):
+    def __init__(self, realtime=True, loop=False, lores_size=None):
+        """
+        Dosya tabanlı kare kaynağı başlatıcı
+
+        Alt sınıflar _next_item() ve _rewind() metotlarını uygular.
+
+        Args:
+            realtime (bool): Kayıttaki zamanlamaya uy (False: olabildiğince hızlı)
+            loop (bool): Sona gelince başa dön
+            lores_size (tuple): Verilirse lores Y düzlemi gri görüntüden taklit edilir (genişlik, yükseklik)
+        """
+        self.realtime = realtime
+        self.loop = loop
+        self.lores_size = lores_size
+
+        self._start_time = None
+        self._time_offset = 0.0     # Başa dönüldüğünde kayıt zamanına eklenen süre
+        self._last_media_time = 0.0
+        self._pending = None        # Sıradaki (kayıt_zamanı, yükleyici)
+        self._latest = None         # Son verilen (FrameContext, kare_no, zaman_damgası)
+        self._latest_time = 0.0
+        self._last_read_id = 0
+        self._throttle_interval = 0.0
+        self._exhausted = False
+
+        # Sayaçlar (CameraCapture ile aynı anlamda)
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_reused = 0
+        self.capture_errors = 0
+
+    def _next_item(self):
+        """
+        Sıradaki kareyi döndürür
+
+        Returns:
+            item: (kayıt_zamanı, yükleyici) veya kaynak bittiyse None.
+                  yükleyici() -> (BGR kare, gri görüntü veya None); atlanan kareler yüklenmez.
+        """
+        raise NotImplementedError
+
+    def _rewind(self):
+        """
+        Kaynağı başa sarar
+        """
+        raise NotImplementedError
+
+    @property
+    def exhausted(self):
+        return self._exhausted
+
+    def set_throttle(self, interval):
+        self._throttle_interval = interval or 0.0
+
+    def _fetch(self):
+        """
+        Sıradaki kareyi alır, gerekirse başa döner
+        """
+        item = self._next_item()
+        if item is None and self.loop and self.frames_captured > 0:
+            self._time_offset = self._last_media_time + 1.0 / config.CAMERA_FRAMERATE
+            self._rewind()
+            item = self._next_item()
+
+        if item is None:
+            return None
+
+        media_time, loader = item
+        media_time += self._time_offset
+        self._last_media_time = media_time
+        return media_time, loader
+
+    def _deliver(self, loader):
+        """
+        Kareyi yükler ve bağlamını oluşturur
+        """
+        frame, gray = loader()
+        if gray is None and self.lores_size is not None:
+            gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), self.lores_size,
+                              interpolation=cv2.INTER_AREA)
+
+        self.frames_captured += 1
+        self._latest = (FrameContext(frame, gray), self.frames_captured, time.monotonic())
+        self._latest_time = time.monotonic()
+
+    def read(self, wait_new=False, timeout=None):
+        if self._exhausted:
+            return None, 0, 0.0, False
+
+        try:
+            if self.realtime:
+                self._advance_realtime(wait_new, timeout)
+            else:
+                item = self._fetch()
+                if item is None:
+                    self._exhausted = True
+                else:
+                    self._deliver(item[1])
+        except Exception as e:
+            self.capture_errors += 1
+            logger.error(f"Kare okunamadı: {e}")
+
+        if self._latest is None:
+            return None, 0, 0.0, False
+
+        ctx, frame_id, timestamp = self._latest
+        if frame_id == self._last_read_id:
+            if self._exhausted:
+                return None, 0, 0.0, False
+            self.frames_reused += 1
+            return ctx, frame_id, timestamp, False
+
+        self._last_read_id = frame_id
+        return ctx, frame_id, timestamp, True
+
+    def _advance_realtime(self, wait_new, timeout):
+        """
+        Geçen süreye göre zamanı gelmiş en son kareyi yükler (aradaki kareler atlanır)
+        """
+        now = time.monotonic()
+        if self._start_time is None:
+            self._start_time = now
+
+        # Seyreltilmiş modda bir sonraki kareye kadar yeni kare verilmez
+        if self._latest is not None and now - self._latest_time < self._throttle_interval:
+            return
+
+        if self._pending is None:
+            self._pending = self._fetch()
+            if self._pending is None:
+                self._exhausted = True
+                return
+
+        # İstenirse sıradaki karenin zamanına kadar bekle
+        if wait_new and self._latest is not None:
+            delay = self._pending[0] - (now - self._start_time)
+            if delay > 0:
+                time.sleep(delay if timeout is None else min(delay, timeout))
+                now = time.monotonic()
+
+        elapsed = now - self._start_time
+        newest = None
+        while self._pending is not None and self._pending[0] <= elapsed:
+            if newest is not None:
+                self.frames_dropped += 1
+            newest = self._pending
+            self._pending = self._fetch()
+
+        if newest is not None:
+            self._deliver(newest[1])
+
+        if self._pending is None and newest is None:
+            self._exhausted = True
+
+    def get_stats(self):
+        return {
+            "captured": self.frames_captured,
+            "dropped": self.frames_dropped,
+            "reused": self.frames_reused,
+            "errors": self.capture_errors,
+        }
+
+    def format_stats(self):
+        return (f"Okunan: {self.frames_captured}, Atlanan: {self.frames_dropped}, "
+                f"Tekrar kullanılan: {self.frames_reused}, Hata: {self.capture_errors}")
+
+class VideoFileSource(PlaybackSource):
+    def __init__(self, path, realtime=True, loop=False, lores_size=None):
+        """
+        Video dosyası kaynağı başlatıcı (cv2.VideoCapture)
+
+        Args:
+            path (str): Video dosyası
+        """
+        super().__init__(realtime=realtime, loop=loop, lores_size=lores_size)
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Video dosyası açılamadı: {path}")
+
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or config.CAMERA_FRAMERATE
+        self._index = 0
+        logger.info(f"Video kaynağı: {path}, FPS: {self.fps:.1f}, "
+                    f"Kare: {int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))}")
+
+    def _next_item(self):
+        ok, frame = self.capture.read()
+        if not ok:
+            return None
+
+        # Video çözümü sıralıdır, kare atlansa da okunmak zorundadır
+        media_time = self._index / self.fps
+        self._index += 1
+        return media_time, lambda: (frame, None)
+
+    def _rewind(self):
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._index = 0
+
+    def stop(self):
+        self.capture.release()
+
+class ImageDirectorySource(PlaybackSource):
+    def __init__(self, directory, frame_rate=config.CAMERA_FRAMERATE, realtime=True, loop=False,
+                 lores_size=None):
+        """
+        Görüntü klasörü kaynağı başlatıcı - dosyalar ada göre sıralanır
+
+        Args:
+            directory (str): Görüntü klasörü
+            frame_rate (float): Gerçek zamanlı modda kare hızı
+        """
+        super().__init__(realtime=realtime, loop=loop, lores_size=lores_size)
+        self.directory = directory
+        self.frame_rate = frame_rate
+        self.paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise ValueError(f"Klasörde görüntü bulunamadı: {directory}")
+
+        self._index = 0
+        logger.info(f"Görüntü klasörü kaynağı: {directory}, {len(self.paths)} görüntü, {frame_rate} FPS")
+
+    def _next_item(self):
+        if self._index >= len(self.paths):
+            return None
+
+        path = self.paths[self._index]
+        media_time = self._index / self.frame_rate
+        self._index += 1
+
+        def load():
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is None:
+                raise ValueError(f"görüntü okunamadı: {path}")
+            return frame, None
+
+        return media_time, load
+
+    def _rewind(self):
+        self._index = 0
+
+class RecordingSource(PlaybackSource):
+    def __init__(self, path, realtime=True, loop=False, lores_size=None):
+        """
+        run_recorder kaydı kaynağı başlatıcı (bellek eşlemeli, kareler kopyalanmadan okunur)
+
+        Gri kaydedilmiş çalışmalarda (RUN_RECORD_SOURCE="gray") gri görüntü doğrudan
+        kullanılır, BGR kare gri görüntüden oluşturulur.
+
+        Args:
+            path (str): Kayıt klasörü
+        """
+        super().__init__(realtime=realtime, loop=loop, lores_size=lores_size)
+        self.path = path
+        self.frames, self.index = load_recording(path)
+        if len(self.frames) == 0:
+            raise ValueError(f"Kayıt boş: {path}")
+
+        # Kayıttaki zaman damgaları (time.monotonic) -> başlangıca göre süre
+        timestamps = self.index["timestamp"]
+        self.media_times = timestamps - timestamps[0]
+        self._index = 0
+        logger.info(f"Kayıt kaynağı: {path}, {len(self.frames)} kare, "
+                    f"Süre: {self.media_times[-1]:.1f} sn, Boyut: {self.frames.shape[1:]}")
+
+    def _next_item(self):
+        if self._index >= len(self.frames):
+            return None
+
+        i = self._index
+        self._index += 1
+
+        def load():
+            frame = self.frames[i]
+            if frame.ndim == 2:
+                return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR), frame
+            return frame, None
+
+        return float(self.media_times[i]), load
+
+    def _rewind(self):
+        self._index = 0
+
+def open_frame_source(spec, realtime=True, loop=False, lores_size=None):
+    """
+    Dosya yolundan uygun kare kaynağını oluşturur
+
+    Args:
+        spec (str): Video dosyası, görüntü klasörü veya run_recorder kayıt klasörü
+        realtime (bool): Kayıttaki zamanlamaya uy (False: olabildiğince hızlı)
+        loop (bool): Sona gelince başa dön
+        lores_size (tuple): Lores Y düzlemini taklit et
+
+    Returns:
+        source: FrameSource
+    """
+    if os.path.isdir(spec):
+        if os.path.exists(os.path.join(spec, "frames.npy")):
+            return RecordingSource(spec, realtime=realtime, loop=loop, lores_size=lores_size)
+        return ImageDirectorySource(spec, realtime=realtime, loop=loop, lores_size=lores_size)
+
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, realtime=realtime, loop=loop, lores_size=lores_size)
+
+    raise ValueError(f"Kare kaynağı bulunamadı: {spec}")
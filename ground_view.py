@@ -0,0 +1,147 @@
+"""
+Kuş bakışı zemin görüntüsü - Perspektif görüntünün zemin düzlemine izdüşümü (IPM)
+Dönüşüm CameraModel'den (CAMERA_HEIGHT, eğim, görüş açısı) bir kez hesaplanan cv2.remap
+tablolarıyla uygulanır; yalnızca ızgaranın gördüğü satır bandı okunur.
+
+Lens kalibrasyonu varsa bozulma tabloların içine katlanır: ızgara doğrudan ham görüntüden örneklenir.
+
+Izgara: satırlar uzaktan yakına (üst satır en uzak), sütunlar soldan sağa; hücre boyutu cm
+"""
+
+import numpy as np
+import config
+from loguru import logger
+from camera_model import CameraModel
+from lens_correction import get_lens_correction
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+class GroundView:
+    def __init__(self, near=config.GROUND_VIEW_NEAR, far=config.GROUND_VIEW_FAR,
+                 half_width=config.GROUND_VIEW_HALF_WIDTH, cell_size=config.GROUND_VIEW_CELL_SIZE):
+        """
+        Kuş bakışı zemin ızgarası başlatıcı
+
+        Args:
+            near (float): Izgaranın en yakın kenarı (cm, kameranın zemindeki izdüşümünden ileri)
+            far (float): Izgaranın en uzak kenarı (cm)
+            half_width (float): Izgaranın merkezden her iki yana genişliği (cm)
+            cell_size (float): Hücre boyutu (cm/piksel)
+        """
+        self.near = near
+        self.far = far
+        self.half_width = half_width
+        self.cell_size = cell_size
+
+        self.rows = int(round((far - near) / cell_size))
+        self.cols = int(round(2 * half_width / cell_size))
+
+        # Hücre merkezlerinin zemin koordinatları (x ileri, y sağa, cm)
+        self.distances = far - (np.arange(self.rows) + 0.5) * cell_size
+        self.laterals = -half_width + (np.arange(self.cols) + 0.5) * cell_size
+
+        # Görüntü boyutuna göre remap tabloları: (genişlik, yükseklik) -> (map1, map2, üst, alt)
+        self._maps = {}
+
+    @property
+    def shape(self):
+        """
+        Izgara boyutu (satır, sütun)
+        """
+        return self.rows, self.cols
+
+    def image_coordinates(self, resolution):
+        """
+        Her ızgara hücresinin perspektif görüntüdeki koordinatlarını hesaplar
+
+        Args:
+            resolution (tuple): Görüntü çözünürlüğü (genişlik, yükseklik)
+
+        Returns:
+            map_x, map_y: (satır, sütun) float32 piksel koordinatları (ham, bozulmalı görüntüde)
+        """
+        lens = get_lens_correction()
+        camera_matrix = lens.camera_matrix_for(resolution) if lens is not None else None
+        camera = CameraModel(resolution=resolution, camera_matrix=camera_matrix)
+        x, y_right = np.meshgrid(self.distances, self.laterals, indexing="ij")
+        points = np.stack([x.ravel(), -y_right.ravel(), np.zeros(x.size)], axis=1)
+        pixels, _ = camera.project_points(points)
+        if lens is not None:
+            pixels = lens.distort_points(pixels, resolution)
+        map_x = pixels[:, 0].reshape(self.shape).astype(np.float32)
+        map_y = pixels[:, 1].reshape(self.shape).astype(np.float32)
+        return map_x, map_y
+
+    def _tables(self, width, height):
+        """
+        Görüntü boyutu için remap tablolarını döndürür (ilk kullanımda hesaplanır)
+
+        Tablolar görüntünün yalnızca ızgaranın gördüğü satır bandına göre kaydırılır ve
+        hızlı sabit noktalı biçime (CV_16SC2) dönüştürülür.
+        """
+        key = (width, height)
+        tables = self._maps.get(key)
+        if tables is None:
+            map_x, map_y = self.map_coordinates(width, height)
+
+            # Okunacak satır bandı (bilinear komşular dahil)
+            top = int(np.clip(np.floor(map_y.min()) - 1, 0, height - 1))
+            bottom = int(np.clip(np.ceil(map_y.max()) + 2, top + 1, height))
+            map1, map2 = cv2.convertMaps(map_x, map_y - top, cv2.CV_16SC2)
+            tables = (map1, map2, top, bottom)
+            self._maps[key] = tables
+            logger.debug(f"Zemin görünümü tabloları hazır. Görüntü: {width}x{height}, Satır bandı: {top}-{bottom}, "
+                         f"Izgara: {self.cols}x{self.rows} ({self.cell_size} cm/hücre)")
+        return tables
+
+    def map_coordinates(self, width, height):
+        """
+        Verilen boyuttaki görüntü için hücre koordinatları (ana görüntüden ölçeklenir)
+
+        Ana görüntü config.CAMERA_RESOLUTION oranındadır; lores gri düzlem gibi küçük
+        görüntülerde koordinatlar orantılı olarak ölçeklenir.
+        """
+        base_width, base_height = config.CAMERA_RESOLUTION
+        map_x, map_y = self.image_coordinates((base_width, base_height))
+        return map_x * (width / base_width), map_y * (height / base_height)
+
+    def warp(self, image, dst=None):
+        """
+        Perspektif görüntüyü kuş bakışı ızgaraya dönüştürür
+
+        Args:
+            image: Gri veya BGR görüntü (tüm kare)
+            dst: İsteğe bağlı çıktı tamponu
+
+        Returns:
+            ground: (satır, sütun) ızgara görüntüsü - görüş alanı dışı hücreler 0
+        """
+        height, width = image.shape[:2]
+        map1, map2, top, bottom = self._tables(width, height)
+        return cv2.remap(image[top:bottom], map1, map2, cv2.INTER_LINEAR, dst=dst,
+                         borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+
+    def column_to_lateral(self, column):
+        """
+        Izgara sütununu yanal mesafeye çevirir (cm, + sağ)
+        """
+        return -self.half_width + (column + 0.5) * self.cell_size
+
+    def row_to_distance(self, row):
+        """
+        Izgara satırını ileri mesafeye çevirir (cm)
+        """
+        return self.far - (row + 0.5) * self.cell_size
+
+    def cells(self, centimeters):
+        """
+        Uzunluğu hücre sayısına çevirir (en az 1)
+        """
+        return max(1, int(round(centimeters / self.cell_size)))
@@ -0,0 +1,176 @@
+"""
+Aşama gecikme ölçümü - Kareden motor komutuna kadar her aşamanın süresini histogramlarda toplar
+Sabit boyutlu logaritmik histogramlar kullanılır: kayıt başına bellek ayrılmaz, ölçüm başına
+maliyet birkaç mikrosaniyedir, böylece üretimde sürekli açık kalabilir
+"""
+
+import math
+import time
+
+# Kontrol döngüsünde ölçülen aşamalar (log sırası)
+STAGES = (
+    "capture",      # capture.read() çağrısı
+    "frame_age",    # Karenin yakalanmasından döngüye ulaşmasına kadar geçen süre
+    "preprocess",   # Ortak gri dönüşüm (FrameContext)
+    "obstacle",     # Engel algılama
+    "crosswalk",    # Zemin geçidi kontrolü
+    "line",         # Şerit algılama
+    "lane_model",   # Şerit polinom modeli (ileri bakış)
+    "decision",     # Motor komutu kararı
+    "motor",        # MotorController çağrısı (PWM yazma)
+    "end_to_end",   # Karenin yakalanmasından motor komutuna kadar
+    "loop",         # Döngü turunun işlem süresi (bekleme hariç)
+)
+
+class LatencyHistogram:
+    __slots__ = ("_log_min", "_bins_per_decade", "counts", "count", "total", "max")
+
+    def __init__(self, min_value=1e-6, max_value=10.0, bins_per_decade=20):
+        """
+        Logaritmik gecikme histogramı başlatıcı
+
+        Bölme genişliği sabit oranlıdır (20 bölme/dekad için ~%12), yüzdelikler bu
+        hassasiyetle bölmenin üst sınırı olarak raporlanır.
+
+        Args:
+            min_value (float): En küçük ayrıştırılan değer (saniye), altı ilk bölmeye düşer
+            max_value (float): En büyük ayrıştırılan değer (saniye), üstü son bölmeye düşer
+            bins_per_decade (int): Dekad başına bölme sayısı
+        """
+        self._log_min = math.log10(min_value)
+        self._bins_per_decade = bins_per_decade
+        size = int(math.ceil(math.log10(max_value / min_value) * bins_per_decade)) + 2
+        self.counts = [0] * size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """
+        Bir ölçüm ekler
+        """
+        if seconds > 0:
+            index = int((math.log10(seconds) - self._log_min) * self._bins_per_decade) + 1
+            if index < 0:
+                index = 0
+            elif index >= len(self.counts):
+                index = len(self.counts) - 1
+        else:
+            index = 0
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def _upper_edge(self, index):
+        return 10 ** (self._log_min + index / self._bins_per_decade)
+
+    def percentile(self, q):
+        """
+        Yüzdelik değerini döndürür (saniye, bölme üst sınırı, en büyük ölçümle sınırlı)
+
+        Args:
+            q (float): Yüzdelik (0-100)
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = q / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return min(self._upper_edge(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        """
+        Tüm ölçümleri siler
+        """
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+class LatencyProfiler:
+    def __init__(self, stages=STAGES):
+        """
+        Aşama gecikme ölçer başlatıcı
+
+        Kullanım:
+            t = profiler.start()
+            ...                        # aşama
+            t = profiler.lap("line", t)
+
+        Args:
+            stages: Aşama adları
+        """
+        self.stages = tuple(stages)
+        self.histograms = {stage: LatencyHistogram() for stage in self.stages}
+
+    @staticmethod
+    def start():
+        """
+        Ölçüm başlangıç zamanını döndürür
+        """
+        return time.perf_counter()
+
+    def lap(self, stage, start):
+        """
+        start'tan bu yana geçen süreyi aşamaya kaydeder
+
+        Returns:
+            now: Bir sonraki aşamanın başlangıç zamanı
+        """
+        now = time.perf_counter()
+        self.histograms[stage].record(now - start)
+        return now
+
+    def record(self, stage, seconds):
+        """
+        Dışarıda ölçülmüş bir süreyi aşamaya kaydeder
+        """
+        self.histograms[stage].record(seconds)
+
+    def get_stats(self):
+        """
+        Ölçüm yapılmış aşamaların özetini döndürür
+
+        Returns:
+            stats: {aşama: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+        """
+        stats = {}
+        for stage in self.stages:
+            histogram = self.histograms[stage]
+            if histogram.count == 0:
+                continue
+            stats[stage] = {
+                "count": histogram.count,
+                "mean_ms": histogram.mean * 1000,
+                "p50_ms": histogram.percentile(50) * 1000,
+                "p95_ms": histogram.percentile(95) * 1000,
+                "p99_ms": histogram.percentile(99) * 1000,
+                "max_ms": histogram.max * 1000,
+            }
+        return stats
+
+    def format_stats(self):
+        """
+        Aşama özetlerini log için biçimlendirir (p50/p95/p99 ms)
+        """
+        parts = [f"{stage}: {s['p50_ms']:.2f}/{s['p95_ms']:.2f}/{s['p99_ms']:.2f}"
+                 for stage, s in self.get_stats().items()]
+        return "Aşama gecikmeleri p50/p95/p99 (ms) - " + (", ".join(parts) if parts else "ölçüm yok")
+
+    def reset(self):
+        """
+        Tüm aşamaların ölçümlerini siler
+        """
+        for histogram in self.histograms.values():
+            histogram.reset()
@@ -0,0 +1,178 @@
+"""
+Lens bozulması düzeltme - calibrate_camera.py ile bulunan iç parametrelerle undistort
+Düzeltme tabloları çözünürlük başına bir kez hesaplanır ve diske önbelleklenir; algılayıcılar
+yalnızca kullandıkları ROI satırlarını düzeltir (FrameContext), kuş bakışı ızgarada bozulma
+remap tablosunun içine katlanır (GroundView), böylece ek maliyet oluşmaz.
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+import config
+from loguru import logger
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+class LensCorrection:
+    def __init__(self, camera_matrix, dist_coeffs, resolution, cache_dir=config.CAMERA_UNDISTORT_CACHE_DIR):
+        """
+        Lens bozulması düzeltici başlatıcı
+
+        Args:
+            camera_matrix: 3x3 kamera iç parametre matrisi (kalibrasyon çözünürlüğünde)
+            dist_coeffs: Bozulma katsayıları (k1, k2, p1, p2, k3, ...)
+            resolution (tuple): Kalibrasyon görüntülerinin çözünürlüğü (genişlik, yükseklik)
+            cache_dir (str): Düzeltme tablolarının önbelleklendiği klasör (None ise diske yazılmaz)
+        """
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64).reshape(3, 3)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+        self.resolution = tuple(int(v) for v in resolution)
+        self.cache_dir = cache_dir
+
+        # Parametrelerin özeti - önbellek dosyaları kalibrasyon değişince geçersiz olur
+        digest = hashlib.sha1(self.camera_matrix.tobytes() + self.dist_coeffs.tobytes())
+        self.key = digest.hexdigest()[:12]
+
+        # (genişlik, yükseklik) -> (map1, map2) ve (genişlik, yükseklik, üst, alt) -> dilimler
+        self._maps = {}
+        self._row_maps = {}
+
+    @classmethod
+    def load(cls, path=config.CAMERA_CALIBRATION_FILE):
+        """
+        Kalibrasyon dosyasını yükler
+
+        Returns:
+            lens: LensCorrection veya dosya yoksa/okunamazsa None
+        """
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            lens = cls(data["camera_matrix"], data["dist_coeffs"], data["resolution"])
+            logger.info(f"Lens kalibrasyonu yüklendi: {path} (RMS: {data.get('rms', 0):.3f} px)")
+            return lens
+        except Exception as e:
+            logger.error(f"Lens kalibrasyonu yüklenemedi ({path}): {e}")
+            return None
+
+    def camera_matrix_for(self, resolution):
+        """
+        İç parametre matrisini verilen çözünürlüğe ölçekler (aynı görüş alanı varsayılır)
+        """
+        sx = resolution[0] / self.resolution[0]
+        sy = resolution[1] / self.resolution[1]
+        K = self.camera_matrix.copy()
+        K[0] *= sx
+        K[1] *= sy
+        return K
+
+    def distort_points(self, pixels, resolution):
+        """
+        Bozulmasız (ideal) piksel koordinatlarını ham kameradaki koordinatlara çevirir
+
+        Args:
+            pixels: (N, 2) ideal görüntü koordinatları (camera_matrix_for(resolution) ile)
+            resolution (tuple): Görüntü çözünürlüğü
+
+        Returns:
+            distorted: (N, 2) ham görüntü koordinatları
+        """
+        K = self.camera_matrix_for(resolution)
+        pixels = np.asarray(pixels, dtype=np.float64)
+        normalized = np.empty((len(pixels), 3))
+        normalized[:, 0] = (pixels[:, 0] - K[0, 2]) / K[0, 0]
+        normalized[:, 1] = (pixels[:, 1] - K[1, 2]) / K[1, 1]
+        normalized[:, 2] = 1.0
+        distorted, _ = cv2.projectPoints(normalized, np.zeros(3), np.zeros(3), K, self.dist_coeffs)
+        return distorted.reshape(-1, 2)
+
+    def _full_maps(self, width, height):
+        """
+        Tüm görüntü için düzeltme tabloları (bellek ve disk önbelleği)
+        """
+        key = (width, height)
+        maps = self._maps.get(key)
+        if maps is not None:
+            return maps
+
+        path = None
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"undistort_{width}x{height}_{self.key}.npz")
+            if os.path.exists(path):
+                try:
+                    with np.load(path) as data:
+                        maps = (data["map1"], data["map2"])
+                except Exception as e:
+                    logger.warning(f"Düzeltme tablosu önbelleği okunamadı ({path}): {e}")
+
+        if maps is None:
+            K = self.camera_matrix_for(key)
+            maps = cv2.initUndistortRectifyMap(K, self.dist_coeffs, None, K, key, cv2.CV_16SC2)
+            if path is not None:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    np.savez(path, map1=maps[0], map2=maps[1])
+                except OSError as e:
+                    logger.warning(f"Düzeltme tablosu önbelleğe yazılamadı ({path}): {e}")
+
+        self._maps[key] = maps
+        return maps
+
+    def undistort_rows(self, image, top, bottom, dst=None):
+        """
+        Düzeltilmiş görüntünün yalnızca [top, bottom) satırlarını üretir
+
+        Kaynak olarak tüm ham görüntü kullanılır (bozulma satırları kaydırır), ancak yalnızca
+        istenen çıktı satırları hesaplanır.
+
+        Args:
+            image: Ham gri veya BGR görüntü (tüm kare)
+            top, bottom: Çıktı satır aralığı (görüntünün kendi koordinatlarında)
+            dst: İsteğe bağlı çıktı tamponu
+        """
+        height, width = image.shape[:2]
+        key = (width, height, top, bottom)
+        row_maps = self._row_maps.get(key)
+        if row_maps is None:
+            map1, map2 = self._full_maps(width, height)
+            row_maps = (map1[top:bottom], map2[top:bottom])
+            self._row_maps[key] = row_maps
+        return cv2.remap(image, row_maps[0], row_maps[1], cv2.INTER_LINEAR, dst=dst,
+                         borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+
+# Çalışma boyunca kullanılan düzeltici (ilk erişimde config'e göre yüklenir)
+_lens = None
+_lens_loaded = False
+
+def get_lens_correction():
+    """
+    Etkin lens düzelticisini döndürür
+
+    Returns:
+        lens: LensCorrection veya düzeltme kapalıysa/kalibrasyon yoksa None
+    """
+    global _lens, _lens_loaded
+    if not _lens_loaded:
+        _lens_loaded = True
+        if config.LENS_CORRECTION_ENABLED and OPENCV_AVAILABLE:
+            _lens = LensCorrection.load()
+    return _lens
+
+def set_lens_correction(lens):
+    """
+    Etkin lens düzelticisini değiştirir (None: düzeltme kapalı, ör. sentetik görüntülerde)
+    """
+    global _lens, _lens_loaded
+    _lens = lens
+    _lens_loaded = True
@@ -3,10 +3,16 @@
 Raspberry Pi 5 için uyumlu hale getirilmiştir
 """
 
+import math
 import time
 import config
 import numpy as np
 from loguru import logger
+from frame_context import FrameContext
+from camera_model import CameraModel
+from ground_view import GroundView
+from lens_correction import get_lens_correction
+from buffer_pool import BufferPool
 
 # OpenCV modülünü kontrol et ve içe aktar
 try:
@@ -17,6 +23,66 @@ except ImportError:
     logger.error("sudo apt install -y python3-opencv")
     OPENCV_AVAILABLE = False
 
+class LaneModel:
+    """
+    Şeridin zemin düzleminde polinom modeli ve ileri bakış noktasındaki değerleri
+
+    İşaret kuralı detect_line ile aynıdır: pozitif değerler sağ tarafı gösterir.
+    """
+    __slots__ = ("offset", "heading", "curvature", "lookahead", "position", "coefficients", "points")
+
+    def __init__(self, offset, heading, curvature, lookahead, position, coefficients, points):
+        self.offset = offset                # İleri bakış mesafesinde yanal sapma (cm, + sağ)
+        self.heading = heading              # İleri bakış noktasında şerit yönü (radyan, + sağa)
+        self.curvature = curvature          # İleri bakış noktasında eğrilik (1/cm, + sağa kıvrılıyor)
+        self.lookahead = lookahead          # İleri bakış mesafesi (cm)
+        self.position = position            # İleri bakış noktasının görüntüdeki yeri (merkeze göre piksel)
+        self.coefficients = coefficients    # y_sağ(x) = c0 + c1*x + c2*x^2 katsayıları (cm)
+        self.points = points                # Modelde kullanılan bant merkezleri (N, 2) - görüntü pikseli
+
+    def __repr__(self):
+        return (f"LaneModel(offset={self.offset:.1f}cm, heading={math.degrees(self.heading):.1f}deg, "
+                f"curvature={self.curvature:.4f}/cm, position={self.position:.0f}px)")
+
+class LineResult:
+    """
+    Şerit takibi sonucu
+
+    mask alanı algılayıcının tamponudur: yalnızca sonraki detect_line çağrısına kadar geçerlidir.
+    Görselleştirme debug_overlay.render_line ile, yalnızca istendiğinde yapılır.
+    """
+    __slots__ = ("position", "confidence", "mask", "mask_offset", "width", "scale", "center",
+                 "line_width", "ground_view")
+
+    def __init__(self, position, confidence, mask, mask_offset=0, width=None, scale=1.0, center=0,
+                 line_width=0, ground_view=None):
+        self.position = position            # Şeridin merkeze göre pozisyonu (piksel, zemin görünümünde cm) veya None
+        self.confidence = confidence        # Tepe sütunun doluluk oranı (0-1)
+        self.mask = mask                    # İşlenen ikili görüntü (tam ROI, arama penceresi veya zemin ızgarası)
+        self.mask_offset = mask_offset      # Pencerenin ROI içindeki başlangıç sütunu (çalışma ölçeğinde)
+        self.width = width                  # Tam ROI genişliği (çalışma ölçeğinde)
+        self.scale = scale                  # Çalışma görüntüsünün ana görüntüye göre ölçeği
+        self.center = center                # Ana görüntü merkezi (piksel)
+        self.line_width = line_width        # Yaklaşık şerit genişliği (ana görüntü pikseli)
+        self.ground_view = ground_view      # Zemin görünümü açıksa GroundView
+
+    def __repr__(self):
+        return f"LineResult(position={self.position}, confidence={self.confidence:.2f})"
+
+class CrosswalkResult:
+    """
+    Zemin geçidi kontrolü sonucu (mask sonraki is_crosswalk çağrısına kadar geçerlidir)
+    """
+    __slots__ = ("detected", "ratio", "mask")
+
+    def __init__(self, detected, ratio, mask):
+        self.detected = detected    # Zemin geçidi tespit edildi mi?
+        self.ratio = ratio          # Filtrelenmiş beyaz piksel oranı (güven, 0-1)
+        self.mask = mask            # Filtrelenmiş ikili görüntü
+
+    def __repr__(self):
+        return f"CrosswalkResult(detected={self.detected}, ratio={self.ratio:.2f})"
+
 class LineDetector:
     def __init__(self):
         """
@@ -33,192 +99,560 @@ class LineDetector:
         self.opencv_ok = True
         self.last_position = None
         self.last_detection_time = time.time()
-        self.frame_width = config.CAMERA_RESOLUTION[0]
-        self.frame_center = self.frame_width // 2
-        self.roi_height = config.ROI_HEIGHT
+
+        # Piksel geometrisi gelen karenin boyutundan türetilir (_update_geometry);
+        # config.py'deki piksel değerleri config.CAMERA_RESOLUTION'a göredir
+        self._frame_size = None
+        self._update_geometry(*config.CAMERA_RESOLUTION)
+        self.refinements = 0
 
         # Kesik şerit takibi için değişkenler
         self.line_lost_counter = 0
         self.max_line_lost_frames = 10  # Maksimum kayıp kare sayısı
 
-        # Şerit genişliği piksel cinsinden (yaklaşık)
-        # 40cm şerit genişliği, 100cm pist genişliği, 640px görüntü genişliği
-        self.line_width_px = int((config.LANE_WIDTH / config.TRACK_WIDTH) * self.frame_width)
+        # Pencereli arama (takip modu) - tahmin edilen pozisyon etrafında dar bant
+        self.tracking_enabled = config.LINE_TRACKING_ENABLED
+        self.position_velocity = 0      # Son iki tespit arasındaki pozisyon değişimi (piksel/kare)
+        self.last_confidence = 0.0      # Son tespitteki tepe sütunun doluluk oranı (0-1)
+        self.window_searches = 0
+        self.full_searches = 0
+
+        # Gürültü azaltma çekirdeği
+        self.kernel = np.ones((3, 3), np.uint8)
+
+        # Zemin geçidi çekirdekleri (çalışma ölçeğine göre önbellek) ve kare başına ara görüntü tamponları
+        self._crosswalk_kernels = {}
+        self._column_indices = {}
+        self.buffers = BufferPool()
+
+        # Şerit modeli için görüntü -> zemin dönüşümleri (kare boyutuna göre önbellek)
+        self._camera_models = {}
+
+        # Kuş bakışı zemin görünümü: pozisyon ve eşikler cm cinsindendir
+        self.ground_view = GroundView() if config.GROUND_VIEW_ENABLED else None
+        if self.ground_view is not None:
+            self.position_threshold = config.LINE_POSITION_THRESHOLD_CM
+            self.ground_kernel = cv2.getStructuringElement(
+                cv2.MORPH_RECT, (self.ground_view.cells(config.GROUND_LINE_MIN_WIDTH_CM),) * 2)
+
+        logger.info(f"Şerit algılayıcı hazır. Çözünürlük: {self.frame_width}x{self.frame_height}, ROI yüksekliği: {self.roi_height}, "
+                    f"Çalışma ölçeği: şerit {config.LINE_DETECTION_SCALE}, geçit {config.CROSSWALK_DETECTION_SCALE}, "
+                    f"model {config.LANE_MODEL_SCALE}")
+
+    def _update_geometry(self, width, height):
+        """
+        Piksel geometrisini gerçek kare boyutundan türetir (boyut değişince yeniden hesaplanır)
+
+        Args:
+            width, height: Ana görüntü boyutu
+        """
+        if self._frame_size == (width, height):
+            return
+        self._frame_size = (width, height)
+
+        reference_width, reference_height = config.CAMERA_RESOLUTION
+        self.frame_width = width
+        self.frame_height = height
+        self.frame_center = width // 2
 
-        logger.info(f"Şerit algılayıcı hazır. Çözünürlük: {self.frame_width}x{config.CAMERA_RESOLUTION[1]}, ROI yüksekliği: {self.roi_height}")
+        # config.py piksel eşiklerinin bu kareye oranı
+        self.pixel_ratio = width / reference_width
+        self.roi_height = int(round(config.ROI_HEIGHT * height / reference_height))
+        self.crosswalk_roi_height = int(round(config.CROSSWALK_ROI_HEIGHT * height / reference_height))
+        self.lane_model_roi_height = int(round(config.LANE_MODEL_ROI_HEIGHT * height / reference_height))
+        if not config.GROUND_VIEW_ENABLED:
+            self.position_threshold = config.LINE_POSITION_THRESHOLD * self.pixel_ratio
+
+        # Kare başına izin verilen en büyük şerit pozisyonu değişimi (piksel)
+        self.max_position_change = 20 * self.pixel_ratio
+
+        # Şerit genişliği piksel cinsinden (yaklaşık)
+        # 40cm şerit genişliği, 100cm pist genişliği, görüntü genişliği
+        self.line_width_px = int((config.LANE_WIDTH / config.TRACK_WIDTH) * width)
 
     def detect_line(self, frame):
         """
         Görüntüden şerit pozisyonunu tespit eder
 
         Args:
-            frame: Kameradan alınan görüntü
+            frame: Kameradan alınan görüntü veya FrameContext
 
         Returns:
-            line_position: Şeridin merkeze göre pozisyonu (negatif: sol, pozitif: sağ)
-            processed_frame: İşlenmiş görüntü (debug için)
+            result: LineResult - position şeridin merkeze göre pozisyonu (negatif: sol, pozitif: sağ,
+                    piksel, zemin görünümü açıksa cm) veya None
         """
         # OpenCV kullanılabilirliğini kontrol et
         if not hasattr(self, 'opencv_ok') or not self.opencv_ok:
             logger.warning("OpenCV kullanılamıyor. Şerit tespiti yapılamadı.")
-            return None, None
+            return LineResult(None, 0.0, None)
 
         try:
-            # Görüntüyü gri tonlamaya çevir
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            # Gri tonlamalı ROI'yi kare bağlamından al - alt kısım
+            ctx = FrameContext.wrap(frame)
+            self._update_geometry(ctx.width, ctx.height)
+            if self.ground_view is not None:
+                return self._detect_line_ground(ctx)
+
+            # Çalışma ölçeğindeki piramit seviyesi (ör. 1/4) - kare başına bir kez üretilir
+            level = ctx.gray_level_for(config.LINE_DETECTION_SCALE / self.pixel_ratio)
+            roi = ctx.gray_roi(*ctx.bottom_rows(self.roi_height), level)
+
+            # Çalışma görüntüsünün ana görüntüye göre ölçeği
+            scale = ctx.gray_level_scale(level)
+
+            # Takip modunda yalnızca tahmin edilen pozisyon etrafındaki pencere işlenir
+            binary, histogram, x_offset = None, None, 0
+            window = self._search_window(roi.shape[1], scale)
+            if window is not None:
+                x_offset, x_end = window
+                binary = self._binarize(roi[:, x_offset:x_end], ("window_blur", "window_binary"))
+                histogram = self._column_histogram(binary)
+                if not self._window_hit(histogram, binary.shape[0], x_end - x_offset):
+                    # Güven düştü veya şerit pencere kenarında - tam genişlikte ara
+                    binary, histogram, x_offset = None, None, 0
+
+            if binary is None:
+                binary = self._binarize(roi, ("line_blur", "line_binary"))
+                self.full_searches += 1
+            else:
+                self.window_searches += 1
 
-            # İlgi alanını (ROI) belirle - alt kısım
-            height, width = gray.shape
-            roi = gray[height - self.roi_height:height, 0:width]
+            # Şerit pozisyonunu bul (ana görüntü piksel biriminde)
+            previous_position = self.last_position
+            line_position = self._find_line_position(binary, scale, x_offset, histogram)
 
-            # Görüntüyü bulanıklaştır
-            blur = cv2.GaussianBlur(roi, (5, 5), 0)
+            # Kaba sonuç karar eşiğine yakınsa tam çözünürlükte iyileştir
+            if (level > 0 and line_position is not None and self.line_lost_counter == 0 and
+                    abs(abs(line_position) - self.position_threshold) <= config.LINE_REFINE_MARGIN * self.pixel_ratio):
+                line_position = self._refine_position(ctx, line_position, scale, previous_position)
 
-            # İkili (binary) görüntüye çevir - beyaz şerit için normal threshold
-            _, binary = cv2.threshold(blur, config.BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
+            return LineResult(line_position, self.last_confidence, binary, x_offset, roi.shape[1], scale,
+                              self.frame_center, self.line_width_px)
 
-            # Gürültüyü azalt
-            kernel = np.ones((3, 3), np.uint8)
-            binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
-            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        except Exception as e:
+            logger.error(f"Şerit tespiti sırasında hata: {e}")
+            return LineResult(None, 0.0, None)
 
-            # Şerit pozisyonunu bul
-            line_position = self._find_line_position(binary)
+    def _detect_line_ground(self, ctx):
+        """
+        Şerit pozisyonunu kuş bakışı zemin ızgarasında bulur (cm)
 
-            # İşlenmiş görüntüyü hazırla (debug için)
-            processed_frame = cv2.cvtColor(binary, cv2.COLOR_GRAY2BGR)
+        Izgaranın her sütunu sabit bir yanal mesafeye karşılık geldiğinden eşikler
+        yakın ve uzak satırlarda aynı anlamı taşır.
 
-            # Merkez çizgisini çiz
-            cv2.line(processed_frame, (self.frame_center, 0), (self.frame_center, self.roi_height), (0, 0, 255), 2)
+        Returns:
+            result: LineResult - position şeridin robot merkezine göre yanal mesafesi (cm, + sağ)
+        """
+        view = self.ground_view
+        grid = ctx.ground(view)
 
-            # Tespit edilen şerit pozisyonunu çiz
-            if line_position is not None:
-                position = self.frame_center + line_position
-                cv2.line(processed_frame, (position, 0), (position, self.roi_height), (0, 255, 0), 2)
+        # Eşikle ve çizgiden ince gürültüyü temizle
+        _, binary = cv2.threshold(grid, config.BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, self.ground_kernel)
 
-                # Şerit genişliğini göster
-                half_width = self.line_width_px // 2
-                cv2.rectangle(processed_frame,
-                            (position - half_width, self.roi_height // 2),
-                            (position + half_width, self.roi_height // 2 + 20),
-                            (0, 255, 255), 2)
+        # Her sütundaki (sabit yanal mesafe) şerit hücresi sayısı
+        histogram = cv2.reduce(binary, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0] // 255
+        peak_index = int(np.argmax(histogram))
+        peak = histogram[peak_index]
 
-            return line_position, processed_frame
+        if peak < view.cells(config.GROUND_LINE_MIN_LENGTH_CM):
+            line_position = self._line_lost()
+        else:
+            self.last_confidence = peak / view.rows
+            lateral = round(view.column_to_lateral(peak_index), 1)
+            line_position = self._accept_position(lateral, config.GROUND_LINE_MAX_CHANGE_CM)
 
-        except Exception as e:
-            logger.error(f"Şerit tespiti sırasında hata: {e}")
-            return None, None
+        return LineResult(line_position, self.last_confidence, binary, width=view.cols, ground_view=view)
 
-    def _find_line_position(self, binary_image):
+    def _refine_position(self, ctx, position, coarse_scale, previous_position):
+        """
+        Kaba ölçekte bulunan pozisyonu tam çözünürlükte, dar bir pencerede iyileştirir
+
+        Args:
+            ctx: FrameContext
+            position: Kaba pozisyon (ana görüntü pikseli, _accept_position'dan geçmiş)
+            coarse_scale: Kaba çalışma görüntüsünün ölçeği
+            previous_position: Önceki karenin pozisyonu (kaba pozisyon kabul edilmeden önceki)
+
+        Returns:
+            position: İyileştirilmiş pozisyon (pencerede şerit bulunamazsa kaba pozisyon)
+        """
+        roi = ctx.gray_roi(*ctx.bottom_rows(self.roi_height))
+        scale = ctx.gray_scale
+
+        # Kaba bir pikselin tam çözünürlükteki karşılığının birkaç katı genişlikte pencere
+        half_window = int(4 * scale / coarse_scale) + 3
+        center = int((self.frame_center + position) * scale)
+        start, end = max(0, center - half_window), min(roi.shape[1], center + half_window + 1)
+        if end - start < 3:
+            return position
+
+        histogram = self._column_histogram(self._binarize(roi[:, start:end], ("refine_blur", "refine_binary")))
+        peak_index = int(np.argmax(histogram))
+        if histogram[peak_index] < config.LINE_DETECTION_MIN_PIXELS * scale:
+            return position
+
+        self.refinements += 1
+        refined = int((start + peak_index) / scale) - self.frame_center
+
+        # Kaba pozisyonun kabulü geri alınır; iyileştirilmiş pozisyon aynı sınırlama ve
+        # hız güncellemesinden önceki kareye göre geçer
+        self.last_position = previous_position
+        return self._accept_position(refined, self.max_position_change)
+
+    def _binarize(self, roi, names):
+        """
+        Gri ROI'yi bulanıklaştırır, eşikler ve gürültüsünü azaltır
+
+        Args:
+            roi: Gri görüntü
+            names: Ara ve çıktı tamponlarının adları (bulanık, ikili) - çağrı yeri başına farklı
+
+        Returns:
+            binary: İkili görüntü (0/255) - sonraki aynı adlı çağrıya kadar geçerli
+        """
+        blur = self.buffers.get(names[0], roi.shape)
+        binary = self.buffers.get(names[1], roi.shape)
+
+        # Görüntüyü bulanıklaştır
+        cv2.GaussianBlur(roi, (5, 5), 0, dst=blur)
+
+        # İkili (binary) görüntüye çevir - beyaz şerit için normal threshold
+        cv2.threshold(blur, config.BINARY_THRESHOLD, 255, cv2.THRESH_BINARY, dst=binary)
+
+        # Gürültüyü azalt (bulanık görüntü tamponu ara sonuç için yeniden kullanılır)
+        cv2.morphologyEx(binary, cv2.MORPH_OPEN, self.kernel, dst=blur)
+        cv2.morphologyEx(blur, cv2.MORPH_CLOSE, self.kernel, dst=binary)
+        return binary
+
+    def _column_histogram(self, binary_image):
+        """
+        Alt yarıdaki her sütunun beyaz piksel toplamını hesaplar (0/255 değerleri toplanır)
+        """
+        half_height = binary_image.shape[0] // 2
+        histogram = self.buffers.get("column_histogram", (1, binary_image.shape[1]), np.int32)
+        cv2.reduce(binary_image[half_height:, :], 0, cv2.REDUCE_SUM, dst=histogram, dtype=cv2.CV_32S)
+        return histogram[0]
+
+    def _search_window(self, roi_width, scale):
+        """
+        Takip modunda tahmin edilen şerit pozisyonu etrafındaki arama penceresini döndürür
+
+        Returns:
+            window: (başlangıç, bitiş) sütunları (gri görüntü ölçeğinde) veya tam arama gerekiyorsa None
+        """
+        if (not self.tracking_enabled or self.last_position is None or self.line_lost_counter > 0 or
+                self.last_confidence < config.LINE_TRACKING_MIN_CONFIDENCE):
+            return None
+
+        # Sabit hız varsayımıyla bir sonraki pozisyonu tahmin et
+        predicted_x = (self.frame_center + self.last_position + self.position_velocity) * scale
+        half_window = config.LINE_SEARCH_WINDOW * self.pixel_ratio * scale
+        start = max(0, int(predicted_x - half_window))
+        end = min(roi_width, int(predicted_x + half_window) + 1)
+        if end - start < 3:
+            return None
+        return start, end
+
+    def _window_hit(self, histogram, binary_height, window_width):
+        """
+        Pencere aramasının güvenilir olup olmadığını kontrol eder
+
+        Tepe sütunun doluluk oranı yeterli olmalı ve tepe pencere kenarında olmamalı
+        (kenardaysa şerit pencerenin dışına kayıyor olabilir).
+        """
+        peak_index = int(np.argmax(histogram))
+        rows = binary_height - binary_height // 2
+        confidence = histogram[peak_index] / (255.0 * max(1, rows))
+        return (confidence >= config.LINE_TRACKING_MIN_CONFIDENCE and
+                0 < peak_index < window_width - 1)
+
+    def _find_line_position(self, binary_image, scale=1.0, x_offset=0, histogram=None):
         """
         İkili görüntüden şerit pozisyonunu hesaplar
 
         Args:
-            binary_image: İkili görüntü
+            binary_image: İkili görüntü (tam ROI veya arama penceresi)
+            scale: İkili görüntünün ana görüntüye göre ölçeği (lores akışta < 1.0)
+            x_offset: Pencerenin ROI içindeki başlangıç sütunu (gri görüntü ölçeğinde)
+            histogram: Önceden hesaplanmış sütun histogramı (yoksa hesaplanır)
 
         Returns:
             position: Şeridin merkeze göre pozisyonu (negatif: sol, pozitif: sağ)
         """
-        # Görüntünün alt yarısını kullan
-        height = binary_image.shape[0]
-        half_height = height // 2
-
-        # Her sütundaki beyaz pikselleri say
-        histogram = np.sum(binary_image[half_height:, :], axis=0)
+        # Görüntünün alt yarısındaki her sütunun beyaz piksellerini say
+        if histogram is None:
+            histogram = self._column_histogram(binary_image)
+        rows = binary_image.shape[0] - binary_image.shape[0] // 2
 
         # Minimum piksel sayısı kontrolü
-        if np.max(histogram) < config.LINE_DETECTION_MIN_PIXELS:
-            self.line_lost_counter += 1
-            if self.line_lost_counter > self.max_line_lost_frames:
-                # Uzun süre şerit bulunamadı, son pozisyonu sıfırla
-                self.last_position = None
-                return None
-            elif self.last_position is not None:
-                # Kısa süreli kayıp, son bilinen pozisyonu kullan
-                return self.last_position
-            else:
-                return None
+        peak_index = int(np.argmax(histogram))
+        peak = histogram[peak_index]
+        if peak < config.LINE_DETECTION_MIN_PIXELS * self.pixel_ratio * scale:
+            return self._line_lost()
 
-        # Şerit bulundu, sayacı sıfırla
-        self.line_lost_counter = 0
+        # Şerit pozisyonunu bul (maksimum beyaz piksel) - ana görüntü koordinatına çevir
+        line_x = int((x_offset + peak_index) / scale)
+        self.last_confidence = peak / (255.0 * max(1, rows))
+
+        # Merkeze göre pozisyonu hesapla - ani değişimler sınırlanır (referans çözünürlükte maksimum 20 piksel)
+        return self._accept_position(line_x - self.frame_center, self.max_position_change)
+
+    def _line_lost(self):
+        """
+        Şerit bulunamadığı karede kısa süreli kayıp için son pozisyonu döndürür
 
-        # Şerit pozisyonunu bul (maksimum beyaz piksel)
-        line_x = np.argmax(histogram)
+        Returns:
+            position: Son bilinen pozisyon veya uzun süreli kayıpta None
+        """
+        self.last_confidence = 0.0
+        self.line_lost_counter += 1
+        if self.line_lost_counter > self.max_line_lost_frames:
+            # Uzun süre şerit bulunamadı, son pozisyonu sıfırla
+            self.last_position = None
+            return None
+        # Kısa süreli kayıp, son bilinen pozisyonu kullan (yoksa None)
+        return self.last_position
+
+    def _accept_position(self, position, max_change):
+        """
+        Bulunan pozisyonu yumuşatır ve takip durumunu günceller
 
-        # Merkeze göre pozisyonu hesapla
-        position = line_x - self.frame_center
+        Args:
+            position: Ham pozisyon (piksel veya cm)
+            max_change: Kare başına izin verilen en büyük değişim (aynı birimde)
+        """
+        # Şerit bulundu, sayacı sıfırla
+        self.line_lost_counter = 0
 
         # Ani değişimleri yumuşat (son pozisyon varsa)
         if self.last_position is not None:
             # Pozisyon değişimini sınırla
-            max_change = 20  # Maksimum piksel değişimi
             if abs(position - self.last_position) > max_change:
                 # Değişimi sınırla
                 direction = 1 if position > self.last_position else -1
                 position = self.last_position + (direction * max_change)
 
-        # Son pozisyonu güncelle
+        # Piksel modunda pozisyon tamsayı kalır (sınır ondalıklı olabilir; dilim indeksi olarak kullanılır)
+        if self.ground_view is None:
+            position = int(round(position))
+
+        # Son pozisyonu ve hızı güncelle
+        self.position_velocity = position - self.last_position if self.last_position is not None else 0
         self.last_position = position
         self.last_detection_time = time.time()
 
         return position
 
+    def _camera_model(self, width, height):
+        """
+        Kare boyutuna uygun kamera modelini ve görüntü -> zemin homografisini döndürür
+        """
+        key = (width, height)
+        cached = self._camera_models.get(key)
+        if cached is None:
+            # ROI'ler lens kalibrasyonu varsa düzeltilmiştir, geometri kalibre edilmiş iç parametreleri kullanır
+            lens = get_lens_correction()
+            camera = CameraModel(resolution=key,
+                                 camera_matrix=lens.camera_matrix_for(key) if lens is not None else None)
+            cached = (camera, np.linalg.inv(camera.ground_to_image_homography()))
+            self._camera_models[key] = cached
+        return cached
+
+    def fit_lane_model(self, frame):
+        """
+        Şeridi zemin düzleminde düşük dereceli polinomla modeller
+
+        ROI yatay bantlara bölünür; her bandın sütun histogramı ve tepe çevresindeki ağırlık
+        merkezi tek seferde (vektörel) hesaplanır. Merkezler kamera modeliyle zemine (cm)
+        izdüşürülür ve y(x) polinomu uydurulur; ileri bakış mesafesinde sapma, yön ve eğrilik
+        hesaplanır.
+
+        Args:
+            frame: Kameradan alınan görüntü veya FrameContext
+
+        Returns:
+            lane: LaneModel veya yeterli bant bulunamazsa, ileri bakış noktası bantların
+                kapsadığı mesafenin dışında kalırsa ya da yön makul değilse None
+        """
+        if not hasattr(self, 'opencv_ok') or not self.opencv_ok:
+            return None
+
+        try:
+            ctx = FrameContext.wrap(frame)
+            self._update_geometry(ctx.width, ctx.height)
+            top, bottom = ctx.bottom_rows(self.lane_model_roi_height)
+            level = ctx.gray_level_for(config.LANE_MODEL_SCALE / self.pixel_ratio)
+            roi = ctx.gray_roi(top, bottom, level)
+            scale = ctx.gray_level_scale(level)
+            pixel_scale = scale * self.pixel_ratio
+            binary = self._binarize(roi, ("lane_blur", "lane_binary"))
+
+            # Bantlar (alttan üste): her bant için sütun başına beyaz piksel sayısı
+            band_count = config.LANE_MODEL_BANDS
+            band_height = binary.shape[0] // band_count
+            if band_height == 0:
+                return None
+            first_row = binary.shape[0] - band_count * band_height
+            width = binary.shape[1]
+            histograms = self.buffers.get("lane_histograms", (band_count, width), np.int32)
+            for i in range(band_count):
+                row = first_row + (band_count - 1 - i) * band_height
+                cv2.reduce(binary[row:row + band_height], 0, cv2.REDUCE_SUM,
+                           dst=histograms[i:i + 1], dtype=cv2.CV_32S)
+            histograms //= 255
+
+            # Her bandın tepesi çevresindeki pencerede ağırlık merkezi (ara diziler havuzdan)
+            peaks = histograms.argmax(axis=1)
+            half_window = max(1, int(config.LANE_MODEL_BAND_WINDOW * pixel_scale))
+            weights = self.buffers.get("lane_weights", (band_count, width), np.int32)
+            weights.fill(0)
+            for i, peak in enumerate(peaks):
+                start, end = max(0, peak - half_window), peak + half_window + 1
+                weights[i, start:end] = histograms[i, start:end]
+            counts = weights.sum(axis=1, dtype=np.int32)
+            weighted = np.multiply(weights, self._columns(band_count, width),
+                                   out=self.buffers.get("lane_weighted", (band_count, width), np.int32))
+            centroids = weighted.sum(axis=1, dtype=np.int32) / np.maximum(counts, 1)
+
+            # Yetersiz bantları ve önceki banttan çok uzak merkezleri (diğer şerit çizgisi) ele
+            valid = counts >= config.LANE_MODEL_MIN_BAND_PIXELS * pixel_scale
+            max_step = config.LANE_MODEL_MAX_BAND_STEP * pixel_scale
+            previous = None
+            for i in range(band_count):
+                if not valid[i]:
+                    continue
+                if previous is not None and abs(centroids[i] - previous) > max_step:
+                    valid[i] = False
+                    continue
+                previous = centroids[i]
+
+            if np.count_nonzero(valid) < 2:
+                return None
+
+            # Bant merkezleri ana görüntü koordinatlarında
+            row_centers = first_row + (band_count - 1 - np.arange(band_count)) * band_height + band_height / 2
+            u = centroids[valid] / scale
+            v = (int(top * scale) + row_centers[valid]) / scale
+            points = np.stack([u, v], axis=1)
+
+            # Görüntü -> zemin (x ileri, y sola, cm)
+            camera, image_to_ground = self._camera_model(ctx.width, ctx.height)
+            ground = image_to_ground @ np.vstack([u, v, np.ones_like(u)])
+            ground_x = ground[0] / ground[2]
+            ground_y_right = -ground[1] / ground[2]
+
+            # İleri bakış noktası bantların kapsadığı mesafenin dışındaysa (ör. kesik şerit
+            # boşluğunda yalnızca yakın bantlar kaldıysa) polinom dışkestirim yapar, güvenilmez
+            lookahead = config.LANE_MODEL_LOOKAHEAD
+            margin = config.LANE_MODEL_MAX_EXTRAPOLATION
+            if not ground_x.min() - margin <= lookahead <= ground_x.max() + margin:
+                return None
+
+            # Parabol için serbestlik derecesi bırakacak kadar bant yoksa doğru uydurulur
+            degree = config.LANE_MODEL_DEGREE
+            if len(u) < degree + 2:
+                degree = 1
+            degree = min(degree, len(u) - 1)
+            fit = np.polyfit(ground_x, ground_y_right, degree, w=np.sqrt(counts[valid]))
+            coefficients = np.zeros(3)
+            coefficients[:degree + 1] = fit[::-1]
+
+            c0, c1, c2 = coefficients
+            offset = c0 + c1 * lookahead + c2 * lookahead ** 2
+            slope = c1 + 2 * c2 * lookahead
+            heading = math.atan(slope)
+            curvature = 2 * c2 / (1 + slope ** 2) ** 1.5
+
+            # Kameranın gördüğü kısa mesafede bu kadar dik bir şerit olamaz (hatalı uydurma)
+            if abs(heading) > math.radians(config.LANE_MODEL_MAX_HEADING):
+                return None
+
+            # İleri bakış noktasının görüntüdeki yatay konumu (detect_line ile aynı birim)
+            pixel, _ = camera.project_points([[lookahead, -offset, 0.0]])
+            position = float(pixel[0, 0]) - ctx.width / 2
+
+            return LaneModel(float(offset), heading, float(curvature), lookahead, position,
+                             coefficients, points)
+
+        except Exception as e:
+            logger.error(f"Şerit modeli hesaplanırken hata: {e}")
+            return None
+
     def is_crosswalk(self, frame):
         """
         Zemin geçidi (yaya geçidi) algılar
 
         Args:
-            frame: Kameradan alınan görüntü
+            frame: Kameradan alınan görüntü veya FrameContext
 
         Returns:
-            is_crosswalk: Zemin geçidi tespit edildi mi?
-            confidence: Tespit güven değeri (0.0 - 1.0)
-            processed_frame: İşlenmiş görüntü (debug için)
+            result: CrosswalkResult - detected (tespit edildi mi?) ve ratio (güven değeri, 0.0 - 1.0)
         """
-        # Görüntüyü gri tonlamaya çevir
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # İlgi alanını (ROI) belirle - alt kısım, zemin geçidi için özel ROI yüksekliği
-        height, width = gray.shape
-        roi_height = config.CROSSWALK_ROI_HEIGHT
-        roi = gray[height - roi_height:height, 0:width]
+        # Gri tonlamalı ROI'yi kare bağlamından al - alt kısım, zemin geçidi için özel ROI yüksekliği
+        ctx = FrameContext.wrap(frame)
+        self._update_geometry(ctx.width, ctx.height)
+        level = ctx.gray_level_for(config.CROSSWALK_DETECTION_SCALE / self.pixel_ratio)
+        roi = ctx.gray_roi(*ctx.bottom_rows(self.crosswalk_roi_height), level)
+
+        # Çekirdek boyutlarını çalışma ölçeğine uyarla
+        scale = ctx.gray_level_scale(level) * self.pixel_ratio
+        kernel_horizontal, kernel_vertical = self._crosswalk_kernels_for(scale)
+
+        # Ara görüntüler havuzdaki tamponlara yazılır
+        shape = roi.shape
+        blur = self.buffers.get("crosswalk_blur", shape)
+        binary = self.buffers.get("crosswalk_binary", shape)
+        dilated_horizontal = self.buffers.get("crosswalk_horizontal", shape)
+        dilated_vertical = self.buffers.get("crosswalk_vertical", shape)
 
         # Görüntüyü bulanıklaştır
-        blur = cv2.GaussianBlur(roi, (5, 5), 0)
+        cv2.GaussianBlur(roi, (5, 5), 0, dst=blur)
 
         # İkili (binary) görüntüye çevir - beyaz şerit için normal threshold
-        _, binary = cv2.threshold(blur, config.BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
+        cv2.threshold(blur, config.BINARY_THRESHOLD, 255, cv2.THRESH_BINARY, dst=binary)
 
         # Yatay çizgileri vurgula
-        kernel_horizontal = np.ones((1, 20), np.uint8)
-        dilated_horizontal = cv2.dilate(binary, kernel_horizontal, iterations=1)
+        cv2.dilate(binary, kernel_horizontal, dst=dilated_horizontal, iterations=1)
 
         # Dikey çizgileri vurgula (yaya geçidi için)
-        kernel_vertical = np.ones((10, 1), np.uint8)
-        dilated_vertical = cv2.dilate(binary, kernel_vertical, iterations=1)
+        cv2.dilate(binary, kernel_vertical, dst=dilated_vertical, iterations=1)
 
         # Yatay ve dikey çizgileri birleştir
-        combined = cv2.bitwise_or(dilated_horizontal, dilated_vertical)
+        combined = cv2.bitwise_or(dilated_horizontal, dilated_vertical, dst=blur)
 
         # Gürültüyü azalt
-        kernel = np.ones((3, 3), np.uint8)
-        filtered = cv2.morphologyEx(combined, cv2.MORPH_OPEN, kernel)
+        filtered = cv2.morphologyEx(combined, cv2.MORPH_OPEN, self.kernel, dst=binary)
 
-        # Beyaz piksel oranını hesapla
-        white_ratio = np.sum(filtered == 255) / (filtered.shape[0] * filtered.shape[1])
+        # Beyaz piksel oranını hesapla (ikili görüntüde sıfır olmayan = 255)
+        white_ratio = cv2.countNonZero(filtered) / (filtered.shape[0] * filtered.shape[1])
 
         # Zemin geçidi için eşik değeri kontrolü
         is_crosswalk = white_ratio > config.CROSSWALK_DETECTION_THRESHOLD
 
-        # İşlenmiş görüntüyü hazırla (debug için)
-        processed_frame = cv2.cvtColor(filtered, cv2.COLOR_GRAY2BGR)
-
-        # Zemin geçidi tespiti bilgilerini görüntüye ekle
-        if is_crosswalk:
-            cv2.putText(processed_frame, f"Crosswalk: {white_ratio:.2f}", (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        return CrosswalkResult(is_crosswalk, white_ratio, filtered)
 
-        return is_crosswalk, white_ratio, processed_frame
+    def _columns(self, rows, width):
+        """
+        Her satırı sütun indekslerinden oluşan dizi (boyut başına bir kez oluşturulur)
+        """
+        key = (rows, width)
+        columns = self._column_indices.get(key)
+        if columns is None:
+            columns = np.tile(np.arange(width, dtype=np.int32), (rows, 1))
+            self._column_indices[key] = columns
+        return columns
+
+    def _crosswalk_kernels_for(self, scale):
+        """
+        Çalışma ölçeğine uygun yatay ve dikey vurgulama çekirdekleri (ilk kullanımda oluşturulur)
+        """
+        kernels = self._crosswalk_kernels.get(scale)
+        if kernels is None:
+            kernels = (np.ones((1, max(1, int(20 * scale))), np.uint8),
+                       np.ones((max(1, int(10 * scale)), 1), np.uint8))
+            self._crosswalk_kernels[scale] = kernels
+        return kernels
 
     def detect_lane_type(self, binary_image):
         """
@@ -0,0 +1,354 @@
+"""
+Canlı izleme sunucusu - Kamera görüntüsü ve algılayıcı görsellerinin HTTP üzerinden MJPEG akışı
+Kontrol döngüsü her karede yalnızca son sonuçları kaydeder (referans atama); görseller ancak
+bağlı bir izleyici varsa ve seyreltilmiş hızda çizilir. JPEG kodlama ayrı bir iş parçacığında
+yapılır, izleyiciler de sunucunun kendi iş parçacıklarında beslenir; döngü hiçbir istemciyi beklemez.
+
+Adresler:
+    /                 Tüm akışları gösteren sayfa
+    /stream/<görünüm> MJPEG akışı (camera, line, obstacles, crosswalk)
+    /state            Güncel durum (JSON): robot durumu, şerit pozisyonu, engel sonucu, motorlar
+"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+from debug_overlay import render_line, render_crosswalk, render_obstacles
+from loguru import logger
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+VIEWS = ("camera", "line", "obstacles", "crosswalk")
+BOUNDARY = "frame"
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>OtonomZero - Canlı İzleme</title>
+<style>body{{background:#222;color:#eee;font-family:sans-serif}}figure{{display:inline-block;margin:8px}}
+img{{max-width:640px;background:#000}}pre{{background:#111;padding:8px}}</style></head>
+<body><h3>OtonomZero - Canlı İzleme</h3>{figures}<pre id="state"></pre>
+<script>setInterval(()=>fetch("/state").then(r=>r.json()).then(s=>{{
+document.getElementById("state").textContent=JSON.stringify(s,null,2)}}).catch(()=>{{}}),500)</script>
+</body></html>"""
+
+class LiveViewServer:
+    def __init__(self, host=config.LIVE_VIEW_HOST, port=config.LIVE_VIEW_PORT,
+                 fps=config.LIVE_VIEW_FPS, quality=config.LIVE_VIEW_QUALITY):
+        """
+        Canlı izleme sunucusu başlatıcı
+
+        Args:
+            host (str): Dinlenecek adres ("127.0.0.1": yalnızca bu cihaz, "0.0.0.0": yerel ağ)
+            port (int): HTTP portu
+            fps (float): Görsellerin en yüksek güncellenme hızı (kontrol döngüsünden seyreltilir)
+            quality (int): JPEG kalitesi (0-100)
+        """
+        self.host = host
+        self.port = int(port)
+        self.interval = 1.0 / max(0.1, float(fps))
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+
+        # Son durum: döngü her karede yalnızca demeti değiştirir, JSON istek anında üretilir
+        self._state = None
+
+        # Kodlanmayı bekleyen son görseller (görünüm -> görüntü) - kodlayıcı yetişemezse üzerine yazılır
+        self._pending = None
+        self._last_submit_time = 0.0
+        self._condition = threading.Condition()
+
+        # Kodlanmış son görseller (görünüm -> (sıra numarası, JPEG baytları))
+        self._jpegs = {}
+        self._sequence = 0
+        self._frames_ready = threading.Condition()
+
+        self._running = False
+        self._clients = 0
+        self._server = None
+        self._server_thread = None
+        self._encoder_thread = None
+
+        # Sayaçlar
+        self.frames_encoded = 0
+        self.frames_dropped = 0
+        self.encode_errors = 0
+
+    @property
+    def has_clients(self):
+        """
+        En az bir MJPEG izleyicisi bağlı mı?
+        """
+        return self._clients > 0
+
+    def start(self):
+        """
+        HTTP sunucusunu ve kodlayıcı iş parçacığını başlatır
+
+        Returns:
+            bool: Sunucu başlatıldıysa True (ör. port kullanımdaysa False)
+        """
+        if self._running:
+            return True
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), LiveViewRequestHandler)
+        except OSError as e:
+            logger.error(f"Canlı izleme sunucusu başlatılamadı ({self.host}:{self.port}): {e}")
+            self._server = None
+            return False
+
+        self._server.daemon_threads = True
+        self._server.live_view = self
+        self._running = True
+
+        self._encoder_thread = threading.Thread(target=self._encode_loop, name="live-view-encoder", daemon=True)
+        self._encoder_thread.start()
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="live-view-http", daemon=True)
+        self._server_thread.start()
+
+        logger.info(f"Canlı izleme hazır: http://{self.host}:{self.server_port}/ "
+                    f"(en fazla {1.0 / self.interval:.1f} FPS)")
+        return True
+
+    @property
+    def server_port(self):
+        """
+        Sunucunun dinlediği port (port 0 verildiyse işletim sisteminin seçtiği)
+        """
+        return self._server.server_address[1] if self._server is not None else self.port
+
+    def stop(self, timeout=2.0):
+        """
+        Sunucuyu ve kodlayıcı iş parçacığını durdurur
+        """
+        if not self._running:
+            return
+
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        with self._frames_ready:
+            self._frames_ready.notify_all()
+
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in (self._server_thread, self._encoder_thread):
+            if thread is not None:
+                thread.join(timeout)
+        self._server_thread = self._encoder_thread = None
+
+        logger.info(f"Canlı izleme durduruldu. {self.format_stats()}")
+
+    def publish(self, ctx, frame_id, state, line=None, obstacles=None, crosswalk=None, motors=None):
+        """
+        Kontrol döngüsünün son karesini yayınlar (beklemeden döner)
+
+        Durum her çağrıda yalnızca kaydedilir. Görseller izleyici bağlıysa ve son gönderimden
+        bu yana güncelleme aralığı geçtiyse çizilir; sonuçlardaki görüntüler algılayıcıların
+        tamponları olduğundan çağrı, algılayıcılar sonraki kareyi işlemeden önce yapılmalıdır.
+
+        Args:
+            ctx: Kare bağlamı (FrameContext)
+            frame_id (int): Kare numarası
+            state (str): Robot durumu ("line_following", "crosswalk", "avoidance")
+            line: LineResult (bu karede şerit algılanmadıysa None)
+            obstacles: ObstacleResult (bu karede engel algılanmadıysa None)
+            crosswalk: CrosswalkResult (bu karede zemin geçidi kontrol edilmediyse None)
+            motors: MotorController (son hareket ve hızlar için)
+        """
+        movement = (motors.last_movement, motors.last_left_speed, motors.last_right_speed) if motors is not None else None
+        self._state = (time.time(), frame_id, state, line, obstacles, crosswalk, movement)
+
+        if not self._clients:
+            return
+        now = time.monotonic()
+        if now - self._last_submit_time < self.interval:
+            return
+        self._last_submit_time = now
+
+        try:
+            images = {"camera": ctx.frame.copy()}
+            if line is not None:
+                images["line"] = render_line(line)
+            if obstacles is not None:
+                images["obstacles"] = render_obstacles(obstacles)
+            if crosswalk is not None:
+                images["crosswalk"] = render_crosswalk(crosswalk)
+        except Exception as e:
+            logger.error(f"Canlı izleme görseli çizilemedi: {e}")
+            return
+
+        with self._condition:
+            if self._pending is not None:
+                self.frames_dropped += 1
+            self._pending = images
+            self._condition.notify()
+
+    def _encode_loop(self):
+        """
+        Kodlayıcı iş parçacığı: bekleyen görselleri JPEG'e çevirir ve izleyicileri uyandırır
+        """
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                images, self._pending = self._pending, None
+
+            encoded = {}
+            for view, image in images.items():
+                if image is None:
+                    continue
+                try:
+                    ok, buffer = cv2.imencode(".jpg", image, self.encode_params)
+                    if ok:
+                        encoded[view] = buffer.tobytes()
+                    else:
+                        self.encode_errors += 1
+                except Exception as e:
+                    self.encode_errors += 1
+                    logger.error(f"Canlı izleme kodlama hatası ({view}): {e}")
+
+            with self._frames_ready:
+                self._sequence += 1
+                for view, jpeg in encoded.items():
+                    self._jpegs[view] = (self._sequence, jpeg)
+                self._frames_ready.notify_all()
+            self.frames_encoded += 1
+
+    def wait_for_frame(self, view, last_sequence, timeout=1.0):
+        """
+        Görünümün yeni bir JPEG'i hazır olana kadar bekler (HTTP iş parçacıkları için)
+
+        Returns:
+            (sequence, jpeg): Görünümün sıra numarası ve JPEG baytları (zaman aşımında jpeg None)
+        """
+        with self._frames_ready:
+            entry = self._jpegs.get(view)
+            if (entry is None or entry[0] == last_sequence) and self._running:
+                self._frames_ready.wait(timeout)
+                entry = self._jpegs.get(view)
+            if entry is None or entry[0] == last_sequence:
+                return last_sequence, None
+            return entry
+
+    def client_connected(self):
+        """
+        MJPEG izleyicisi bağlandı - görseller çizilmeye başlanır
+        """
+        with self._frames_ready:
+            self._clients += 1
+
+    def client_disconnected(self):
+        """
+        MJPEG izleyicisi ayrıldı - izleyici kalmazsa görseller çizilmez
+        """
+        with self._frames_ready:
+            self._clients -= 1
+
+    @property
+    def running(self):
+        """
+        Sunucu çalışıyor mu?
+        """
+        return self._running
+
+    def state_dict(self):
+        """
+        Son yayınlanan durumu JSON'a çevrilebilir sözlük olarak döndürür
+        """
+        if self._state is None:
+            return {"state": None}
+
+        timestamp, frame_id, state, line, obstacles, crosswalk, movement = self._state
+        result = {"time": timestamp, "frame": frame_id, "state": state}
+
+        if line is not None:
+            result["line"] = {
+                "position": None if line.position is None else float(line.position),
+                "confidence": float(line.confidence),
+                "unit": "cm" if line.ground_view is not None else "px",
+            }
+        if obstacles is not None:
+            result["obstacles"] = {
+                "detected": obstacles.detected,
+                "position": obstacles.position,
+                "blobs": [{"color": blob.color, "area": int(blob.area), "position": blob.position,
+                           "bbox": [int(v) for v in blob.bbox]} for blob in obstacles.blobs],
+            }
+        if crosswalk is not None:
+            result["crosswalk"] = {"detected": bool(crosswalk.detected), "ratio": float(crosswalk.ratio)}
+        if movement is not None:
+            result["motors"] = {"movement": movement[0], "left": movement[1], "right": movement[2]}
+        return result
+
+    def format_stats(self):
+        """
+        Sunucu istatistiklerini okunabilir metin olarak döndürür
+        """
+        return (f"Kodlanan: {self.frames_encoded}, Atlanan: {self.frames_dropped}, "
+                f"Hata: {self.encode_errors}, İzleyici: {self._clients}")
+
+class LiveViewRequestHandler(BaseHTTPRequestHandler):
+    """
+    Canlı izleme HTTP isteklerini karşılar (her bağlantı sunucunun kendi iş parçacığında)
+    """
+
+    def do_GET(self):
+        live_view = self.server.live_view
+        path = self.path.split("?", 1)[0].rstrip("/")
+
+        if path == "":
+            figures = "".join(f'<figure><img src="/stream/{view}"><figcaption>{view}</figcaption></figure>'
+                              for view in VIEWS)
+            self._send(200, "text/html; charset=utf-8", INDEX_PAGE.format(figures=figures).encode())
+        elif path == "/state":
+            self._send(200, "application/json", json.dumps(live_view.state_dict()).encode())
+        elif path.startswith("/stream/") and path[len("/stream/"):] in VIEWS:
+            self._stream(live_view, path[len("/stream/"):])
+        else:
+            self._send(404, "text/plain; charset=utf-8", b"Bulunamadi")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, live_view, view):
+        """
+        Görünümün JPEG'lerini multipart/x-mixed-replace (MJPEG) olarak gönderir
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        live_view.client_connected()
+        try:
+            sequence = -1
+            while live_view.running:
+                sequence, jpeg = live_view.wait_for_frame(view, sequence)
+                if jpeg is None:
+                    continue
+                self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            live_view.client_disconnected()
+
+    def log_message(self, format, *args):
+        logger.debug(f"Canlı izleme isteği: {self.address_string()} {format % args}")
@@ -0,0 +1,266 @@
+"""
+Loglama yapılandırması - Kontrol döngüsünü bloklamayan üretim log modu
+Üretim modunda log satırları sınırlı bir kuyruğa eklenir ve arka plan iş parçacığı tarafından
+toplu olarak yazılır; kuyruk dolduğunda en eski satır atılır. Sık tekrarlanan mesajlar
+LogThrottle ile birleştirilir ("Şerit bulunamadı! ×137 (5.0 s)").
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import deque
+import config
+from loguru import logger
+
+# Konsol ve dosya için log biçimi
+LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+
+class AsyncLogSink:
+    def __init__(self, path=None, stream=None, queue_size=config.LOG_QUEUE_SIZE,
+                 rotation_mb=config.LOG_ROTATION_MB, name="log-writer"):
+        """
+        Asenkron log yazıcısı başlatıcı
+
+        loguru'ya fonksiyon sink olarak verilir (logger.add(sink.write, ...)). write() yalnızca
+        kuyruğa ekler ve beklemeden döner; yazma ve dosya döndürme arka planda yapılır.
+
+        Args:
+            path (str): Log dosyası (stream verilmezse)
+            stream: Yazılacak akış (ör. sys.stderr)
+            queue_size (int): Bekleyen satır kuyruğu boyutu - dolduğunda en eski atılır
+            rotation_mb (float): Dosya bu boyutu aşınca .1 uzantısıyla yedeklenir (MB)
+            name (str): İş parçacığı adı
+        """
+        self.path = path
+        self.stream = stream
+        self.rotation_bytes = int(rotation_mb * 1024 * 1024)
+        self.name = name
+
+        self._queue = deque(maxlen=max(1, queue_size))
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._file = None
+        self._file_size = 0
+
+        # Sayaçlar
+        self.lines_written = 0
+        self.lines_dropped = 0
+        self.write_errors = 0
+
+    def start(self):
+        """
+        Yazıcı iş parçacığını başlatır
+        """
+        if self._running:
+            return
+
+        if self.stream is None:
+            self._open_file()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """
+        Kuyruktaki satırları yazar ve iş parçacığını durdurur
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, message):
+        """
+        Log satırını kuyruğa ekler (beklemeden döner)
+        """
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.lines_dropped += 1
+            self._queue.append(message)
+            self._condition.notify()
+
+    def _write_loop(self):
+        """
+        Yazıcı döngüsü - biriken satırları tek seferde yazar
+        """
+        while True:
+            with self._condition:
+                while not self._queue and self._running:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                lines = list(self._queue)
+                self._queue.clear()
+                dropped = self.lines_dropped
+
+            if dropped:
+                lines.append(f"[log] Kuyruk doldu, toplam {dropped} satır atıldı\n")
+                with self._condition:
+                    self.lines_dropped -= dropped
+
+            self._write(lines)
+
+    def _write(self, lines):
+        """
+        Satırları akışa veya dosyaya yazar, gerekirse dosyayı döndürür
+        """
+        text = "".join(lines)
+        try:
+            if self.stream is not None:
+                self.stream.write(text)
+                self.stream.flush()
+            else:
+                if self._file_size + len(text) > self.rotation_bytes:
+                    self._rotate()
+                self._file.write(text)
+                self._file.flush()
+                self._file_size += len(text)
+            self.lines_written += len(lines)
+        except Exception as e:
+            # Loglama hatası loguru'ya geri yazılmaz (döngü oluşur), doğrudan stderr'e yazılır
+            self.write_errors += 1
+            sys.__stderr__.write(f"Log yazılamadı ({self.path or self.name}): {e}\n")
+
+    def _open_file(self):
+        """
+        Log dosyasını ekleme modunda açar
+        """
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._file_size = self._file.tell()
+
+    def _rotate(self):
+        """
+        Mevcut dosyayı .1 olarak yedekler ve yeni dosya açar
+        """
+        self._file.close()
+        os.replace(self.path, self.path + ".1")
+        self._open_file()
+
+class LogThrottle:
+    def __init__(self, interval=config.LOG_COALESCE_INTERVAL):
+        """
+        Tekrarlanan log mesajlarını birleştirici başlatıcı
+
+        Her çağrı yeri (anahtar, varsayılan olarak mesaj şablonu) için ilk mesaj hemen yazılır,
+        aralık içindeki tekrarlar sayılır ve aralık dolduktan sonraki ilk mesajda veya
+        flush_expired() çağrısında tek bir "×N (süre)" özeti olarak yazılır.
+
+        Args:
+            interval (float): Birleştirme aralığı (saniye)
+        """
+        self.interval = interval
+        # anahtar -> [aralık_başlangıcı, bastırılan_sayısı, seviye, mesaj, argümanlar]
+        self._sites = {}
+
+    def log(self, level, message, *args, key=None):
+        """
+        Mesajı hız sınırıyla loglar
+
+        Mesaj loguru gibi süslü parantez şablonudur, argümanlar yalnızca yazılırken biçimlendirilir.
+        """
+        now = time.monotonic()
+        site = self._sites.get(key or message)
+        if site is not None and now - site[0] < self.interval:
+            site[1] += 1
+            site[4] = args
+            return
+
+        if site is not None and site[1]:
+            # Bu mesaj da özete dahil edilir, yeni aralık özetle başlar
+            site[1] += 1
+            site[4] = args
+            self._emit_summary(site, now)
+            site[0] = now
+            return
+
+        self._sites[key or message] = [now, 0, level, message, args]
+        logger.opt(depth=1).log(level, message, *args)
+
+    def debug(self, message, *args, key=None):
+        self.log("DEBUG", message, *args, key=key)
+
+    def info(self, message, *args, key=None):
+        self.log("INFO", message, *args, key=key)
+
+    def warning(self, message, *args, key=None):
+        self.log("WARNING", message, *args, key=key)
+
+    def flush_expired(self):
+        """
+        Aralığı dolmuş çağrı yerlerinin bekleyen özetlerini yazar
+        """
+        now = time.monotonic()
+        for site in self._sites.values():
+            if site[1] and now - site[0] >= self.interval:
+                self._emit_summary(site, now)
+                site[0] = now
+
+    def flush(self):
+        """
+        Tüm bekleyen özetleri yazar (kapanışta)
+        """
+        now = time.monotonic()
+        for site in self._sites.values():
+            if site[1]:
+                self._emit_summary(site, now)
+
+    @staticmethod
+    def _emit_summary(site, now):
+        _, count, level, message, args = site
+        logger.log(level, message + " ×{} ({:.1f} s)", *args, count, min(now - site[0], 9999.0))
+        site[1] = 0
+
+def setup_logging(mode=None, log_file=config.LOG_FILE):
+    """
+    Loguru sink'lerini yapılandırır
+
+    "debug" modu: konsol INFO, dosya DEBUG, senkron yazma (önceki davranış).
+    "production" modu: konsol ve dosya config.LOG_PRODUCTION_LEVEL seviyesinde, asenkron yazma.
+    Mod LOG_MODE ortam değişkeni ile de seçilebilir.
+
+    Args:
+        mode (str): "debug" veya "production" (None ise LOG_MODE / config.LOG_MODE)
+        log_file (str): Log dosyası
+
+    Returns:
+        sinks: Başlatılan asenkron sink'ler (kapanışta stop() çağrılmalı)
+    """
+    if mode is None:
+        mode = os.environ.get('LOG_MODE', config.LOG_MODE).lower()
+
+    logger.remove()
+
+    if mode != "production":
+        logger.add(sys.stderr, level="INFO")  # Konsola log
+        logger.add(log_file, rotation=f"{config.LOG_ROTATION_MB} MB", level="DEBUG")  # Dosyaya log
+        return []
+
+    level = config.LOG_PRODUCTION_LEVEL
+    console = AsyncLogSink(stream=sys.stderr, name="log-console")
+    file_sink = AsyncLogSink(path=log_file, name="log-file")
+    sinks = [console, file_sink]
+    for sink in sinks:
+        sink.start()
+        logger.add(sink.write, level=level, format=LOG_FORMAT, colorize=False, catch=True)
+    return sinks
+
+def shutdown_logging(sinks):
+    """
+    Asenkron sink'lerin kuyruklarını boşaltır ve durdurur
+    """
+    if not sinks:
+        return
+    logger.remove()
+    for sink in sinks:
+        sink.stop()
+    logger.add(sys.stderr, level="INFO")
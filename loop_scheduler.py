@@ -0,0 +1,136 @@
+"""
+Sabit hızlı kontrol döngüsü zamanlayıcısı
+Döngü sonunda sabit süre uyumak yerine hedef periyottan kalan süre kadar bekler,
+gecikmeleri (deadline aşımı) sayar ve gerçekleşen hız ile titreşim istatistiklerini sunar
+"""
+
+import time
+from collections import deque
+import config
+import numpy as np
+from loguru import logger
+
+class LoopScheduler:
+    def __init__(self, rate_hz=config.CONTROL_LOOP_RATE, history_size=500, paced=True):
+        """
+        Döngü zamanlayıcısı başlatıcı
+
+        Args:
+            rate_hz (float): Hedef döngü hızı (Hz)
+            history_size (int): İstatistik için saklanan periyot sayısı
+            paced (bool): False ise beklemez, yalnızca ölçer (kayıttan olabildiğince hızlı oynatma)
+        """
+        self.period = 1.0 / rate_hz
+        self.rate_hz = rate_hz
+        self.paced = paced
+
+        self._next_deadline = None
+        self._last_tick = None
+
+        # Son periyotlar ve hedef periyottan sapmaları (saniye)
+        self._periods = deque(maxlen=history_size)
+        self._jitter = deque(maxlen=history_size)
+
+        # Sayaçlar
+        self.iterations = 0
+        self.overruns = 0
+
+        if paced:
+            logger.info(f"Döngü zamanlayıcısı hazır. Hedef: {rate_hz} Hz ({self.period * 1000:.1f} ms)")
+        else:
+            logger.info("Döngü zamanlayıcısı hazır. Beklemesiz mod (olabildiğince hızlı)")
+
+    def wait(self):
+        """
+        Bir sonraki periyot başlangıcına kadar bekler
+
+        Döngünün başında çağrılır. İlk çağrıda beklemez. Periyot aşıldıysa beklemeden
+        döner ve bir sonraki hedef zamanı şimdiye göre yeniden ayarlar (birikmiş
+        gecikmeyi telafi etmek için art arda hızlı tur atılmaz).
+        """
+        now = time.monotonic()
+
+        if self._next_deadline is None:
+            self._next_deadline = now + self.period
+            self._last_tick = now
+            return
+
+        remaining = self._next_deadline - now
+        if not self.paced:
+            self._next_deadline = now + self.period
+        elif remaining > 0:
+            time.sleep(remaining)
+            now = time.monotonic()
+            self._next_deadline += self.period
+        else:
+            # Periyot aşıldı
+            self.overruns += 1
+            self._next_deadline = now + self.period
+
+        period = now - self._last_tick
+        self._periods.append(period)
+        self._jitter.append(abs(period - self.period) if self.paced else 0.0)
+        self._last_tick = now
+        self.iterations += 1
+
+    def set_rate(self, rate_hz):
+        """
+        Hedef döngü hızını değiştirir (örn. bekleme durumunda düşük hız)
+
+        Args:
+            rate_hz (float): Yeni hedef hız (Hz)
+        """
+        if rate_hz == self.rate_hz:
+            return
+
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+
+        # Eski periyoda göre hesaplanan hedef zaman ve periyot ölçümü geçersiz
+        self.reset()
+
+    def reset(self):
+        """
+        Zamanlamayı sıfırlar (uzun bir duraklamadan sonra kullanılır)
+        """
+        self._next_deadline = None
+        self._last_tick = None
+
+    def get_stats(self):
+        """
+        Gerçekleşen hız ve titreşim istatistiklerini döndürür
+
+        Returns:
+            stats: rate_hz, jitter_p50_ms, jitter_p95_ms, jitter_p99_ms, overruns, iterations
+        """
+        if not self._periods:
+            return {
+                "rate_hz": 0.0,
+                "jitter_p50_ms": 0.0,
+                "jitter_p95_ms": 0.0,
+                "jitter_p99_ms": 0.0,
+                "overruns": self.overruns,
+                "iterations": self.iterations,
+            }
+
+        periods = np.fromiter(self._periods, dtype=np.float64)
+        jitter_ms = np.fromiter(self._jitter, dtype=np.float64) * 1000
+        p50, p95, p99 = np.percentile(jitter_ms, [50, 95, 99])
+
+        return {
+            "rate_hz": 1.0 / periods.mean(),
+            "jitter_p50_ms": p50,
+            "jitter_p95_ms": p95,
+            "jitter_p99_ms": p99,
+            "overruns": self.overruns,
+            "iterations": self.iterations,
+        }
+
+    def format_stats(self):
+        """
+        İstatistikleri log için biçimlendirir
+        """
+        stats = self.get_stats()
+        return (f"Döngü hızı: {stats['rate_hz']:.1f}/{self.rate_hz} Hz, "
+                f"Titreşim p50/p95/p99: {stats['jitter_p50_ms']:.2f}/{stats['jitter_p95_ms']:.2f}/{stats['jitter_p99_ms']:.2f} ms, "
+                f"Gecikme: {stats['overruns']}/{stats['iterations']}")
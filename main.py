@@ -11,6 +11,19 @@ import config
 from motor_controller import MotorController
 from line_detector import LineDetector
 from obstacle_detector import ObstacleDetector
+from camera_capture import CameraCapture
+from frame_source import open_frame_source
+from loop_scheduler import LoopScheduler
+from latency_profiler import LatencyProfiler
+from log_setup import setup_logging, shutdown_logging, LogThrottle
+from maneuver import ManeuverExecutor, avoidance_maneuver
+from scene_monitor import SceneMonitor
+from debug_writer import DebugImageWriter
+from run_recorder import RunRecorder
+from buffer_pool import BufferPool
+from debug_overlay import render_line, render_crosswalk, render_obstacles
+from live_view import LiveViewServer
+from telemetry import TelemetryRecorder
 import os
 import sys
 import logging
@@ -68,21 +81,489 @@ except ImportError as e:
     logger.error("4. Raspberry Pi'yi yeniden başlatın: sudo reboot")
     PICAMERA_AVAILABLE = False
 
-# Loglama ayarları
-logger.remove()  # Varsayılan logger'ı kaldır
-logger.add(sys.stderr, level="INFO")  # Konsola log
-logger.add("robot_log.txt", rotation="10 MB", level="DEBUG")  # Dosyaya log
+# Loglama ayarları (LOG_MODE=production: asenkron yazma, config.py'deki seviye)
+log_sinks = setup_logging()
+
+def configure_still_camera(picam2):
+    """
+    Kamerayı fotoğraf (still) yapılandırması ile ayarlar, hata olursa alternatif yöntemleri dener
+
+    Args:
+        picam2: Picamera2 nesnesi
+    """
+    # Raspberry Pi 5 ve Pi Camera 3 için özel yapılandırma
+    # Transform sınıfı kullanılabilir mi kontrol et
+    if 'Transform' in globals():
+        # Transform sınıfı varsa kullan
+        camera_config = picam2.create_still_configuration(
+            main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"},
+            transform=Transform(hflip=config.CAMERA_HFLIP, vflip=config.CAMERA_VFLIP)
+        )
+        logger.info("Transform sınıfı ile kamera yapılandırıldı")
+    else:
+        # Transform sınıfı yoksa daha basit yapılandırma kullan
+        camera_config = picam2.create_still_configuration(
+            main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"}
+        )
+        logger.info("Basit yapılandırma ile kamera yapılandırıldı")
+
+    # Yapılandırmayı uygula - hata olursa alternatif yöntemleri dene
+    try:
+        # İlk yöntem: still_configuration
+        picam2.configure(camera_config)
+        logger.info("Kamera still_configuration ile yapılandırıldı")
+    except Exception as e:
+        logger.warning(f"still_configuration hatası: {e}")
+        try:
+            # İkinci yöntem: preview_configuration
+            logger.info("Alternatif yapılandırma deneniyor (preview_configuration)...")
+            preview_config = picam2.create_preview_configuration(
+                main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"}
+            )
+            picam2.configure(preview_config)
+            logger.info("Kamera preview_configuration ile yapılandırıldı")
+        except Exception as e2:
+            logger.warning(f"preview_configuration hatası: {e2}")
+            try:
+                # Üçüncü yöntem: video_configuration
+                logger.info("Alternatif yapılandırma deneniyor (video_configuration)...")
+                video_config = picam2.create_video_configuration(
+                    main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"}
+                )
+                picam2.configure(video_config)
+                logger.info("Kamera video_configuration ile yapılandırıldı")
+            except Exception as e3:
+                # Son çare: varsayılan yapılandırma
+                logger.warning(f"video_configuration hatası: {e3}")
+                logger.info("Varsayılan yapılandırma deneniyor...")
+                picam2.configure(picam2.create_preview_configuration())
+                logger.info("Kamera varsayılan yapılandırma ile yapılandırıldı")
+
+def configure_streaming_camera(picam2):
+    """
+    Kamerayı düşük gecikmeli video akış modunda yapılandırır
+
+    Ana akış tam çözünürlükte BGR, lores akış ise şerit ve zemin geçidi algılama için
+    küçültülmüş YUV420 görüntü sağlar. Y düzlemi doğrudan gri görüntü olarak kullanılır.
+
+    Args:
+        picam2: Picamera2 nesnesi
+
+    Returns:
+        lores_size: Lores akışının boyutu (genişlik, yükseklik)
+    """
+    frame_duration_us = int(1_000_000 / config.CAMERA_FRAMERATE)
+    video_config = picam2.create_video_configuration(
+        main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"},
+        lores={"size": config.CAMERA_LORES_RESOLUTION, "format": "YUV420"},
+        buffer_count=config.CAMERA_BUFFER_COUNT,
+        transform=Transform(hflip=config.CAMERA_HFLIP, vflip=config.CAMERA_VFLIP),
+        controls={"FrameDurationLimits": (frame_duration_us, frame_duration_us)}
+    )
+    picam2.configure(video_config)
+
+    # Sürücünün hizaladığı gerçek lores boyutunu kullan
+    lores_size = tuple(picam2.camera_configuration()["lores"]["size"])
+    logger.info(f"Kamera video akış modunda yapılandırıldı. Ana: {config.CAMERA_RESOLUTION}, Lores (YUV420): {lores_size}")
+    return lores_size
+
+def apply_frame_rate_limits(picam2):
+    """
+    config.CAMERA_FRAMERATE değerinden türetilen kare süresi sınırlarını uygular
+
+    Min ve max kare süresi aynı verilir, böylece sensör sabit hızda çalışır ve
+    otomatik pozlama kare süresini uzatamaz.
+
+    Args:
+        picam2: Picamera2 nesnesi
+    """
+    frame_duration_us = int(1_000_000 / config.CAMERA_FRAMERATE)
+    try:
+        picam2.set_controls({"FrameDurationLimits": (frame_duration_us, frame_duration_us)})
+        logger.info(f"Kare süresi sınırları uygulandı: {frame_duration_us} µs ({config.CAMERA_FRAMERATE} FPS)")
+    except Exception as e:
+        logger.warning(f"Kare süresi sınırları uygulanamadı: {e}")
+
+def measure_sensor_frame_rate(picam2, frames=10):
+    """
+    Kare metaverisinden sensörün gerçekleşen kare hızını ölçer
+
+    Args:
+        picam2: Picamera2 nesnesi
+        frames (int): Ortalaması alınacak kare sayısı
+
+    Returns:
+        fps: Gerçekleşen kare hızı (ölçülemezse None)
+    """
+    durations = []
+    for _ in range(frames):
+        metadata = picam2.capture_metadata()
+        if metadata.get("FrameDuration"):
+            durations.append(metadata["FrameDuration"])
+
+    if not durations:
+        return None
+    return 1_000_000 / (sum(durations) / len(durations))
+
+def lock_exposure_and_awb(picam2):
+    """
+    Otomatik pozlama ve beyaz dengesinin yakınsamasını bekler, ardından değerleri kilitler
+
+    Siyah pistte ışık değişimleri kare süresini ve hareket bulanıklığını etkilemesin diye
+    pozlama süresi, analog kazanç ve renk kazançları sabitlenir.
+
+    Args:
+        picam2: Picamera2 nesnesi
+    """
+    logger.info(f"Pozlama ve beyaz dengesi yakınsaması bekleniyor ({config.CAMERA_EXPOSURE_SETTLE_TIME} sn)...")
+    time.sleep(config.CAMERA_EXPOSURE_SETTLE_TIME)
 
-def main():
-    logger.info("Şerit Takip Eden Robot Başlatılıyor...")
+    try:
+        metadata = picam2.capture_metadata()
+        controls = {
+            "AeEnable": False,
+            "AwbEnable": False,
+            "ExposureTime": metadata["ExposureTime"],
+            "AnalogueGain": metadata["AnalogueGain"],
+        }
+        if "ColourGains" in metadata:
+            controls["ColourGains"] = metadata["ColourGains"]
+
+        picam2.set_controls(controls)
+        logger.info(f"Pozlama kilitlendi. Süre: {controls['ExposureTime']} µs, "
+                    f"Kazanç: {controls['AnalogueGain']:.2f}, Renk kazançları: {controls.get('ColourGains')}")
+    except Exception as e:
+        logger.warning(f"Pozlama/beyaz dengesi kilitlenemedi: {e}")
+
+def run_robot(capture, motors, line_detector, obstacle_detector, debug_writer=None, recorder=None,
+              should_stop=None, profiler=None, live_view=None, telemetry=None):
+    """
+    Kontrol döngüsünü çalıştırır - kare al, algıla, motorlara komut ver
+
+    Kamera ve GPIO kurulumundan bağımsızdır; simülatör aynı döngüyü sahte kare kaynağı
+    ve sahte GPIO ile sürer.
+
+    Args:
+        capture: Kare kaynağı (frame_source.FrameSource - kamera, video, görüntü klasörü, kayıt)
+        motors: MotorController nesnesi
+        line_detector: LineDetector nesnesi
+        obstacle_detector: ObstacleDetector nesnesi
+        debug_writer: Debug görüntü yazıcısı (None ise görüntü kaydedilmez)
+        recorder: Çalışma kaydedici (None ise kayıt yapılmaz)
+        should_stop: Her turda çağrılır, True dönerse döngü biter (None ise sonsuz döngü)
+        profiler: Aşama gecikme ölçer (None ise döngü kendi ölçerini oluşturur)
+        live_view: Canlı izleme sunucusu (None ise yayın yapılmaz)
+        telemetry: Telemetri kaydedici (None ise kare başına kayıt tutulmaz)
+
+    Returns:
+        scheduler: Döngü zamanlayıcısı (istatistikler için)
+    """
+    # Durum değişkenleri
+    is_at_crosswalk = False
+    crosswalk_start_time = 0
+    crosswalk_exit_time = None
+    avoidance_direction = None
+    frame_count = 0
 
-    # Debug modu kontrolü
-    debug_mode = os.environ.get('DEBUG_MODE', 'False').lower() == 'true'
-    if debug_mode:
-        logger.info("Debug modu aktif")
-        # Debug klasörü oluştur
-        os.makedirs("debug_images", exist_ok=True)
+    # Engelden kaçınma manevrası yürütücüsü
+    maneuver = ManeuverExecutor(motors)
+
+    # Zemin geçidinde bekleme sırasında sahne değişimi izleyicisi
+    scene_monitor = SceneMonitor()
+    idle_woken = False
+
+    # Sabit hızlı döngü zamanlayıcısı
+    # Gerçek zamanlı olmayan kaynakta (olabildiğince hızlı oynatma) beklenmez, yalnızca ölçülür
+    scheduler = LoopScheduler(config.CONTROL_LOOP_RATE, paced=capture.realtime)
+    last_loop_stats_time = time.monotonic()
+
+    # Aşama gecikmeleri (yakalamadan motor komutuna kadar) - her zaman açık
+    if profiler is None:
+        profiler = LatencyProfiler()
+
+    # Sık tekrarlanan mesajlar (ör. şerit kaybı) aralık başına tek satırda birleştirilir
+    log_throttle = LogThrottle()
+
+    # Karelerden türetilen görüntüler (gri, piramit, ROI) her karede aynı tamponlara yazılır
+    frame_buffers = BufferPool()
+
+    loop_start = None
+
+    # Canlı izleme ve telemetri için son turun kare bağlamı ve algılama sonuçları
+    ctx = line_result = obstacle_result = crosswalk = steer_position = None
+
+    def publish_turn(loop_time):
+        """
+        Biten turun sonuçlarını telemetriye ve canlı izlemeye verir (tur kare ile çalıştıysa)
+        """
+        if ctx is None or (live_view is None and telemetry is None):
+            return
+        state = ("crosswalk" if is_at_crosswalk else
+                 "avoidance" if maneuver.is_active else "line_following")
+        if telemetry is not None:
+            telemetry.record(frame_time, frame_id, is_new_frame, state, line=line_result,
+                             obstacles=obstacle_result, crosswalk=crosswalk,
+                             steer_position=steer_position, motors=motors, loop_time=loop_time)
+        if live_view is not None:
+            live_view.publish(ctx, frame_count, state, line=line_result, obstacles=obstacle_result,
+                              crosswalk=crosswalk, motors=motors)
+
+    try:
+        while should_stop is None or not should_stop():
+            # Önceki turun işlem süresi (tüm durumlar dahil, bekleme hariç)
+            if loop_start is not None:
+                loop_time = profiler.lap("loop", loop_start) - loop_start
+
+                # Canlı izleme ve telemetri: önceki turun sonuçları (tamponlar yeni kare işlenmeden önce hâlâ geçerli)
+                publish_turn(loop_time)
+            ctx = line_result = obstacle_result = crosswalk = steer_position = None
+
+            # Döngü hızını kontrol et - hedef periyottan kalan süre kadar bekle
+            scheduler.wait()
+            loop_start = t = profiler.start()
+
+            # Arka plan yakalama tamponundan en yeni kareyi al (beklemeden)
+            ctx, frame_id, frame_time, is_new_frame = capture.read()
+            t = profiler.lap("capture", t)
+
+            # Görüntü kontrolü
+            if ctx is None:
+                if capture.exhausted:
+                    logger.info(f"Kare kaynağı bitti. {capture.format_stats()}")
+                    break
+                # Henüz kare yok, bir sonraki periyotta tekrar dene
+                continue
+            ctx.use_buffers(frame_buffers)
+
+            if is_new_frame:
+                profiler.record("frame_age", time.monotonic() - frame_time)
+
+            # Çalışma kaydı: önceki karenin motor komutunu kapat, yeni kareyi kaydet
+            if recorder is not None and is_new_frame:
+                recorder.finish_frame(motors)
+                recorder.begin_frame(ctx.frame if config.RUN_RECORD_SOURCE == "main" else ctx.gray,
+                                     frame_time, frame_id)
+
+            # Görüntü boyutunu ve yakalama sayaçlarını kontrol et (debug için)
+            if frame_count % 100 == 0:
+                logger.opt(lazy=True).debug("Görüntü boyutu: {}, Yakalama: {}",
+                                            lambda: ctx.frame.shape, capture.format_stats)
+
+            # Döngü zamanlama istatistiklerini periyodik olarak logla
+            if time.monotonic() - last_loop_stats_time >= config.LOOP_STATS_INTERVAL:
+                logger.info(scheduler.format_stats())
+                logger.info(profiler.format_stats())
+                log_throttle.flush_expired()
+                if debug_writer is not None:
+                    logger.info(f"Debug görüntüleri: {debug_writer.format_stats()}")
+                if live_view is not None:
+                    logger.info(f"Canlı izleme: {live_view.format_stats()}")
+                if telemetry is not None:
+                    logger.info(f"Telemetri: {telemetry.format_stats()}")
+                last_loop_stats_time = time.monotonic()
+
+            # Kare sayacını artır
+            frame_count += 1
+
+            # Durum kontrolü
+            current_time = time.time()
+
+            # 1. Zemin geçidinde durma durumu - düşük hızlı bekleme modu
+            if is_at_crosswalk:
+                if current_time - crosswalk_start_time >= config.CROSSWALK_STOP_TIME:
+                    logger.info("Zemin geçidi geçiliyor...")
+                    is_at_crosswalk = False
+                    crosswalk_exit_time = current_time
+
+                    # Tam hıza geri dön
+                    scheduler.set_rate(config.CONTROL_LOOP_RATE)
+                    capture.set_throttle(None)
+                    motors.forward(config.DEFAULT_SPEED)
+                else:
+                    # Zemin geçidinde bekle - motorlar girişte durduruldu, yalnızca yeni karelerde ucuz fark kontrolü
+                    if is_new_frame and not idle_woken and scene_monitor.has_changed(ctx):
+                        logger.info(f"Zemin geçidinde sahne değişti (fark: {scene_monitor.last_difference:.1f}), algılama uyandırıldı")
+                        idle_woken = True
+                        scheduler.set_rate(config.CONTROL_LOOP_RATE)
+                        capture.set_throttle(None)
+
+                    # Uyandırıldıysa kalan bekleme süresince engel algılamayı çalıştır
+                    if idle_woken and is_new_frame:
+                        obstacle_result = obstacle_detector.detect_blobs(ctx)
+                        idle_blobs = obstacle_result.blobs
+                        if idle_blobs:
+                            logger.info(f"Zemin geçidinde engel görüldü: {idle_blobs[0].position}, Renk: {idle_blobs[0].color}")
+                    continue
+
+            # 2. Engelden kaçınma durumu - manevra bloklamadan ilerletilir
+            if maneuver.is_active:
+                if maneuver.update():
+                    # Manevra sürerken yalnızca yeni karelerde ucuz algılama: şerit yeniden bulundu mu?
+                    if is_new_frame:
+                        line_result = line_detector.detect_line(ctx)
+                        line_position = line_result.position
+                        if recorder is not None:
+                            recorder.set_line(line_position)
+                        # Erken bitirme: dönüş en az belirli süre sürmeli ve engel artık görünmemeli,
+                        # aksi halde düz gidilince aynı engel yeniden algılanır ve manevra tekrar başlar
+                        if (config.OBSTACLE_AVOIDANCE_EARLY_EXIT and maneuver.is_last_segment and
+                                maneuver.segment_elapsed() >= config.OBSTACLE_EARLY_EXIT_MIN_TIME and
+                                line_position is not None and abs(line_position) < line_detector.position_threshold and
+                                not obstacle_detector.detect_blobs(ctx).detected):
+                            maneuver.abort(f"(şerit yeniden bulundu, pozisyon: {line_position})")
+                            motors.forward(config.DEFAULT_SPEED)
+                    continue
+
+                logger.info("Engelden kaçınma tamamlandı.")
+                motors.forward(config.DEFAULT_SPEED)
+
+            # Ortak ön işleme: gri dönüşüm kare başına bir kez (lores akışta hazır gelir)
+            t = profiler.start()
+            ctx.gray
+            t = profiler.lap("preprocess", t)
+
+            # 3. Normal çalışma durumu - Engel kontrolü (tek geçişte konum, renk ve alan)
+            obstacle_result = obstacle_detector.detect_blobs(ctx)
+            obstacle_blobs = obstacle_result.blobs
+            t = profiler.lap("obstacle", t)
+            if recorder is not None:
+                recorder.set_obstacles(obstacle_blobs)
+
+            # Yalnızca yakın ve robotun yolundaki engeller kaçınma gerektirir; uzaktaki veya yan
+            # şeritteki engel için manevra başlatılırsa robot şeridi kaybeder
+            blocking_blobs = [blob for blob in obstacle_blobs if obstacle_detector.blocks_path(blob)]
+            has_obstacle = len(blocking_blobs) > 0
+
+            if has_obstacle:
+                # Yoldaki en büyük engeli takip et
+                obstacle = blocking_blobs[0]
+                obstacle_position = obstacle.position
+                obstacle_detector.last_detection_time = current_time
+                obstacle_detector.last_obstacle_position = obstacle_position
+                logger.info(f"Engel tespit edildi: {obstacle_position}, Renk: {obstacle.color}, Alan: {obstacle.area}, "
+                            f"Uzaklık: {obstacle.distance:.0f} cm, Engel sayısı: {len(obstacle_blobs)}")
+                avoidance_direction = obstacle_detector.get_avoidance_direction(obstacle_position)
+
+                # Engelden kaçınma manevrası başlat (bloklamadan, döngü her turda ilerletir)
+                logger.info(f"Engelden kaçınma yönü: {avoidance_direction}")
+                t = profiler.lap("decision", t)
+                maneuver.start(avoidance_maneuver(avoidance_direction), name=f"kaçınma_{avoidance_direction}")
+                t = profiler.lap("motor", t)
+                profiler.record("end_to_end", time.monotonic() - frame_time)
+
+                # Debug modunda görüntüyü kaydet (yalnızca kaydedilecek karede çizilir)
+                if debug_writer is not None and frame_count % 10 == 0:
+                    debug_writer.submit(f"obstacle_{frame_count}", render_obstacles(obstacle_result))
+
+                continue
 
+            # 4. Normal çalışma durumu - Zemin geçidi kontrolü
+            # Geçit geçilirken aynı geçit görüş alanında kalır, kısa süre yeniden algılanmaz
+            if crosswalk_exit_time is None or current_time - crosswalk_exit_time >= config.CROSSWALK_COOLDOWN_TIME:
+                crosswalk = line_detector.is_crosswalk(ctx)
+                is_crosswalk, crosswalk_confidence = crosswalk.detected, crosswalk.ratio
+                t = profiler.lap("crosswalk", t)
+                if recorder is not None:
+                    recorder.set_crosswalk(is_crosswalk, crosswalk_confidence)
+
+                if is_crosswalk:
+                    logger.info(f"Zemin geçidi tespit edildi! Güven: {crosswalk_confidence:.2f}")
+                    is_at_crosswalk = True
+                    crosswalk_start_time = current_time
+                    t = profiler.lap("decision", t)
+                    motors.stop()
+                    t = profiler.lap("motor", t)
+                    profiler.record("end_to_end", time.monotonic() - frame_time)
+
+                    # Bekleme moduna geç: döngüyü ve yakalamayı seyrelt, fark kontrolü için referans al
+                    idle_woken = False
+                    scene_monitor.reset(ctx)
+                    scheduler.set_rate(config.IDLE_LOOP_RATE)
+                    capture.set_throttle(1.0 / config.IDLE_LOOP_RATE)
+
+                    # Debug modunda görüntüyü kaydet
+                    if debug_writer is not None:
+                        debug_writer.submit(f"crosswalk_{frame_count}", render_crosswalk(crosswalk))
+
+                    continue
+
+            # 5. Normal çalışma durumu - Şerit takibi
+            line_result = line_detector.detect_line(ctx)
+            line_position = line_result.position
+            t = profiler.lap("line", t)
+            if recorder is not None:
+                recorder.set_line(line_position)
+
+            # Şerit modeli: ileri bakış noktası virajları alt ROI'den önce gösterir
+            steer_position = line_position
+            if config.LANE_MODEL_ENABLED and line_position is not None:
+                lane = line_detector.fit_lane_model(ctx)
+                t = profiler.lap("lane_model", t)
+                if lane is not None:
+                    # Zemin görünümünde pozisyonlar cm, aksi halde piksel
+                    lookahead_position = lane.offset if line_detector.ground_view is not None else lane.position
+                    steer_position = ((1 - config.LANE_MODEL_WEIGHT) * line_position +
+                                      config.LANE_MODEL_WEIGHT * lookahead_position)
+                    if frame_count % 50 == 0:
+                        logger.debug("Şerit modeli: {}", lane)
+
+            # Şerit kontrolü - önce komut seçilir, sonra motorlara uygulanır
+            if steer_position is not None:
+
+                # Şerit ve ileri bakış pozisyonuna göre hareket et
+                if abs(steer_position) < line_detector.position_threshold:
+                    # Düz git
+                    movement, speed = motors.forward, config.DEFAULT_SPEED
+                    if frame_count % 50 == 0:
+                        logger.debug("Düz gidiyor. Şerit pozisyonu: {}", line_position)
+                elif steer_position < 0:
+                    # Sola dön
+                    movement, speed = motors.curve_left, config.CURVE_SPEED
+                    if frame_count % 20 == 0:
+                        logger.debug("Sola dönüyor. Şerit pozisyonu: {}", line_position)
+                else:
+                    # Sağa dön
+                    movement, speed = motors.curve_right, config.CURVE_SPEED
+                    if frame_count % 20 == 0:
+                        logger.debug("Sağa dönüyor. Şerit pozisyonu: {}", line_position)
+            else:
+                # Şerit bulunamadı, son bilinen yöne devam et veya dur
+                log_throttle.warning("Şerit bulunamadı!")
+                movement, speed = motors.stop, None
+            t = profiler.lap("decision", t)
+
+            if speed is None:
+                movement()
+            else:
+                movement(speed)
+            t = profiler.lap("motor", t)
+            profiler.record("end_to_end", time.monotonic() - frame_time)
+
+            # Debug modunda görüntüleri kaydet
+            if debug_writer is not None and frame_count % 30 == 0:
+                debug_writer.submit(f"line_{frame_count}", render_line(line_result))
+
+    finally:
+        # Döngü durdurulduğunda (should_stop, hata) son turun sonuçları henüz yayınlanmadı
+        if loop_start is not None:
+            try:
+                publish_turn(profiler.start() - loop_start)
+            except Exception as e:
+                logger.error(f"Son tur telemetrisi kaydedilemedi: {e}")
+        log_throttle.flush()
+        logger.info(f"Döngü zamanlaması: {scheduler.format_stats()}")
+        logger.info(profiler.format_stats())
+
+    return scheduler
+
+def start_camera():
+    """
+    Picamera2 kamerasını yapılandırır ve başlatır, başarısız olursa programı sonlandırır
+
+    Returns:
+        picam2: Başlatılmış Picamera2 nesnesi
+        lores_size: Lores akışının boyutu (video modu kullanılamadıysa None)
+    """
     # Kamera kontrolü
     if not PICAMERA_AVAILABLE:
         logger.error("Picamera2 modülü yüklenemedi. Program sonlandırılıyor.")
@@ -94,52 +575,20 @@ def main():
         picam2 = Picamera2()
 
         # Raspberry Pi 5 ve Pi Camera 3 için özel yapılandırma
-        # Transform sınıfı kullanılabilir mi kontrol et
-        if 'Transform' in globals():
-            # Transform sınıfı varsa kullan
-            camera_config = picam2.create_still_configuration(
-                main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"},
-                transform=Transform(hflip=config.CAMERA_HFLIP, vflip=config.CAMERA_VFLIP)
-            )
-            logger.info("Transform sınıfı ile kamera yapılandırıldı")
+        lores_size = None
+        if config.CAMERA_MODE == "video":
+            try:
+                # Düşük gecikmeli akış modu (ana + lores YUV420)
+                lores_size = configure_streaming_camera(picam2)
+            except Exception as e:
+                logger.warning(f"Video akış yapılandırması hatası: {e}")
+                logger.info("still_configuration ile devam ediliyor...")
+                configure_still_camera(picam2)
         else:
-            # Transform sınıfı yoksa daha basit yapılandırma kullan
-            camera_config = picam2.create_still_configuration(
-                main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"}
-            )
-            logger.info("Basit yapılandırma ile kamera yapılandırıldı")
+            configure_still_camera(picam2)
 
-        # Yapılandırmayı uygula - hata olursa alternatif yöntemleri dene
-        try:
-            # İlk yöntem: still_configuration
-            picam2.configure(camera_config)
-            logger.info("Kamera still_configuration ile yapılandırıldı")
-        except Exception as e:
-            logger.warning(f"still_configuration hatası: {e}")
-            try:
-                # İkinci yöntem: preview_configuration
-                logger.info("Alternatif yapılandırma deneniyor (preview_configuration)...")
-                preview_config = picam2.create_preview_configuration(
-                    main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"}
-                )
-                picam2.configure(preview_config)
-                logger.info("Kamera preview_configuration ile yapılandırıldı")
-            except Exception as e2:
-                logger.warning(f"preview_configuration hatası: {e2}")
-                try:
-                    # Üçüncü yöntem: video_configuration
-                    logger.info("Alternatif yapılandırma deneniyor (video_configuration)...")
-                    video_config = picam2.create_video_configuration(
-                        main={"size": config.CAMERA_RESOLUTION, "format": "RGB888"}
-                    )
-                    picam2.configure(video_config)
-                    logger.info("Kamera video_configuration ile yapılandırıldı")
-                except Exception as e3:
-                    # Son çare: varsayılan yapılandırma
-                    logger.warning(f"video_configuration hatası: {e3}")
-                    logger.info("Varsayılan yapılandırma deneniyor...")
-                    picam2.configure(picam2.create_preview_configuration())
-                    logger.info("Kamera varsayılan yapılandırma ile yapılandırıldı")
+        # Kare hızını config.CAMERA_FRAMERATE değerine sabitle
+        apply_frame_rate_limits(picam2)
 
         # Kamerayı başlat
         logger.info("Kamera başlatılıyor...")
@@ -149,6 +598,18 @@ def main():
         logger.info("Kameranın başlaması bekleniyor...")
         time.sleep(3)  # Daha uzun bekleme süresi
 
+        # İsteğe bağlı: pozlama, kazanç ve beyaz dengesini kilitle
+        if config.CAMERA_LOCK_EXPOSURE:
+            lock_exposure_and_awb(picam2)
+
+        # Gerçekleşen sensör kare hızını raporla
+        try:
+            sensor_fps = measure_sensor_frame_rate(picam2)
+            if sensor_fps is not None:
+                logger.info(f"Sensör kare hızı: {sensor_fps:.1f} FPS (hedef: {config.CAMERA_FRAMERATE})")
+        except Exception as e:
+            logger.warning(f"Sensör kare hızı ölçülemedi: {e}")
+
         # Test görüntüsü al - birkaç kez dene
         logger.info("Test görüntüsü alınıyor...")
         max_attempts = 3
@@ -183,6 +644,58 @@ def main():
         logger.error("5. Raspberry Pi'yi yeniden başlatın")
         sys.exit(1)
 
+    return picam2, lores_size
+
+def main():
+    logger.info("Şerit Takip Eden Robot Başlatılıyor...")
+
+    # Debug modu kontrolü
+    debug_mode = os.environ.get('DEBUG_MODE', 'False').lower() == 'true'
+    debug_writer = None
+    if debug_mode:
+        logger.info("Debug modu aktif")
+        # Debug görüntüleri arka planda, sınırlı kuyruk ve disk kotası ile yazılır
+        debug_writer = DebugImageWriter()
+        debug_writer.start()
+
+    # Çalışma kaydı kontrolü (ham kareler + kararlar)
+    recorder = None
+    if config.RUN_RECORD_ENABLED or os.environ.get('RECORD_RUN', 'False').lower() == 'true':
+        recorder = RunRecorder()
+
+    # Telemetri kontrolü (kare başına yapılı kayıtlar, TELEMETRY=false ile kapatılabilir)
+    telemetry = None
+    if os.environ.get('TELEMETRY', str(config.TELEMETRY_ENABLED)).lower() == 'true':
+        telemetry = TelemetryRecorder()
+        telemetry.start()
+
+    # Canlı izleme kontrolü (MJPEG akışı + JSON durum, LIVE_VIEW=true ile de açılabilir)
+    live_view = None
+    if config.LIVE_VIEW_ENABLED or os.environ.get('LIVE_VIEW', 'False').lower() == 'true':
+        live_view = LiveViewServer()
+        if not live_view.start():
+            live_view = None
+
+    # Kare kaynağı: kamera (varsayılan) veya FRAME_SOURCE ile video/görüntü klasörü/kayıt
+    source_spec = os.environ.get('FRAME_SOURCE', config.FRAME_SOURCE)
+    picam2 = None
+    if source_spec == "camera":
+        picam2, lores_size = start_camera()
+        capture = CameraCapture(picam2, lores_size=lores_size)
+    else:
+        # FAST_PLAYBACK=true: kareler beklemeden sırayla işlenir (tüm hattın profili için)
+        realtime = os.environ.get('FAST_PLAYBACK', 'False').lower() != 'true'
+        lores_size = config.CAMERA_LORES_RESOLUTION if config.CAMERA_MODE == "video" else None
+        try:
+            capture = open_frame_source(source_spec, realtime=realtime, lores_size=lores_size)
+        except Exception as e:
+            logger.error(f"Kare kaynağı açılamadı: {e}")
+            sys.exit(1)
+        logger.info(f"Kare kaynağı: {source_spec} ({'gerçek zamanlı' if realtime else 'olabildiğince hızlı'})")
+
+    # Arka plan yakalamayı başlat
+    capture.start()
+
     # Motor kontrolcüsü başlatma
     logger.info("Motor kontrolcüsü başlatılıyor...")
     motors = MotorController()
@@ -198,168 +711,11 @@ def main():
     obstacle_detector = ObstacleDetector()
     logger.info("Engel algılayıcı hazır.")
 
-    # Durum değişkenleri
-    is_at_crosswalk = False
-    crosswalk_start_time = 0
-    avoiding_obstacle = False
-    obstacle_start_time = 0
-    avoidance_direction = None
-    frame_count = 0
-
     logger.info("Robot hazır! Başlatılıyor...")
 
     try:
-        while True:
-            # Kameradan görüntü al
-            try:
-                # Farklı görüntü alma yöntemlerini dene
-                try:
-                    # Birincil yöntem: capture_array()
-                    frame = picam2.capture_array()
-                except Exception as e1:
-                    logger.warning(f"capture_array() hatası: {e1}")
-                    try:
-                        # İkincil yöntem: capture_array("main")
-                        logger.info("Alternatif görüntü alma yöntemi deneniyor (capture_array('main'))...")
-                        frame = picam2.capture_array("main")
-                    except Exception as e2:
-                        logger.warning(f"capture_array('main') hatası: {e2}")
-                        try:
-                            # Üçüncü yöntem: capture_image ve numpy dönüşümü
-                            logger.info("Alternatif görüntü alma yöntemi deneniyor (capture_image)...")
-                            import numpy as np
-                            from PIL import Image
-                            img = picam2.capture_image()
-                            frame = np.array(img)
-                        except Exception as e3:
-                            logger.error(f"Tüm görüntü alma yöntemleri başarısız: {e3}")
-                            time.sleep(1)
-                            continue
-
-                # Görüntü kontrolü
-                if frame is None or frame.size == 0:
-                    logger.warning("Boş kamera görüntüsü alındı, yeniden deneniyor...")
-                    time.sleep(0.5)
-                    continue
-
-                # Görüntü boyutunu kontrol et (debug için)
-                if frame_count % 100 == 0:
-                    logger.debug(f"Görüntü boyutu: {frame.shape}")
-
-            except Exception as e:
-                logger.error(f"Görüntü alma hatası: {e}")
-                time.sleep(1)
-                continue
-
-            # Kare sayacını artır
-            frame_count += 1
-
-            # Durum kontrolü
-            current_time = time.time()
-
-            # 1. Zemin geçidinde durma durumu
-            if is_at_crosswalk:
-                if current_time - crosswalk_start_time >= config.CROSSWALK_STOP_TIME:
-                    logger.info("Zemin geçidi geçiliyor...")
-                    is_at_crosswalk = False
-                    motors.forward(config.DEFAULT_SPEED)
-                else:
-                    # Zemin geçidinde bekle
-                    motors.stop()
-                    continue
-
-            # 2. Engelden kaçınma durumu
-            if avoiding_obstacle:
-                if current_time - obstacle_start_time >= config.OBSTACLE_AVOIDANCE_TIME:
-                    logger.info("Engelden kaçınma tamamlandı.")
-                    avoiding_obstacle = False
-                    motors.forward(config.DEFAULT_SPEED)
-                else:
-                    # Engelden kaçınma manevrası devam ediyor
-                    continue
-
-            # 3. Normal çalışma durumu - Engel kontrolü
-            has_obstacle, obstacle_position, obstacle_processed_frame = obstacle_detector.detect_obstacles(frame)
-
-            # Engel renk tespiti
-            if has_obstacle:
-                obstacle_color, color_confidence = obstacle_detector.detect_obstacle_color(frame)
-                logger.info(f"Engel tespit edildi: {obstacle_position}, Renk: {obstacle_color}, Güven: {color_confidence:.2f}")
-                avoidance_direction = obstacle_detector.get_avoidance_direction(obstacle_position)
-
-                # Engelden kaçınma manevrası başlat
-                logger.info(f"Engelden kaçınma yönü: {avoidance_direction}")
-                avoiding_obstacle = True
-                obstacle_start_time = current_time
-
-                if avoidance_direction == "left":
-                    motors.turn_left(config.TURN_SPEED)
-                elif avoidance_direction == "right":
-                    motors.turn_right(config.TURN_SPEED)
-                elif avoidance_direction == "backward_right":
-                    motors.backward(config.SLOW_SPEED)
-                    time.sleep(1)
-                    motors.turn_right(config.TURN_SPEED)
-                elif avoidance_direction == "backward_left":
-                    motors.backward(config.SLOW_SPEED)
-                    time.sleep(1)
-                    motors.turn_left(config.TURN_SPEED)
-
-                # Debug modunda görüntüyü kaydet
-                if debug_mode and frame_count % 10 == 0:
-                    cv2.imwrite(f"debug_images/obstacle_{frame_count}.jpg", obstacle_processed_frame)
-
-                continue
-
-            # 4. Normal çalışma durumu - Zemin geçidi kontrolü
-            is_crosswalk, crosswalk_confidence, crosswalk_processed_frame = line_detector.is_crosswalk(frame)
-
-            if is_crosswalk:
-                logger.info(f"Zemin geçidi tespit edildi! Güven: {crosswalk_confidence:.2f}")
-                is_at_crosswalk = True
-                crosswalk_start_time = current_time
-                motors.stop()
-
-                # Debug modunda görüntüyü kaydet
-                if debug_mode:
-                    cv2.imwrite(f"debug_images/crosswalk_{frame_count}.jpg", crosswalk_processed_frame)
-
-                continue
-
-            # 5. Normal çalışma durumu - Şerit takibi
-            line_position, line_processed_frame = line_detector.detect_line(frame)
-
-            # Şerit kontrolü
-            if line_position is not None:
-
-                # Şerit pozisyonuna göre hareket et
-                if abs(line_position) < config.LINE_POSITION_THRESHOLD:
-                    # Düz git
-                    motors.forward(config.DEFAULT_SPEED)
-                    if frame_count % 50 == 0:
-                        logger.debug(f"Düz gidiyor. Şerit pozisyonu: {line_position}")
-                elif line_position < 0:
-                    # Sola dön
-                    motors.curve_left(config.CURVE_SPEED)
-                    if frame_count % 20 == 0:
-                        logger.debug(f"Sola dönüyor. Şerit pozisyonu: {line_position}")
-                else:
-                    # Sağa dön
-                    motors.curve_right(config.CURVE_SPEED)
-                    if frame_count % 20 == 0:
-                        logger.debug(f"Sağa dönüyor. Şerit pozisyonu: {line_position}")
-            else:
-                # Şerit bulunamadı, son bilinen yöne devam et veya dur
-                logger.warning("Şerit bulunamadı!")
-                motors.stop()
-
-            # Debug modunda görüntüleri kaydet
-            if debug_mode and frame_count % 30 == 0:
-                cv2.imwrite(f"debug_images/line_{frame_count}.jpg", line_processed_frame)
-
-            # Döngü hızını kontrol et
-            time.sleep(0.05)
-
+        run_robot(capture, motors, line_detector, obstacle_detector,
+                  debug_writer=debug_writer, recorder=recorder, live_view=live_view, telemetry=telemetry)
     except KeyboardInterrupt:
         logger.info("Program kullanıcı tarafından durduruldu.")
     except Exception as e:
@@ -375,11 +731,42 @@ def main():
         except Exception as e:
             logger.error(f"Motor temizleme hatası: {e}")
 
+        if recorder is not None:
+            try:
+                recorder.finish_frame(motors)
+                recorder.close()
+            except Exception as e:
+                logger.error(f"Çalışma kaydı kapatma hatası: {e}")
+
+        if debug_writer is not None:
+            try:
+                debug_writer.stop()
+            except Exception as e:
+                logger.error(f"Debug görüntü yazıcısı durdurma hatası: {e}")
+
+        if telemetry is not None:
+            try:
+                telemetry.stop()
+            except Exception as e:
+                logger.error(f"Telemetri kaydı durdurma hatası: {e}")
+
+        if live_view is not None:
+            try:
+                live_view.stop()
+            except Exception as e:
+                logger.error(f"Canlı izleme durdurma hatası: {e}")
+
         try:
-            picam2.stop()
-            logger.info("Kamera durduruldu.")
+            capture.stop()
         except Exception as e:
-            logger.error(f"Kamera durdurma hatası: {e}")
+            logger.error(f"Kamera yakalama durdurma hatası: {e}")
+
+        if picam2 is not None:
+            try:
+                picam2.stop()
+                logger.info("Kamera durduruldu.")
+            except Exception as e:
+                logger.error(f"Kamera durdurma hatası: {e}")
 
         try:
             cv2.destroyAllWindows()
@@ -388,5 +775,8 @@ def main():
 
         logger.info("Program sonlandırıldı.")
 
+        # Asenkron log kuyruklarını boşalt
+        shutdown_logging(log_sinks)
+
 if __name__ == "__main__":
     main()
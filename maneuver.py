@@ -0,0 +1,155 @@
+"""
+Zamanlı manevra yürütücüsü - Engelden kaçınma gibi çok adımlı hareketleri bloklamadan çalıştırır
+Her adım bir motor komutu ve süreden oluşur; kontrol döngüsü her turda update() çağırır,
+böylece manevra sırasında algılama çalışmaya devam eder
+"""
+
+import time
+import config
+from loguru import logger
+
+class ManeuverSegment:
+    """
+    Manevranın tek bir adımı
+    """
+    __slots__ = ("action", "speed", "duration")
+
+    def __init__(self, action, speed, duration):
+        self.action = action        # MotorController metodu ("forward", "backward", "turn_left", ...)
+        self.speed = speed          # Motor hızı (0.0 - 1.0), "stop" için kullanılmaz
+        self.duration = duration    # Adım süresi (saniye)
+
+    def __repr__(self):
+        return f"ManeuverSegment({self.action!r}, {self.speed}, {self.duration})"
+
+def avoidance_maneuver(direction):
+    """
+    Kaçınma yönüne göre manevra adımlarını oluşturur
+
+    Toplam süre config.OBSTACLE_AVOIDANCE_TIME değerine eşittir; geri gitmeli manevralarda
+    geri gitme süresi dönüş süresinden düşülür.
+
+    Args:
+        direction: Kaçınma yönü ("left", "right", "backward_right", "backward_left")
+
+    Returns:
+        segments: ManeuverSegment listesi
+    """
+    total_time = config.OBSTACLE_AVOIDANCE_TIME
+    reverse_time = config.OBSTACLE_REVERSE_TIME
+
+    if direction == "left":
+        return [ManeuverSegment("turn_left", config.TURN_SPEED, total_time)]
+    elif direction == "backward_right":
+        return [ManeuverSegment("backward", config.SLOW_SPEED, reverse_time),
+                ManeuverSegment("turn_right", config.TURN_SPEED, total_time - reverse_time)]
+    elif direction == "backward_left":
+        return [ManeuverSegment("backward", config.SLOW_SPEED, reverse_time),
+                ManeuverSegment("turn_left", config.TURN_SPEED, total_time - reverse_time)]
+    else:
+        # "right" veya bilinmeyen yön için varsayılan olarak sağa dön
+        return [ManeuverSegment("turn_right", config.TURN_SPEED, total_time)]
+
+class ManeuverExecutor:
+    def __init__(self, motors):
+        """
+        Manevra yürütücüsü başlatıcı
+
+        Args:
+            motors: MotorController nesnesi
+        """
+        self.motors = motors
+        self.name = None
+        self.segments = []
+        self.segment_index = 0
+        self.segment_start_time = 0
+        self.start_time = 0
+
+    @property
+    def is_active(self):
+        """
+        Manevra devam ediyor mu?
+        """
+        return self.segment_index < len(self.segments)
+
+    @property
+    def is_last_segment(self):
+        """
+        Manevra son adımında mı?
+        """
+        return self.is_active and self.segment_index == len(self.segments) - 1
+
+    def segment_elapsed(self, now=None):
+        """
+        Devam eden adımın başlangıcından bu yana geçen süre (manevra yoksa 0)
+        """
+        if not self.is_active:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return now - self.segment_start_time
+
+    def start(self, segments, name="maneuver", now=None):
+        """
+        Yeni bir manevra başlatır (devam eden manevra varsa iptal edilir)
+
+        Args:
+            segments: ManeuverSegment listesi
+            name: Manevra adı (log için)
+            now: Başlangıç zamanı (verilmezse time.monotonic)
+        """
+        now = time.monotonic() if now is None else now
+        self.name = name
+        self.segments = list(segments)
+        self.segment_index = 0
+        self.start_time = now
+        self.segment_start_time = now
+
+        logger.info(f"Manevra başlatıldı: {name}, Adımlar: {[s.action for s in self.segments]}")
+        if self.segments:
+            self._apply(self.segments[0])
+
+    def update(self, now=None):
+        """
+        Süresi dolan adımları ilerletir ve gerekirse yeni motor komutunu uygular
+
+        Args:
+            now: Şimdiki zaman (verilmezse time.monotonic)
+
+        Returns:
+            is_active: Manevra hâlâ devam ediyorsa True
+        """
+        if not self.is_active:
+            return False
+
+        now = time.monotonic() if now is None else now
+
+        # Birden fazla adımın süresi dolmuş olabilir (uzun döngü periyodu)
+        while self.is_active and now - self.segment_start_time >= self.segments[self.segment_index].duration:
+            self.segment_start_time += self.segments[self.segment_index].duration
+            self.segment_index += 1
+            if self.is_active:
+                self._apply(self.segments[self.segment_index])
+
+        if not self.is_active:
+            logger.info(f"Manevra tamamlandı: {self.name} ({now - self.start_time:.2f} sn)")
+            return False
+
+        return True
+
+    def abort(self, reason=""):
+        """
+        Devam eden manevrayı sonlandırır (motor komutu verilmez)
+        """
+        if self.is_active:
+            logger.info(f"Manevra sonlandırıldı: {self.name} {reason}".rstrip())
+        self.segments = []
+        self.segment_index = 0
+
+    def _apply(self, segment):
+        """
+        Adımın motor komutunu uygular
+        """
+        if segment.action == "stop":
+            self.motors.stop()
+        else:
+            getattr(self.motors, segment.action)(segment.speed)
@@ -15,11 +15,10 @@ try:
     # gpiozero kütüphanesinden gerekli sınıfları içe aktar
     from gpiozero import Motor, PWMOutputDevice, Device
 
-    # RPi.GPIO pin fabrikasını içe aktar
-    from gpiozero.pins.rpigpio import RPiGPIOFactory
-
     # RPi.GPIO kütüphanesini içe aktar
     try:
+        # RPi.GPIO pin fabrikasını içe aktar (Raspberry Pi dışında bulunmaz, varsayılan/mock fabrika kullanılır)
+        from gpiozero.pins.rpigpio import RPiGPIOFactory
         import RPi.GPIO as GPIO
         GPIO.setwarnings(False)
 
@@ -161,7 +160,7 @@ class MotorController:
 
                 # Debug log
                 if left_speed > 0 or right_speed > 0:
-                    logger.debug(f"Motor hızları: Sol: {left_speed:.2f}, Sağ: {right_speed:.2f}")
+                    logger.debug("Motor hızları: Sol: {:.2f}, Sağ: {:.2f}", left_speed, right_speed)
             else:
                 logger.warning("Motor PWM nesneleri tanımlı değil")
         except Exception as e:
@@ -184,7 +183,7 @@ class MotorController:
             self.last_movement = "stop"
 
         if self.last_movement != "forward":
-            logger.debug(f"İleri hareket başlatılıyor. Hız: {speed}")
+            logger.debug("İleri hareket başlatılıyor. Hız: {}", speed)
             self.last_movement = "forward"
 
         try:
@@ -211,7 +210,7 @@ class MotorController:
             self.last_movement = "stop"
 
         if self.last_movement != "backward":
-            logger.debug(f"Geri hareket başlatılıyor. Hız: {speed}")
+            logger.debug("Geri hareket başlatılıyor. Hız: {}", speed)
             self.last_movement = "backward"
 
         try:
@@ -238,7 +237,7 @@ class MotorController:
             self.last_movement = "stop"
 
         if self.last_movement != "turn_left":
-            logger.debug(f"Sola dönüş başlatılıyor. Hız: {speed}")
+            logger.debug("Sola dönüş başlatılıyor. Hız: {}", speed)
             self.last_movement = "turn_left"
 
         try:
@@ -265,7 +264,7 @@ class MotorController:
             self.last_movement = "stop"
 
         if self.last_movement != "turn_right":
-            logger.debug(f"Sağa dönüş başlatılıyor. Hız: {speed}")
+            logger.debug("Sağa dönüş başlatılıyor. Hız: {}", speed)
             self.last_movement = "turn_right"
 
         try:
@@ -292,7 +291,7 @@ class MotorController:
             self.last_movement = "stop"
 
         if self.last_movement != "curve_left":
-            logger.debug(f"Sola kavis başlatılıyor. Hız: {speed}")
+            logger.debug("Sola kavis başlatılıyor. Hız: {}", speed)
             self.last_movement = "curve_left"
 
         try:
@@ -321,7 +320,7 @@ class MotorController:
             self.last_movement = "stop"
 
         if self.last_movement != "curve_right":
-            logger.debug(f"Sağa kavis başlatılıyor. Hız: {speed}")
+            logger.debug("Sağa kavis başlatılıyor. Hız: {}", speed)
             self.last_movement = "curve_right"
 
         try:
@@ -7,6 +7,11 @@ import time
 import config
 import numpy as np
 from loguru import logger
+from frame_context import FrameContext
+from color_lut import ColorLUT
+from buffer_pool import BufferPool
+from camera_model import CameraModel
+from lens_correction import get_lens_correction
 
 # OpenCV modülünü kontrol et ve içe aktar
 try:
@@ -17,6 +22,59 @@ except ImportError:
     logger.error("sudo apt install -y python3-opencv")
     OPENCV_AVAILABLE = False
 
+class ObstacleBlob:
+    """
+    Tek bir engel bölgesi (bağlı bileşen) bilgisi
+    """
+    __slots__ = ("color", "area", "bbox", "centroid", "position", "base", "distance", "lateral")
+
+    def __init__(self, color, area, bbox, centroid, position, base=None):
+        self.color = color          # Renk sınıfı ("orange", "yellow", ...)
+        self.area = area            # Alan (piksel)
+        self.bbox = bbox            # Sınırlayıcı kutu (x, y, w, h) - ROI koordinatlarında
+        self.centroid = centroid    # Ağırlık merkezi (x, y) - ROI koordinatlarında
+        self.position = position    # Bölge ("left", "center", "right")
+        self.base = base            # Alt satırın (zemine değen ön kenar) sol x, sağ x ve alt y - ROI koordinatlarında
+        self.distance = None        # Ön kenarın robot önündeki uzaklığı (cm)
+        self.lateral = None         # Ön kenarın yanal aralığı (sağ, sol) (cm, sol pozitif)
+
+    def __repr__(self):
+        return (f"ObstacleBlob(color={self.color!r}, area={self.area}, bbox={self.bbox}, "
+                f"centroid=({self.centroid[0]:.1f}, {self.centroid[1]:.1f}), position={self.position!r}, "
+                f"distance={self.distance})")
+
+class ObstacleResult:
+    """
+    Engel algılama sonucu
+
+    roi alanı kare bağlamındaki çalışma ölçeğindeki ROI'dir (sonraki kareye kadar geçerli).
+    Görselleştirme debug_overlay.render_obstacles ile, yalnızca istendiğinde yapılır.
+    """
+    __slots__ = ("blobs", "roi", "scale", "frame_width")
+
+    def __init__(self, blobs, roi=None, scale=1.0, frame_width=0):
+        self.blobs = blobs              # ObstacleBlob listesi (alana göre büyükten küçüğe)
+        self.roi = roi                  # Algılamanın yapıldığı BGR ROI (çalışma ölçeğinde)
+        self.scale = scale              # Çalışma ölçeği (blob koordinatları tam çözünürlükte)
+        self.frame_width = frame_width  # Ana görüntü genişliği (bölge sınırları için)
+
+    @property
+    def detected(self):
+        """
+        En az bir engel bulundu mu?
+        """
+        return len(self.blobs) > 0
+
+    @property
+    def position(self):
+        """
+        En büyük engelin bölgesi ("left", "center", "right") veya engel yoksa None
+        """
+        return self.blobs[0].position if self.blobs else None
+
+    def __repr__(self):
+        return f"ObstacleResult(blobs={len(self.blobs)}, position={self.position!r})"
+
 class ObstacleDetector:
     def __init__(self):
         """
@@ -31,124 +89,349 @@ class ObstacleDetector:
             return
 
         self.opencv_ok = True
-        self.frame_width = config.CAMERA_RESOLUTION[0]
-        self.frame_height = config.CAMERA_RESOLUTION[1]
 
-        # İlgi alanı (ROI) - görüntünün orta kısmı
-        self.roi_top = config.ROI_TOP_OFFSET
-        self.roi_bottom = self.frame_height // 2
+        # Piksel geometrisi (ROI, bölge sınırları, alan eşiği) gelen karenin boyutundan türetilir
+        self._frame_size = None
+        self._update_geometry(*config.CAMERA_RESOLUTION)
+        self.refinements = 0
 
         # Son tespit zamanı
         self.last_detection_time = time.time()
         self.last_obstacle_position = None
 
-        # Engel renk aralıkları
-        self.color_ranges = config.OBSTACLE_COLOR_RANGES
+        # Engel renk aralıkları - BGR'den renk sınıfına arama tablosu (aralıklar değişince yeniden üretilir)
+        self.color_ranges = None
+        self.color_lut = None
+        self._config_color_ranges = None
+        self._update_color_lut()
 
-        logger.info(f"Engel algılayıcı hazır. ROI: {self.roi_top}-{self.roi_bottom}, Renk aralıkları: {len(self.color_ranges)}")
+        # Gürültü azaltma çekirdeği (tam çözünürlükte 5x5) - piramit seviyesine göre önbellek
+        self.kernel = np.ones((5, 5), np.uint8)
+        self._kernels = {0: self.kernel}
 
-    def detect_obstacles(self, frame):
+        # Kare başına ara görüntüler için önceden ayrılan tamponlar (iyileştirme kırpıntıları ayrı havuzda)
+        self.buffers = BufferPool()
+        self.refine_buffers = BufferPool()
+
+        logger.info(f"Engel algılayıcı hazır. ROI: {self.roi_top}-{self.roi_bottom}, Renk aralıkları: {len(self.color_ranges)}, "
+                    f"Çalışma ölçeği: {config.OBSTACLE_DETECTION_SCALE}")
+
+    def _update_geometry(self, width, height):
         """
-        Görüntüden engelleri tespit eder - renk tabanlı tespit
+        Piksel geometrisini gerçek kare boyutundan türetir (boyut değişince yeniden hesaplanır)
 
         Args:
-            frame: Kameradan alınan görüntü
+            width, height: Ana görüntü boyutu
+        """
+        if self._frame_size == (width, height):
+            return
+        self._frame_size = (width, height)
+
+        reference_width, reference_height = config.CAMERA_RESOLUTION
+        self.frame_width = width
+        self.frame_height = height
+
+        # İlgi alanı (ROI) - görüntünün orta kısmı
+        self.roi_top = int(round(config.ROI_TOP_OFFSET * height / reference_height))
+        self.roi_bottom = height // 2
+
+        # Alan eşiği referans çözünürlükte tanımlıdır
+        self.min_area = config.OBSTACLE_MIN_AREA * (width / reference_width) * (height / reference_height)
+
+        # Görüntü -> zemin homografisi ilk kullanımda hesaplanır (lens kalibrasyonu sonradan yüklenebilir)
+        self._image_to_ground = None
+
+    def _ground_homography(self):
+        """
+        Kare boyutuna uygun görüntü -> zemin homografisi (X ileri, Y sola, cm)
+        """
+        if self._image_to_ground is None:
+            # ROI'ler lens kalibrasyonu varsa düzeltilmiştir, geometri kalibre edilmiş iç parametreleri kullanır
+            lens = get_lens_correction()
+            size = (self.frame_width, self.frame_height)
+            camera = CameraModel(resolution=size, camera_matrix=lens.camera_matrix_for(size) if lens is not None else None)
+            self._image_to_ground = np.linalg.inv(camera.ground_to_image_homography())
+        return self._image_to_ground
+
+    def _locate(self, blob):
+        """
+        Engelin zemine değen ön kenarından uzaklığını ve yanal aralığını hesaplar
+
+        Kutunun yan yüzü ve üstü zemin düzleminde değildir; yalnızca bölgenin en alt satırı
+        (ön yüzün zemine değdiği kenar) zemin homografisi ile doğru konuma dönüşür.
+        ROI alt sınırında kırpılan engelin uzaklığı ROI alt sınırının uzaklığı olarak görülür.
+        """
+        left, right, bottom = blob.base
+        row = self.roi_top + bottom
+        points = cv2.perspectiveTransform(np.array([[[left, row], [right, row]]], np.float64),
+                                          self._ground_homography())[0]
+        blob.distance = float(points[:, 0].mean())
+        blob.lateral = (float(points[1, 1]), float(points[0, 1]))
+
+    def blocks_path(self, blob):
+        """
+        Engel robotun yolunu kapatıyor mu?
+
+        Yalnızca yakındaki (config.OBSTACLE_AVOIDANCE_DISTANCE) ve robotun önündeki koridorla
+        (robot genişliği + config.OBSTACLE_PATH_MARGIN) örtüşen engeller kaçınma gerektirir;
+        uzaktaki veya yan şeritteki engeller şerit takibini kesmez.
+
+        Args:
+            blob: ObstacleBlob (detect_blobs sonucundan)
 
         Returns:
-            has_obstacle: Engel var mı?
-            obstacle_position: Engelin pozisyonu (sol, orta, sağ)
-            processed_frame: İşlenmiş görüntü (debug için)
+            blocks: Kaçınma manevrası gerekiyorsa True
         """
-        # OpenCV kullanılabilirliğini kontrol et
-        if not hasattr(self, 'opencv_ok') or not self.opencv_ok:
-            logger.warning("OpenCV kullanılamıyor. Engel tespiti yapılamadı.")
-            return False, None, None
+        if blob.distance is None:
+            return True
+        half_width = config.ROBOT_WIDTH / 2 + config.OBSTACLE_PATH_MARGIN
+        right, left = blob.lateral
+        return blob.distance <= config.OBSTACLE_AVOIDANCE_DISTANCE and right < half_width and left > -half_width
 
-        try:
-            # İlgi alanını (ROI) belirle - orta kısım
-            roi = frame[self.roi_top:self.roi_bottom, 0:self.frame_width]
+    def _kernel_for(self, level):
+        """
+        Piramit seviyesine uygun gürültü azaltma çekirdeği (tek kenarlı, en az 3x3)
+        """
+        kernel = self._kernels.get(level)
+        if kernel is None:
+            size = max(3, (5 >> level) | 1)
+            kernel = np.ones((size, size), np.uint8)
+            self._kernels[level] = kernel
+        return kernel
+
+    def set_color_ranges(self, color_ranges):
+        """
+        Engel renk aralıklarını ayarlar, aralıklar farklıysa renk sınıfı tablosunu yeniden üretir
+        (disk önbelleğinden). Sözlük yerinde değiştirildiyse de bu çağrı ile uygulanır.
+
+        Args:
+            color_ranges (dict): Renk adı -> (alt HSV, üst HSV) aralıkları
+        """
+        self.color_ranges = color_ranges
+        if self.color_lut is not None and self.color_lut.matches(color_ranges):
+            return
+        self.color_lut = ColorLUT(color_ranges)
+
+        # Renk sınıfları: 0 = renk yok, 1.. = color_ranges sırası
+        self.color_names = self.color_lut.names
+
+    def _update_color_lut(self):
+        """
+        config.OBSTACLE_COLOR_RANGES yeniden atandıysa aralıkları uygular (her karede yalnızca kimlik karşılaştırması)
+        """
+        color_ranges = config.OBSTACLE_COLOR_RANGES
+        if color_ranges is not self._config_color_ranges:
+            self._config_color_ranges = color_ranges
+            self.set_color_ranges(color_ranges)
 
-            # HSV renk uzayına dönüştür
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+    def _needs_refinement(self, blob):
+        """
+        Kaba ölçekteki sonucun karar sınırına yakın olup olmadığını kontrol eder
 
-            # Engel maskelerini oluştur
-            masks = {}
-            for color_name, (lower, upper) in self.color_ranges.items():
-                lower = np.array(lower)
-                upper = np.array(upper)
-                masks[color_name] = cv2.inRange(hsv, lower, upper)
+        Alan eşiğe yakınsa (engel sayılıp sayılmayacağı) veya merkez bir bölge sınırına
+        yakınsa (kaçınma yönü) tam çözünürlükte yeniden ölçülür.
+        """
+        margin = config.OBSTACLE_REFINE_MARGIN
+        if abs(blob.area / self.min_area - 1) < margin:
+            return True
+        third = self.frame_width / 3
+        boundary_distance = min(abs(blob.centroid[0] - third), abs(blob.centroid[0] - 2 * third))
+        return boundary_distance < margin * third / 2
+
+    def _refine_blob(self, ctx, blob, coarse_scale):
+        """
+        Engel bölgesini tam çözünürlükte, yalnızca sınırlayıcı kutusu çevresinde yeniden ölçer
 
-            # Tüm maskeleri birleştir
-            combined_mask = np.zeros_like(masks['orange'])
-            for mask in masks.values():
-                combined_mask = cv2.bitwise_or(combined_mask, mask)
+        Returns:
+            blob: Güncellenmiş ObstacleBlob veya bölge kaybolduysa None
+        """
+        x, y, w, h = blob.bbox
+        pad = int(2 / coarse_scale) + 2
+        roi = ctx.bgr_roi(self.roi_top, self.roi_bottom)
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(roi.shape[1], x + w + pad), min(roi.shape[0], y + h + pad)
+
+        buffers = self.refine_buffers
+        class_map = self.color_lut.classify(roi[y0:y1, x0:x1], buffers)
+        shape = class_map.shape
+        mask = buffers.get("refine_mask", shape)
+        filtered = buffers.get("refine_filtered", shape)
+        cv2.threshold(class_map, 0, 255, cv2.THRESH_BINARY, dst=mask)
+        cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel, dst=filtered)
+        cv2.morphologyEx(filtered, cv2.MORPH_CLOSE, self.kernel, dst=mask)
+
+        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
+            mask, labels=buffers.get("refine_labels", shape, np.int32), connectivity=8)
+        if num_labels < 2:
+            return None
+
+        # Kutudaki en büyük bileşen
+        label = int(np.argmax(stats[1:, cv2.CC_STAT_AREA])) + 1
+        self.refinements += 1
+        blob.area = int(stats[label, cv2.CC_STAT_AREA])
+        blob.bbox = (x0 + int(stats[label, cv2.CC_STAT_LEFT]), y0 + int(stats[label, cv2.CC_STAT_TOP]),
+                     int(stats[label, cv2.CC_STAT_WIDTH]), int(stats[label, cv2.CC_STAT_HEIGHT]))
+        blob.centroid = (x0 + float(centroids[label, 0]), y0 + float(centroids[label, 1]))
+        blob.position = self._position_for_x(blob.centroid[0])
+        left, right, bottom = self._base_row(labels, stats, label)
+        blob.base = (x0 + left, x0 + right, y0 + bottom)
+        return blob
+
+    @staticmethod
+    def _base_row(labels, stats, label):
+        """
+        Bileşenin en alt satırındaki piksellerin yatay aralığı
+
+        Returns:
+            left, right, bottom: Sol x, sağ x (son pikselin sağı) ve alt kenar y (son satırın altı)
+        """
+        x, width = int(stats[label, cv2.CC_STAT_LEFT]), int(stats[label, cv2.CC_STAT_WIDTH])
+        bottom = int(stats[label, cv2.CC_STAT_TOP] + stats[label, cv2.CC_STAT_HEIGHT])
+        columns = np.flatnonzero(labels[bottom - 1, x:x + width] == label)
+        return x + int(columns[0]), x + int(columns[-1]) + 1, bottom
 
-            # Gürültüyü azalt
-            kernel = np.ones((5, 5), np.uint8)
-            filtered_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_OPEN, kernel)
-            filtered_mask = cv2.morphologyEx(filtered_mask, cv2.MORPH_CLOSE, kernel)
+    def _position_for_x(self, x):
+        """
+        Yatay koordinata göre bölgeyi döndürür (sol, orta, sağ)
+        """
+        if x < self.frame_width // 3:
+            return "left"
+        elif x < 2 * self.frame_width // 3:
+            return "center"
+        return "right"
 
-            # Konturları bul
-            contours, _ = cv2.findContours(filtered_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    def detect_blobs(self, frame):
+        """
+        Engel bölgelerini tek geçişte tespit eder
 
-            # İşlenmiş görüntüyü hazırla (debug için)
-            processed_frame = roi.copy()
+        Her piksel renk sınıfı tablosuyla tek okumada sınıflanır (HSV dönüşümü yok), ardından
+        birleşik maske üzerinde tek bir bağlı bileşen etiketlemesi yapılır. Her bileşenin rengi, bileşen
+        içindeki sınıf piksellerinin çoğunluğuna göre belirlenir.
 
-            # Bölgeleri çiz
-            cv2.line(processed_frame, (self.frame_width//3, 0), (self.frame_width//3, self.roi_bottom - self.roi_top), (0, 0, 255), 2)
-            cv2.line(processed_frame, (2*self.frame_width//3, 0), (2*self.frame_width//3, self.roi_bottom - self.roi_top), (0, 0, 255), 2)
+        Algılama config.OBSTACLE_DETECTION_SCALE ölçeğindeki piramit seviyesinde yapılır;
+        alan, kutu ve merkez tam çözünürlüğe çevrilir. Karar sınırına yakın bölgeler tam
+        çözünürlükte yeniden ölçülür.
 
-            # Engel tespiti değişkenleri
-            has_obstacle = False
-            obstacle_position = None
-            obstacle_area = 0
-            obstacle_x = 0
+        Args:
+            frame: Kameradan alınan görüntü veya FrameContext
 
-            # Konturları değerlendir
-            for contour in contours:
-                area = cv2.contourArea(contour)
+        Returns:
+            result: ObstacleResult (blobs: ObstacleBlob listesi, alana göre büyükten küçüğe)
+        """
+        # OpenCV kullanılabilirliğini kontrol et
+        if not hasattr(self, 'opencv_ok') or not self.opencv_ok:
+            logger.warning("OpenCV kullanılamıyor. Engel tespiti yapılamadı.")
+            return ObstacleResult([])
+
+        try:
+            # İlgi alanını (ROI) belirle - orta kısım
+            ctx = FrameContext.wrap(frame)
+            self._update_geometry(ctx.width, ctx.height)
+            level = ctx.bgr_level_for(config.OBSTACLE_DETECTION_SCALE * config.CAMERA_RESOLUTION[0] / self.frame_width)
+            roi = ctx.bgr_roi(self.roi_top, self.roi_bottom, level)
+
+            # Çalışma ölçeği (ROI piramidi) - sonuçlar tam çözünürlüğe çevrilir
+            scale = roi.shape[0] / (self.roi_bottom - self.roi_top)
+            area_scale = scale * scale
+
+            # Renk sınıfı haritasını oluştur (BGR -> sınıf tablosu)
+            self._update_color_lut()
+            buffers = self.buffers
+            shape = roi.shape[:2]
+            class_map = self.color_lut.classify(roi, buffers)
+
+            # Birleşik maske ve gürültü azaltma (ara görüntüler havuzdaki tamponlara yazılır)
+            kernel = self._kernel_for(level)
+            combined_mask = buffers.get("obstacle_mask", shape)
+            filtered_mask = buffers.get("obstacle_filtered", shape)
+            cv2.threshold(class_map, 0, 255, cv2.THRESH_BINARY, dst=combined_mask)
+            cv2.morphologyEx(combined_mask, cv2.MORPH_OPEN, kernel, dst=filtered_mask)
+            cv2.morphologyEx(filtered_mask, cv2.MORPH_CLOSE, kernel, dst=combined_mask)
+
+            # Tek geçişte bağlı bileşen etiketleme
+            num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
+                combined_mask, labels=buffers.get("obstacle_labels", shape, np.int32), connectivity=8)
+
+            # Her bileşen için sınıf piksel sayıları (etiket x sınıf)
+            num_classes = len(self.color_names) + 1
+            label_classes = buffers.get("obstacle_label_classes", shape, np.intp)
+            classes = buffers.get("obstacle_classes", shape, np.intp)
+            np.copyto(label_classes, labels)
+            label_classes *= num_classes
+            np.copyto(classes, class_map)
+            label_classes += classes
+            class_counts = np.bincount(label_classes.ravel(), minlength=num_labels * num_classes
+                                       ).reshape(num_labels, num_classes)
+
+            # Kaba ölçekte eşiğin biraz altındaki bölgeler de iyileştirme adayıdır
+            min_area = self.min_area * (1 - config.OBSTACLE_REFINE_MARGIN if level > 0 else 1)
+
+            blobs = []
+            for label in range(1, num_labels):
+                area = int(stats[label, cv2.CC_STAT_AREA] / area_scale)
 
                 # Minimum alan kontrolü
-                if area < config.OBSTACLE_MIN_AREA:
+                if area < min_area:
                     continue
 
-                # Engel tespit edildi
-                has_obstacle = True
+                # Çoğunluk rengi (0 = renk yok sütunu hariç)
+                class_id = int(np.argmax(class_counts[label, 1:])) + 1
+                x = int(stats[label, cv2.CC_STAT_LEFT] / scale)
+                y = int(stats[label, cv2.CC_STAT_TOP] / scale)
+                w = int(round(stats[label, cv2.CC_STAT_WIDTH] / scale))
+                h = int(round(stats[label, cv2.CC_STAT_HEIGHT] / scale))
+                cx, cy = float(centroids[label, 0]) / scale, float(centroids[label, 1]) / scale
+                left, right, bottom = self._base_row(labels, stats, label)
+
+                blob = ObstacleBlob(self.color_names[class_id - 1], area, (x, y, w, h),
+                                    (cx, cy), self._position_for_x(cx),
+                                    (left / scale, right / scale, bottom / scale))
+
+                # Karar sınırına yakın kaba sonuçları tam çözünürlükte yeniden ölç
+                if level > 0 and self._needs_refinement(blob):
+                    blob = self._refine_blob(ctx, blob, scale)
+                    if blob is None:
+                        continue
+                if blob.area < self.min_area:
+                    continue
 
-                # Kontur etrafına dikdörtgen çiz
-                x, y, w, h = cv2.boundingRect(contour)
-                cv2.rectangle(processed_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                self._locate(blob)
+                blobs.append(blob)
 
-                # En büyük engeli takip et
-                if area > obstacle_area:
-                    obstacle_area = area
-                    obstacle_x = x + w // 2  # Engelin merkezi
+            blobs.sort(key=lambda blob: blob.area, reverse=True)
 
-            # Engel pozisyonunu belirle
-            if has_obstacle:
-                # Engelin hangi bölgede olduğunu belirle
-                if obstacle_x < self.frame_width // 3:
-                    obstacle_position = "left"
-                elif obstacle_x < 2 * self.frame_width // 3:
-                    obstacle_position = "center"
-                else:
-                    obstacle_position = "right"
+            return ObstacleResult(blobs, roi, scale, self.frame_width)
 
-                # Engel bilgilerini görüntüye ekle
-                cv2.putText(processed_frame, f"Obstacle: {obstacle_position}", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        except Exception as e:
+            logger.error(f"Engel tespiti sırasında hata: {e}")
+            return ObstacleResult([])
 
-                # Son tespit bilgilerini güncelle
-                self.last_detection_time = time.time()
-                self.last_obstacle_position = obstacle_position
+    def detect_obstacles(self, frame):
+        """
+        Görüntüden engelleri tespit eder - renk tabanlı tespit
 
-                logger.debug(f"Engel tespit edildi: {obstacle_position}, Alan: {obstacle_area}")
+        Args:
+            frame: Kameradan alınan görüntü veya FrameContext
 
-            return has_obstacle, obstacle_position, processed_frame
+        Returns:
+            result: ObstacleResult - detected (engel var mı?), position (en büyük engelin bölgesi)
+        """
+        result = self.detect_blobs(frame)
 
-        except Exception as e:
-            logger.error(f"Engel tespiti sırasında hata: {e}")
-            return False, None, None
+        if not result.detected:
+            return result
+
+        # En büyük engeli takip et
+        obstacle = result.blobs[0]
+        obstacle_position = obstacle.position
+
+        # Son tespit bilgilerini güncelle
+        self.last_detection_time = time.time()
+        self.last_obstacle_position = obstacle_position
+
+        logger.debug("Engel tespit edildi: {}, Alan: {}", obstacle_position, obstacle.area)
+
+        return result
 
     def get_avoidance_direction(self, obstacle_position):
         """
@@ -173,40 +456,29 @@ class ObstacleDetector:
             # Pozisyon bilinmiyorsa veya geçersizse, varsayılan olarak sağa dön
             return "right"
 
-    def detect_obstacle_color(self, frame):
+    def detect_obstacle_color(self, frame, blobs=None):
         """
         Engelin rengini tespit eder
 
         Args:
-            frame: Kameradan alınan görüntü
+            frame: Kameradan alınan görüntü veya FrameContext
+            blobs: detect_blobs sonucunun engel listesi (verilirse tespit tekrarlanmaz)
 
         Returns:
             color: Engelin rengi ("orange", "yellow", None)
             confidence: Tespit güven değeri (0.0 - 1.0)
         """
-        # İlgi alanını (ROI) belirle
-        roi = frame[self.roi_top:self.roi_bottom, 0:self.frame_width]
-
-        # HSV renk uzayına dönüştür
-        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        if blobs is None:
+            blobs = self.detect_blobs(frame).blobs
 
-        # Her renk için maske oluştur ve piksel sayısını hesapla
+        # Her renk için toplam piksel sayısı
         color_pixels = {}
-        for color_name, (lower, upper) in self.color_ranges.items():
-            lower = np.array(lower)
-            upper = np.array(upper)
-            mask = cv2.inRange(hsv, lower, upper)
-
-            # Gürültüyü azalt
-            kernel = np.ones((5, 5), np.uint8)
-            filtered_mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-
-            # Renk piksel sayısı
-            color_pixels[color_name] = np.sum(filtered_mask == 255)
+        for blob in blobs:
+            color_pixels[blob.color] = color_pixels.get(blob.color, 0) + blob.area
 
         # En çok piksele sahip rengi bul
         max_color = None
-        max_pixels = config.OBSTACLE_MIN_AREA  # Minimum piksel eşiği
+        max_pixels = self.min_area  # Minimum piksel eşiği
 
         for color, pixels in color_pixels.items():
             if pixels > max_pixels:
@@ -214,7 +486,7 @@ class ObstacleDetector:
                 max_color = color
 
         # Güven değeri hesapla
-        total_pixels = roi.shape[0] * roi.shape[1]
+        total_pixels = (self.roi_bottom - self.roi_top) * self.frame_width
         confidence = max_pixels / total_pixels if max_color else 0.0
 
         return max_color, confidence
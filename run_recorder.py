@@ -0,0 +1,203 @@
+"""
+Çalışma kaydedici - Ham kareleri ve kararları sonradan analiz için diske yazar
+Kareler önceden ayrılmış, bellek eşlemeli (memory-mapped) sabit boyutlu kayıtlara yazılır;
+her kare için zaman damgası, şerit pozisyonu, engel sonucu ve motor komutu ayrı bir dizinde tutulur
+"""
+
+import os
+import json
+import time
+import config
+import numpy as np
+from loguru import logger
+
+# Kod tabloları - dizinde metin yerine küçük tamsayılar saklanır
+POSITION_CODES = {None: 0, "left": 1, "center": 2, "right": 3}
+MOVEMENT_CODES = {"stop": 0, "forward": 1, "backward": 2, "turn_left": 3, "turn_right": 4,
+                  "curve_left": 5, "curve_right": 6}
+COLOR_CODES = {None: 0}
+COLOR_CODES.update({name: i + 1 for i, name in enumerate(config.OBSTACLE_COLOR_RANGES)})
+
+# Kare başına dizin kaydı
+INDEX_DTYPE = np.dtype([
+    ("timestamp", np.float64),      # Karenin alındığı zaman (time.monotonic)
+    ("frame_id", np.uint32),        # Yakalama sıra numarası
+    ("line_position", np.float32),  # Şerit pozisyonu (piksel, zemin görünümünde cm; bulunamadıysa NaN)
+    ("crosswalk", np.uint8),        # Zemin geçidi tespit edildi mi?
+    ("crosswalk_ratio", np.float32),
+    ("obstacle_count", np.uint8),
+    ("obstacle_position", np.uint8),  # POSITION_CODES
+    ("obstacle_color", np.uint8),     # COLOR_CODES
+    ("obstacle_area", np.uint32),
+    ("movement", np.uint8),           # MOVEMENT_CODES
+    ("left_speed", np.float32),
+    ("right_speed", np.float32),
+])
+
+class RunRecorder:
+    def __init__(self, directory=config.RUN_RECORD_DIR, max_frames=config.RUN_RECORD_MAX_FRAMES):
+        """
+        Çalışma kaydedici başlatıcı
+
+        Dosyalar ilk karede, karenin boyutu öğrenildiğinde oluşturulur.
+
+        Args:
+            directory (str): Kayıtların oluşturulacağı ana klasör
+            max_frames (int): Önceden ayrılacak kare kaydı sayısı
+        """
+        self.max_frames = max_frames
+        self.path = os.path.join(directory, time.strftime("run_%Y%m%d_%H%M%S"))
+
+        self.frames = None
+        self.index = None
+        self.count = 0
+        self._current = None
+        self._full_warned = False
+
+    def _open(self, frame):
+        """
+        Kare ve dizin dosyalarını önceden ayırarak oluşturur
+        """
+        os.makedirs(self.path, exist_ok=True)
+
+        # .npy formatı başlıkta boyut ve tip bilgisini taşır, np.load(mmap_mode="r") ile açılabilir
+        self.frames = np.lib.format.open_memmap(
+            os.path.join(self.path, "frames.npy"), mode="w+",
+            dtype=frame.dtype, shape=(self.max_frames,) + frame.shape
+        )
+        self.index = np.lib.format.open_memmap(
+            os.path.join(self.path, "index.npy"), mode="w+",
+            dtype=INDEX_DTYPE, shape=(self.max_frames,)
+        )
+
+        size_mb = self.frames.nbytes / (1024 * 1024)
+        logger.info(f"Çalışma kaydı başlatıldı: {self.path}, Kare: {frame.shape}, Kapasite: {self.max_frames} kare ({size_mb:.0f} MB)")
+
+    def begin_frame(self, frame, timestamp, frame_id):
+        """
+        Yeni bir kare kaydı başlatır - kare doğrudan eşlenmiş dosyaya kopyalanır
+
+        Args:
+            frame: Kaydedilecek görüntü (tüm kareler aynı boyutta olmalıdır)
+            timestamp: Karenin alındığı zaman
+            frame_id: Yakalama sıra numarası
+
+        Returns:
+            recorded: Kare kaydedildiyse True (kapasite dolduysa False)
+        """
+        if self.frames is None:
+            self._open(frame)
+
+        if self.count >= self.max_frames:
+            if not self._full_warned:
+                logger.warning(f"Çalışma kaydı kapasitesi doldu ({self.max_frames} kare), kayıt durduruldu")
+                self._full_warned = True
+            self._current = None
+            return False
+
+        self.frames[self.count] = frame
+
+        record = self.index[self.count]
+        record["timestamp"] = timestamp
+        record["frame_id"] = frame_id
+        record["line_position"] = np.nan
+
+        self._current = self.count
+        self.count += 1
+        return True
+
+    def set_line(self, line_position):
+        """
+        Geçerli kareye şerit pozisyonunu yazar
+        """
+        if self._current is None:
+            return
+        self.index[self._current]["line_position"] = np.nan if line_position is None else line_position
+
+    def set_crosswalk(self, is_crosswalk, ratio):
+        """
+        Geçerli kareye zemin geçidi sonucunu yazar
+        """
+        if self._current is None:
+            return
+        record = self.index[self._current]
+        record["crosswalk"] = bool(is_crosswalk)
+        record["crosswalk_ratio"] = ratio
+
+    def set_obstacles(self, blobs):
+        """
+        Geçerli kareye engel sonucunu yazar (en büyük engel)
+        """
+        if self._current is None:
+            return
+        record = self.index[self._current]
+        record["obstacle_count"] = min(len(blobs), 255)
+        if blobs:
+            record["obstacle_position"] = POSITION_CODES.get(blobs[0].position, 0)
+            record["obstacle_color"] = COLOR_CODES.get(blobs[0].color, 0)
+            record["obstacle_area"] = blobs[0].area
+
+    def finish_frame(self, motors):
+        """
+        Geçerli kareye bu kare için verilen motor komutunu yazar ve kaydı kapatır
+
+        Args:
+            motors: MotorController nesnesi
+        """
+        if self._current is None:
+            return
+        record = self.index[self._current]
+        record["movement"] = MOVEMENT_CODES.get(getattr(motors, "last_movement", "stop"), 0)
+        record["left_speed"] = getattr(motors, "last_left_speed", 0)
+        record["right_speed"] = getattr(motors, "last_right_speed", 0)
+        self._current = None
+
+    def close(self):
+        """
+        Dosyaları diske yazar ve kayıt bilgisini oluşturur
+        """
+        if self.frames is None:
+            return
+
+        self.frames.flush()
+        self.index.flush()
+
+        meta = {
+            "count": self.count,
+            "frame_shape": list(self.frames.shape[1:]),
+            "frame_dtype": str(self.frames.dtype),
+            "position_codes": {str(k): v for k, v in POSITION_CODES.items()},
+            "movement_codes": MOVEMENT_CODES,
+            "color_codes": {str(k): v for k, v in COLOR_CODES.items()},
+            "line_position_unit": "cm" if config.GROUND_VIEW_ENABLED else "px",
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        logger.info(f"Çalışma kaydı kapatıldı: {self.path}, {self.count} kare")
+        self.frames = None
+        self.index = None
+
+def load_recording(path):
+    """
+    Kaydedilmiş bir çalışmayı açar (kareler kopyalanmadan, bellek eşlemeli)
+
+    Args:
+        path (str): Kayıt klasörü
+
+    Returns:
+        frames: Kare dizisi (count, yükseklik, genişlik[, kanal])
+        index: Dizin kayıtları (INDEX_DTYPE)
+    """
+    frames = np.load(os.path.join(path, "frames.npy"), mmap_mode="r")
+    index = np.load(os.path.join(path, "index.npy"), mmap_mode="r")
+
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            count = json.load(f)["count"]
+    else:
+        # Düzgün kapatılmamış kayıt: zaman damgası yazılmış kayıtları say
+        count = int(np.count_nonzero(index["timestamp"]))
+
+    return frames[:count], index[:count]
@@ -0,0 +1,66 @@
+"""
+Sahne değişimi izleyicisi - Robot dururken ucuz kare farkı kontrolü
+Gri görüntünün küçük bir küçültülmüş hali referans kareyle karşılaştırılır
+"""
+
+import config
+from loguru import logger
+from frame_context import FrameContext
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    logger.error("OpenCV modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("sudo apt install -y python3-opencv")
+    OPENCV_AVAILABLE = False
+
+class SceneMonitor:
+    def __init__(self, threshold=config.IDLE_WAKE_THRESHOLD, thumbnail_size=(32, 24)):
+        """
+        Sahne değişimi izleyicisi başlatıcı
+
+        Args:
+            threshold (float): Uyanma eşiği - ortalama mutlak gri fark (0-255)
+            thumbnail_size (tuple): Karşılaştırma görüntüsünün boyutu (genişlik, yükseklik)
+        """
+        self.threshold = threshold
+        self.thumbnail_size = thumbnail_size
+        self._reference = None
+        self.last_difference = 0.0
+
+    def _thumbnail(self, frame):
+        """
+        Karenin küçük gri halini döndürür
+        """
+        ctx = FrameContext.wrap(frame)
+        return cv2.resize(ctx.gray, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+
+    def reset(self, frame):
+        """
+        Referans kareyi ayarlar
+
+        Args:
+            frame: Kameradan alınan görüntü veya FrameContext
+        """
+        self._reference = self._thumbnail(frame)
+        self.last_difference = 0.0
+
+    def has_changed(self, frame):
+        """
+        Kare referanstan belirgin şekilde farklı mı?
+
+        Args:
+            frame: Kameradan alınan görüntü veya FrameContext
+
+        Returns:
+            changed: Ortalama fark eşiği aşarsa True
+        """
+        thumbnail = self._thumbnail(frame)
+        if self._reference is None:
+            self._reference = thumbnail
+            return False
+
+        self.last_difference = float(cv2.absdiff(thumbnail, self._reference).mean())
+        return self.last_difference > self.threshold
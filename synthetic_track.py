@@ -0,0 +1,346 @@
+"""
+Sentetik pist üretici - config.py'deki fiziksel pist ölçülerinden kamera görüntüsü üretir
+Pist üstten görünüş haritası olarak çizilir, kamera görüntüsü robot pozundan
+zemin homografisi ile hesaplanır; engeller 3B kutu olarak izdüşürülür.
+Kamera gerektirmez, benchmark ve simülatör tarafından kullanılır.
+
+Dünya koordinatları (cm): harita ile aynı yönde (y aşağı). Yön açısı (heading) ileri
+vektörü (cos, sin) verir; sol normal (sin, -cos) yönündedir.
+"""
+
+import math
+import config
+import numpy as np
+from camera_model import CameraModel
+
+# OpenCV modülünü kontrol et ve içe aktar
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    OPENCV_AVAILABLE = False
+
+# Çizim ölçüleri (cm) - config.py'de olmayan, yalnızca görüntü üretimi için kullanılan değerler
+LINE_WIDTH_CM = 5            # Beyaz çizgi kalınlığı
+CROSSWALK_DEPTH_CM = 50      # Zemin geçidinin yol boyunca derinliği
+CROSSWALK_STRIPE_CM = 10     # Zemin geçidi şerit genişliği (şerit ve boşluk eşit)
+CENTERLINE_STEP_CM = 2.0     # Merkez çizgisi örnekleme aralığı
+
+# Renkler (BGR)
+FLOOR_COLOR = (20, 20, 20)
+LINE_COLOR = (235, 235, 235)
+BACKGROUND_COLOR = (45, 45, 45)
+
+def hsv_range_center_bgr(color_name):
+    """
+    config.OBSTACLE_COLOR_RANGES içindeki HSV aralığının ortasına karşılık gelen BGR rengi
+    """
+    lower, upper = config.OBSTACLE_COLOR_RANGES[color_name]
+    hsv = np.uint8([[[(lower[i] + upper[i]) // 2 for i in range(3)]]])
+    return tuple(int(c) for c in cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)[0, 0])
+
+def build_centerline(segments, start=(0.0, 0.0), start_heading=0.0, step=CENTERLINE_STEP_CM):
+    """
+    Düz ve yay parçalarından pist merkez çizgisini oluşturur
+
+    Args:
+        segments: [("straight", uzunluk), ("arc", yarıçap, açı_derece), ...]
+                  Yay açısı pozitifse sola, negatifse sağa döner.
+        start: Başlangıç noktası (cm)
+        start_heading: Başlangıç yönü (radyan)
+        step: Örnekleme aralığı (cm)
+
+    Returns:
+        points: (N, 2) merkez çizgisi noktaları
+        headings: (N,) her noktadaki yön (radyan)
+    """
+    x, y = start
+    heading = start_heading
+    points = [(x, y)]
+    headings = [heading]
+
+    for segment in segments:
+        if segment[0] == "straight":
+            length = segment[1]
+            turn_per_step = 0.0
+            steps = max(1, int(round(length / step)))
+            step_length = length / steps
+        else:
+            radius, angle = segment[1], math.radians(segment[2])
+            arc_length = abs(angle) * radius
+            steps = max(1, int(round(arc_length / step)))
+            step_length = arc_length / steps
+            # Sola dönüş yön açısını azaltır (sol normal = yön - 90°)
+            turn_per_step = -angle / steps
+
+        for _ in range(steps):
+            # Adımın ortasındaki yön ile ilerle (yayda daha doğru)
+            mid_heading = heading + turn_per_step / 2
+            x += step_length * math.cos(mid_heading)
+            y += step_length * math.sin(mid_heading)
+            heading += turn_per_step
+            points.append((x, y))
+            headings.append(heading)
+
+    return np.array(points), np.array(headings)
+
+class TrackObstacle:
+    """
+    Pist üzerindeki kutu şeklindeki engel
+    """
+    __slots__ = ("s", "lateral", "color", "size")
+
+    def __init__(self, s, lateral, color, size=None):
+        self.s = s                  # Merkez çizgisi boyunca konum (cm)
+        self.lateral = lateral      # Merkez çizgisine göre yanal konum (cm, sol pozitif)
+        self.color = color          # config.OBSTACLE_COLOR_RANGES anahtarı
+        self.size = size or config.OBSTACLE_SIZES[color]  # (genişlik, uzunluk, yükseklik)
+
+class TrackWorld:
+    def __init__(self, segments, crosswalks=(), obstacles=(), px_per_cm=2.0,
+                 camera=None, margin_cm=150):
+        """
+        Sentetik pist başlatıcı
+
+        Args:
+            segments: build_centerline için parça listesi
+            crosswalks: Zemin geçitlerinin merkez çizgisi boyunca başlangıç konumları (cm)
+            obstacles: TrackObstacle listesi
+            px_per_cm (float): Harita çözünürlüğü
+            camera: CameraModel (verilmezse config'den oluşturulur)
+            margin_cm (float): Harita kenar boşluğu
+        """
+        self.points, self.headings = build_centerline(segments)
+        deltas = np.linalg.norm(np.diff(self.points, axis=0), axis=1)
+        self.arc_length = np.concatenate([[0.0], np.cumsum(deltas)])
+        self.length = float(self.arc_length[-1])
+
+        self.crosswalks = list(crosswalks)
+        self.obstacles = list(obstacles)
+        self.px_per_cm = px_per_cm
+        self.camera = camera or CameraModel()
+        self._ground_to_image = self.camera.ground_to_image_homography()
+
+        # Harita sınırları
+        self.origin = self.points.min(axis=0) - margin_cm
+        extent = self.points.max(axis=0) + margin_cm - self.origin
+        self.map_size = (int(extent[0] * px_per_cm), int(extent[1] * px_per_cm))
+
+        self.map = self._draw_map()
+
+    # ------------------------------------------------------------------
+    # Geometri yardımcıları
+    # ------------------------------------------------------------------
+    def _index_at(self, s):
+        """
+        Yay uzunluğuna karşılık gelen merkez çizgisi indeksi
+        """
+        s = min(max(s, 0.0), self.length)
+        return min(int(np.searchsorted(self.arc_length, s)), len(self.points) - 1)
+
+    def pose_at(self, s, lateral=0.0, heading_offset=0.0):
+        """
+        Merkez çizgisi konumundan dünya pozunu hesaplar
+
+        Args:
+            s: Merkez çizgisi boyunca konum (cm)
+            lateral: Yanal kayma (cm, sol pozitif)
+            heading_offset: Yön sapması (radyan, sola pozitif)
+
+        Returns:
+            pose: (x, y, heading)
+        """
+        i = self._index_at(s)
+        heading = self.headings[i]
+        x = self.points[i, 0] + lateral * math.sin(heading)
+        y = self.points[i, 1] - lateral * math.cos(heading)
+        return x, y, heading - heading_offset
+
+    def _offset_polyline(self, lateral, start=0, end=None):
+        """
+        Merkez çizgisine paralel kaydırılmış çizgi (dünya cm)
+        """
+        points = self.points[start:end]
+        headings = self.headings[start:end]
+        return np.stack([points[:, 0] + lateral * np.sin(headings),
+                         points[:, 1] - lateral * np.cos(headings)], axis=1)
+
+    def _to_map(self, points):
+        """
+        Dünya koordinatlarını harita pikseline çevirir
+        """
+        return np.round((np.asarray(points) - self.origin) * self.px_per_cm).astype(np.int32)
+
+    def locate(self, x, y, hint=None, window=200):
+        """
+        Bir noktanın pist üzerindeki konumunu bulur
+
+        Args:
+            x, y: Dünya koordinatı (cm)
+            hint: Önceki merkez çizgisi indeksi (verilirse yalnızca çevresi aranır)
+            window: hint çevresinde aranacak nokta sayısı
+
+        Returns:
+            s: Merkez çizgisi boyunca konum (cm)
+            lateral: Yanal konum (cm, sol pozitif)
+            index: En yakın merkez çizgisi indeksi
+        """
+        if hint is None:
+            start, end = 0, len(self.points)
+        else:
+            start, end = max(0, hint - window), min(len(self.points), hint + window)
+
+        d = self.points[start:end] - (x, y)
+        i = start + int(np.argmin(np.einsum("ij,ij->i", d, d)))
+        heading = self.headings[i]
+        dx, dy = x - self.points[i, 0], y - self.points[i, 1]
+        lateral = dx * math.sin(heading) - dy * math.cos(heading)
+        return float(self.arc_length[i]), lateral, i
+
+    # ------------------------------------------------------------------
+    # Harita çizimi
+    # ------------------------------------------------------------------
+    def _draw_map(self):
+        """
+        Pistin üstten görünüş haritasını çizer
+        """
+        width, height = self.map_size
+        track_map = np.full((height, width, 3), FLOOR_COLOR, np.uint8)
+        thickness = max(1, int(LINE_WIDTH_CM * self.px_per_cm))
+        half_width = config.TRACK_WIDTH / 2 - LINE_WIDTH_CM / 2
+
+        # Kenar çizgileri (düz)
+        for lateral in (half_width, -half_width):
+            cv2.polylines(track_map, [self._to_map(self._offset_polyline(lateral))], False, LINE_COLOR, thickness)
+
+        # Orta çizgi (kesik): DASH_LENGTH dolu, DASH_GAP boş
+        period = config.DASH_LENGTH + config.DASH_GAP
+        on = (self.arc_length % period) < config.DASH_LENGTH
+        edges = np.flatnonzero(np.diff(on.astype(np.int8)))
+        starts = [0] if on[0] else []
+        starts += [e + 1 for e in edges if not on[e]]
+        for start in starts:
+            end = start
+            while end + 1 < len(on) and on[end + 1]:
+                end += 1
+            cv2.polylines(track_map, [self._to_map(self.points[start:end + 1])], False, LINE_COLOR, thickness)
+
+        # Zemin geçitleri: yol yönüne paralel şeritler
+        for s0 in self.crosswalks:
+            i0, i1 = self._index_at(s0), self._index_at(s0 + CROSSWALK_DEPTH_CM)
+            lateral = -config.TRACK_WIDTH / 2
+            while lateral < config.TRACK_WIDTH / 2:
+                right = self._offset_polyline(lateral, i0, i1 + 1)
+                left = self._offset_polyline(min(lateral + CROSSWALK_STRIPE_CM, config.TRACK_WIDTH / 2), i0, i1 + 1)
+                polygon = np.concatenate([right, left[::-1]])
+                cv2.fillPoly(track_map, [self._to_map(polygon)], LINE_COLOR)
+                lateral += 2 * CROSSWALK_STRIPE_CM
+
+        # Engellerin zemindeki izleri
+        for obstacle in self.obstacles:
+            corners = self._obstacle_corners(obstacle)[:4, :2]
+            cv2.fillConvexPoly(track_map, self._to_map(corners), hsv_range_center_bgr(obstacle.color))
+
+        return track_map
+
+    def _obstacle_corners(self, obstacle):
+        """
+        Engel kutusunun 8 köşesi (dünya x, y ve yükseklik z)
+        """
+        x, y, heading = self.pose_at(obstacle.s, obstacle.lateral)
+        width, length, height = obstacle.size
+        forward = np.array([math.cos(heading), math.sin(heading)])
+        left = np.array([math.sin(heading), -math.cos(heading)])
+        corners = []
+        for z in (0.0, height):
+            for a, b in ((1, 1), (1, -1), (-1, -1), (-1, 1)):
+                p = np.array([x, y]) + a * forward * length / 2 + b * left * width / 2
+                corners.append((p[0], p[1], z))
+        return np.array(corners)
+
+    # ------------------------------------------------------------------
+    # Kamera görüntüsü
+    # ------------------------------------------------------------------
+    def render_view(self, pose, noise_sigma=0.0, rng=None):
+        """
+        Robot pozundan kamera görüntüsünü üretir
+
+        Args:
+            pose: (x, y, heading) - kameranın zemindeki izdüşümü ve yönü
+            noise_sigma (float): Eklenecek Gauss gürültüsünün standart sapması
+            rng: numpy Generator (gürültü için)
+
+        Returns:
+            frame: BGR görüntü (config.CAMERA_RESOLUTION)
+        """
+        x, y, heading = pose
+        c, s = math.cos(heading), math.sin(heading)
+
+        # Robot zemini (X ileri, Y sol) -> harita pikseli
+        ppc = self.px_per_cm
+        robot_to_map = np.array([[ppc * c, ppc * s, ppc * (x - self.origin[0])],
+                                 [ppc * s, -ppc * c, ppc * (y - self.origin[1])],
+                                 [0, 0, 1]], dtype=np.float64)
+        map_to_image = self._ground_to_image @ np.linalg.inv(robot_to_map)
+
+        size = (self.camera.width, self.camera.height_px)
+        frame = cv2.warpPerspective(self.map, map_to_image, size, flags=cv2.INTER_LINEAR,
+                                    borderMode=cv2.BORDER_CONSTANT, borderValue=FLOOR_COLOR)
+
+        # Ufkun üstü zemin değildir
+        horizon = int(math.ceil(self.camera.horizon_row)) + 1
+        if horizon > 0:
+            frame[:min(horizon, frame.shape[0])] = BACKGROUND_COLOR
+
+        # Engeller: kutu köşelerini izdüşür ve dışbükey örtüyü boya
+        for obstacle in self.obstacles:
+            corners = self._obstacle_corners(obstacle)
+            dx, dy = corners[:, 0] - x, corners[:, 1] - y
+            robot_points = np.stack([dx * c + dy * s, dx * s - dy * c, corners[:, 2]], axis=1)
+            pixels, depth = self.camera.project_points(robot_points)
+            if np.any(depth < 5.0):
+                continue
+            hull = cv2.convexHull(np.round(pixels).astype(np.int32))
+            cv2.fillConvexPoly(frame, hull, hsv_range_center_bgr(obstacle.color))
+
+        if noise_sigma > 0:
+            rng = rng or np.random.default_rng()
+            noise = rng.normal(0, noise_sigma, frame.shape)
+            frame = np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+        return frame
+
+def straight_track(length=600, crosswalk_at=300, obstacle_at=450, obstacle_color="orange"):
+    """
+    Benchmark için düz pist: bir zemin geçidi ve sağ şeritte bir engel
+    """
+    lane_center = -config.TRACK_WIDTH / 4
+    obstacles = [TrackObstacle(obstacle_at, lane_center, obstacle_color)] if obstacle_at is not None else []
+    crosswalks = [crosswalk_at] if crosswalk_at is not None else []
+    return TrackWorld([("straight", length)], crosswalks=crosswalks, obstacles=obstacles)
+
+def competition_track():
+    """
+    Yarışma pistine benzer açık parkur: 90° virajlar, U dönüşü, kesik şeritler,
+    iki zemin geçidi, turuncu (sağ şeritte) ve sarı (sol şeritte) engeller
+    """
+    lane = config.TRACK_WIDTH / 4
+    segments = [
+        ("straight", 300),
+        ("arc", 90, -90),     # Sağa 90° viraj
+        ("straight", 250),
+        ("arc", 90, 90),      # Sola 90° viraj
+        ("straight", 150),
+        ("arc", 90, -180),    # Sağa U dönüşü
+        ("straight", 300),
+        ("arc", 90, -90),     # Sağa 90° viraj
+        ("straight", 200),
+    ]
+
+    # Parça başlangıçlarına göre konumlar
+    s_after_first_turn = 300 + math.pi / 2 * 90
+    s_after_u_turn = s_after_first_turn + 250 + math.pi / 2 * 90 + 150 + math.pi * 90
+    crosswalks = [180, s_after_u_turn + 120]
+    obstacles = [TrackObstacle(s_after_first_turn + 150, -lane, "orange"),
+                 TrackObstacle(s_after_u_turn + 240, lane, "yellow")]
+    return TrackWorld(segments, crosswalks=crosswalks, obstacles=obstacles)
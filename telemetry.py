@@ -0,0 +1,260 @@
+"""
+Telemetri kaydedici - Kare başına durum kayıtlarını halka tamponda toplar ve toplu olarak diske yazar
+Her döngü turu önceden ayrılmış NumPy yapılı dizisine (structured array) sabit boyutlu tek bir kayıt
+olarak yazılır (metin biçimlendirme ve G/Ç yok). Arka plan iş parçacığı biriken kayıtları belirli
+aralıklarla .npy parçaları halinde diske yazar; load_telemetry parçaları tek diziye birleştirir.
+"""
+
+import os
+import glob
+import json
+import time
+import threading
+import numpy as np
+import config
+from run_recorder import POSITION_CODES, MOVEMENT_CODES, COLOR_CODES
+from loguru import logger
+
+# Robot durumu kodları
+STATE_CODES = {"line_following": 0, "crosswalk": 1, "avoidance": 2}
+
+# Zemin geçidi bu turda kontrol edilmediyse crosswalk alanına yazılan değer
+CROSSWALK_NOT_CHECKED = -1
+
+# Kare başına telemetri kaydı (bulunamayan/ölçülmeyen ondalıklı değerler NaN)
+TELEMETRY_DTYPE = np.dtype([
+    ("timestamp", np.float64),        # Karenin alındığı zaman (time.monotonic)
+    ("frame_id", np.uint32),          # Yakalama sıra numarası
+    ("new_frame", np.uint8),          # Tur yeni bir kare ile mi çalıştı?
+    ("state", np.uint8),              # STATE_CODES
+    ("line_position", np.float32),    # Şerit pozisyonu (piksel, zemin görünümünde cm)
+    ("line_confidence", np.float32),
+    ("steer_position", np.float32),   # İleri bakış ile birleştirilmiş yönlendirme pozisyonu
+    ("crosswalk", np.int8),           # 1/0 veya CROSSWALK_NOT_CHECKED
+    ("crosswalk_ratio", np.float32),
+    ("obstacle_count", np.uint8),
+    ("obstacle_position", np.uint8),  # POSITION_CODES
+    ("obstacle_color", np.uint8),     # COLOR_CODES
+    ("obstacle_area", np.uint32),
+    ("movement", np.uint8),           # MOVEMENT_CODES
+    ("left_speed", np.float32),
+    ("right_speed", np.float32),
+    ("loop_time", np.float32),        # Turun işlem süresi (saniye, bekleme hariç)
+])
+
+NAN = float("nan")
+
+class TelemetryRecorder:
+    def __init__(self, directory=config.TELEMETRY_DIR, capacity=config.TELEMETRY_BUFFER_SIZE,
+                 flush_interval=config.TELEMETRY_FLUSH_INTERVAL):
+        """
+        Telemetri kaydedici başlatıcı
+
+        Args:
+            directory (str): Kayıtların oluşturulacağı ana klasör (her çalışma için alt klasör)
+            capacity (int): Halka tampondaki kayıt sayısı (diske yazılmamış en fazla kayıt)
+            flush_interval (float): Diske yazma aralığı (saniye) - tampon yarıya dolarsa daha erken
+        """
+        self.path = os.path.join(directory, time.strftime("run_%Y%m%d_%H%M%S"))
+        self.capacity = max(2, int(capacity))
+        self.flush_interval = flush_interval
+
+        # Halka tampon: kayıt i, _ring[i % capacity] konumunda
+        self._ring = np.zeros(self.capacity, TELEMETRY_DTYPE)
+        self._written = 0   # Döngünün yazdığı toplam kayıt (yalnızca döngü değiştirir)
+        self._flushed = 0   # Diske yazılan toplam kayıt (yalnızca yazıcı değiştirir)
+        self._flush_threshold = self.capacity // 2
+
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        # Sayaçlar
+        self.chunks_written = 0
+        self.records_dropped = 0
+        self.write_errors = 0
+
+    def start(self):
+        """
+        Kayıt klasörünü oluşturur ve yazıcı iş parçacığını başlatır
+        """
+        if self._running:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        self._write_meta()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+        logger.info(f"Telemetri kaydı başlatıldı: {self.path}, Tampon: {self.capacity} kayıt "
+                    f"({self._ring.nbytes / 1024:.0f} KB), Yazma aralığı: {self.flush_interval} s")
+
+    def stop(self, timeout=2.0):
+        """
+        Kalan kayıtları diske yazar ve iş parçacığını durdurur
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        self._write_meta()
+        logger.info(f"Telemetri kaydı durduruldu: {self.path}, {self.format_stats()}")
+
+    def record(self, timestamp, frame_id, new_frame, state, line=None, obstacles=None, crosswalk=None,
+               steer_position=None, motors=None, loop_time=NAN):
+        """
+        Bir turun kaydını halka tampona yazar (biçimlendirme ve G/Ç yok, beklemeden döner)
+
+        Args:
+            timestamp: Karenin alındığı zaman
+            frame_id: Yakalama sıra numarası
+            new_frame (bool): Tur yeni bir kare ile mi çalıştı?
+            state (str): Robot durumu (STATE_CODES anahtarı)
+            line: LineResult (bu turda şerit algılanmadıysa None)
+            obstacles: ObstacleResult (bu turda engel algılanmadıysa None)
+            crosswalk: CrosswalkResult (bu turda zemin geçidi kontrol edilmediyse None)
+            steer_position: Yönlendirme pozisyonu (None ise NaN)
+            motors: MotorController (son hareket ve hızlar için)
+            loop_time (float): Turun işlem süresi (saniye)
+        """
+        written = self._written
+        if written - self._flushed >= self.capacity:
+            # Yazıcı yetişemedi: diske yazılmamış kayıtların üzerine yazılmaz
+            self.records_dropped += 1
+            return
+
+        if line is not None:
+            line_position = NAN if line.position is None else line.position
+            line_confidence = line.confidence
+        else:
+            line_position = line_confidence = NAN
+
+        if obstacles is not None and obstacles.blobs:
+            blob = obstacles.blobs[0]
+            obstacle = (len(obstacles.blobs), POSITION_CODES.get(blob.position, 0),
+                        COLOR_CODES.get(blob.color, 0), blob.area)
+        else:
+            obstacle = (0, 0, 0, 0)
+
+        if crosswalk is not None:
+            crosswalk_flag, crosswalk_ratio = int(crosswalk.detected), crosswalk.ratio
+        else:
+            crosswalk_flag, crosswalk_ratio = CROSSWALK_NOT_CHECKED, NAN
+
+        if motors is not None:
+            movement = (MOVEMENT_CODES.get(motors.last_movement, 0), motors.last_left_speed, motors.last_right_speed)
+        else:
+            movement = (0, 0, 0)
+
+        # Tek atamada tüm alanlar (alan alan atamadan çok daha ucuz)
+        self._ring[written % self.capacity] = (
+            timestamp, frame_id, new_frame, STATE_CODES.get(state, 0),
+            line_position, line_confidence, NAN if steer_position is None else steer_position,
+            crosswalk_flag, crosswalk_ratio, min(obstacle[0], 255), obstacle[1], obstacle[2], obstacle[3],
+            movement[0], movement[1], movement[2], loop_time,
+        )
+        self._written = written + 1
+
+        # Tampon yarıya dolduysa yazıcıyı erken uyandır (her kayıtta kilit alınmaz)
+        if written + 1 - self._flushed == self._flush_threshold:
+            with self._condition:
+                self._condition.notify()
+
+    def _flush_loop(self):
+        """
+        Yazıcı iş parçacığı: biriken kayıtları aralıklarla veya tampon yarıya dolunca yazar
+        """
+        while True:
+            with self._condition:
+                if self._running:
+                    self._condition.wait(self.flush_interval)
+                running = self._running
+            self._flush()
+            if not running:
+                return
+
+    def _flush(self):
+        """
+        Diske yazılmamış kayıtları tek bir .npy parçası olarak yazar
+        """
+        written = self._written
+        start = self._flushed
+        if written == start:
+            return
+
+        # Halka sonunda bölünen aralık iki parça halinde kopyalanır
+        first, last = start % self.capacity, written % self.capacity
+        if first < last:
+            chunk = self._ring[first:last].copy()
+        else:
+            chunk = np.concatenate((self._ring[first:], self._ring[:last]))
+
+        path = os.path.join(self.path, f"chunk_{self.chunks_written:05d}.npy")
+        try:
+            # Önce geçici dosyaya yazılır, yarım kalan parça okunmaz
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                np.save(f, chunk)
+            os.replace(temp_path, path)
+            self.chunks_written += 1
+        except OSError as e:
+            self.write_errors += 1
+            logger.error(f"Telemetri parçası yazılamadı ({path}): {e}")
+
+        # Yazılamasa da kayıtlar bırakılır, döngü durmaz
+        self._flushed = written
+
+    def _write_meta(self):
+        """
+        Kod tablolarını ve kayıt sayılarını meta.json dosyasına yazar
+        """
+        meta = {
+            "count": self._flushed,
+            "dropped": self.records_dropped,
+            "chunks": self.chunks_written,
+            "state_codes": STATE_CODES,
+            "position_codes": {str(k): v for k, v in POSITION_CODES.items()},
+            "movement_codes": MOVEMENT_CODES,
+            "color_codes": {str(k): v for k, v in COLOR_CODES.items()},
+            "crosswalk_not_checked": CROSSWALK_NOT_CHECKED,
+        }
+        try:
+            with open(os.path.join(self.path, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2)
+        except OSError as e:
+            logger.error(f"Telemetri bilgi dosyası yazılamadı: {e}")
+
+    def format_stats(self):
+        """
+        Kaydedici istatistiklerini okunabilir metin olarak döndürür
+        """
+        return (f"Kayıt: {self._written}, Yazılan: {self._flushed}, Parça: {self.chunks_written}, "
+                f"Atlanan: {self.records_dropped}, Hata: {self.write_errors}")
+
+def load_telemetry(path):
+    """
+    Bir çalışmanın telemetri parçalarını sırayla okuyup tek diziye birleştirir
+
+    Args:
+        path (str): Telemetri klasörü (ör. telemetry/run_20240101_120000)
+
+    Returns:
+        records: TELEMETRY_DTYPE yapılı dizi (parça yoksa boş)
+        meta: Kod tabloları ve sayaçlar (meta.json yoksa boş sözlük)
+    """
+    chunks = [np.load(chunk_path) for chunk_path in sorted(glob.glob(os.path.join(path, "chunk_*.npy")))]
+    records = np.concatenate(chunks) if chunks else np.zeros(0, TELEMETRY_DTYPE)
+
+    meta = {}
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    return records, meta
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Bellek ayırma testi - Kararlı durumda kare başına bellek ayırmalarını tracemalloc ile ölçer
+Algılayıcılar ara görüntülerini önceden ayrılmış tamponlara yazdığından (BufferPool), ısınma
+sonrasında her aşamanın kare başına ayırdığı bellek yalnızca küçük Python nesneleri olmalıdır.
+Her aşamanın çağrı içindeki en yüksek geçici ayırması sınırı aşarsa çıkış kodu 1 olur.
+
+Kullanım:
+    python3 test_allocations.py
+    python3 test_allocations.py --frames 200 --max-bytes 16384
+"""
+
+import sys
+import argparse
+import tracemalloc
+import numpy as np
+from loguru import logger
+
+# Loglama ayarları - algılayıcıların logları ölçümü etkilemesin
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+from frame_context import FrameContext
+from line_detector import LineDetector
+from obstacle_detector import ObstacleDetector
+from buffer_pool import BufferPool
+from benchmark_vision import generate_frames
+
+def log(message):
+    print(f"[ALLOC] {message}")
+
+def build_stages(line_detector, obstacle_detector):
+    """
+    Ana döngüdeki sırayla ölçülecek aşamalar: (ad, fonksiyon(ctx))
+    """
+    return [
+        ("preprocess", lambda ctx: ctx.gray),
+        ("detect_obstacles", obstacle_detector.detect_obstacles),
+        ("detect_obstacle_color", obstacle_detector.detect_obstacle_color),
+        ("is_crosswalk", line_detector.is_crosswalk),
+        ("detect_line", line_detector.detect_line),
+        ("fit_lane_model", line_detector.fit_lane_model),
+    ]
+
+def measure(frames, stages, frame_buffers, warmup, count):
+    """
+    Aşamaları kareler üzerinde çalıştırır, ısınma sonrası her çağrının ayırmalarını ölçer
+
+    Returns:
+        results: ad -> (geçici en yüksek ayırma dizisi, kalıcı ayırma dizisi) - bayt
+    """
+    peaks = {name: [] for name, _ in stages}
+    retained = {name: [] for name, _ in stages}
+
+    for i in range(warmup + count):
+        frame = frames[i % len(frames)]
+        ctx = FrameContext(frame, buffers=frame_buffers)
+        for name, function in stages:
+            if i < warmup:
+                function(ctx)
+                continue
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            function(ctx)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks[name].append(peak - before)
+            retained[name].append(current - before)
+
+    return {name: (np.array(peaks[name]), np.array(retained[name])) for name, _ in stages}
+
+def report(title, results):
+    log(title)
+    for name, (peaks, retained) in results.items():
+        log(f"  {name:<22} geçici: ort {peaks.mean() / 1024:8.1f} KB, maks {peaks.max() / 1024:8.1f} KB | "
+            f"kalıcı: ort {retained.mean():8.0f} B")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kare başına bellek ayırma testi (tracemalloc)")
+    parser.add_argument("--frames", type=int, default=100, help="Ölçülen kare sayısı")
+    parser.add_argument("--warmup", type=int, default=20, help="Tamponların ayrıldığı ısınma karesi sayısı")
+    parser.add_argument("--max-bytes", type=int, default=16 * 1024,
+                        help="Aşama başına izin verilen en yüksek geçici ayırma (bayt)")
+    args = parser.parse_args()
+
+    log("Sentetik kareler üretiliyor...")
+    frames = generate_frames(16)
+
+    tracemalloc.start()
+
+    # Karşılaştırma: kare tamponu olmadan (her kare gri/piramit/ROI yeniden ayrılır)
+    line_detector, obstacle_detector = LineDetector(), ObstacleDetector()
+    results = measure(frames, build_stages(line_detector, obstacle_detector), None, args.warmup, args.frames)
+    report("Kare tamponu yok (karşılaştırma):", results)
+
+    # Ana döngüdeki gibi uzun ömürlü kare tamponu
+    line_detector, obstacle_detector = LineDetector(), ObstacleDetector()
+    frame_buffers = BufferPool()
+    results = measure(frames, build_stages(line_detector, obstacle_detector), frame_buffers, args.warmup, args.frames)
+    report("Kare tamponu ile (ana döngü):", results)
+    log(f"Tamponlar: kare {frame_buffers.format_stats()}, şerit {line_detector.buffers.format_stats()}, "
+        f"engel {obstacle_detector.buffers.format_stats()}")
+
+    tracemalloc.stop()
+
+    failed = [name for name, (peaks, _) in results.items() if peaks.max() > args.max_bytes]
+    if failed:
+        log(f"BAŞARISIZ: sınırı ({args.max_bytes} B) aşan aşamalar: {', '.join(failed)}")
+        return 1
+    log(f"BAŞARILI: tüm aşamalar kare başına {args.max_bytes} B sınırının altında")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
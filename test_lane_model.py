@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Şerit modeli testi - Kesik şerit boşluklarında ileri bakış modelinin dışkestirim yapmadığını kontrol eder
+Sentetik düz pistte robot farklı yanal kaymalarla ilerletilir. Üretilen her modelin ileri bakış
+sapması gerçek şerit konumuna yakın, yönü makul olmalıdır; bantlar ileri bakış mesafesine
+ulaşmıyorsa model üretilmemelidir (None). Aykırı model varsa çıkış kodu 1 olur.
+
+Kullanım:
+    python3 test_lane_model.py
+    python3 test_lane_model.py --step 2.5 --tolerance 8
+"""
+
+import sys
+import math
+import argparse
+import numpy as np
+from loguru import logger
+
+# Loglama ayarları - algılayıcı logları çıktıyı kalabalıklaştırmasın
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+import config
+from line_detector import LineDetector
+from synthetic_track import straight_track
+
+# Zemin geçidi şeritleri şerit modeli için gürültüdür (geçit ayrıca algılanır), bu aralık atlanır
+CROSSWALK_AT = 300
+CROSSWALK_SKIP = (CROSSWALK_AT - 70, CROSSWALK_AT + 40)
+
+def log(message):
+    print(f"[LANE] {message}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kesik şeritte şerit modeli dışkestirim testi")
+    parser.add_argument("--step", type=float, default=2.5, help="Pist boyunca örnekleme adımı (cm)")
+    parser.add_argument("--tolerance", type=float, default=8.0, help="İzin verilen ileri bakış sapma hatası (cm)")
+    parser.add_argument("--min-coverage", type=float, default=0.3,
+                        help="Model üretilmesi gereken en düşük kare oranı")
+    args = parser.parse_args()
+
+    world = straight_track(crosswalk_at=CROSSWALK_AT, obstacle_at=None)
+    positions = [s for s in np.arange(20, world.length - 80, args.step)
+                 if not CROSSWALK_SKIP[0] <= s <= CROSSWALK_SKIP[1]]
+    max_heading = math.radians(config.LANE_MODEL_MAX_HEADING)
+
+    failures = []
+    total = produced = 0
+    for lateral in (-15.0, 0.0, 15.0):
+        for s in positions:
+            # Her kare bağımsız: önceki karelerin durumu modeli etkilemesin
+            lane = LineDetector().fit_lane_model(world.render_view(world.pose_at(s, lateral)))
+            total += 1
+            if lane is None:
+                continue
+            produced += 1
+
+            # Düz pistte şerit ileri bakış mesafesinde de yanal kayma kadar yanda olmalı
+            error = abs(lane.offset - lateral)
+            if error > args.tolerance or abs(lane.heading) > max_heading:
+                failures.append((s, lateral, lane, error))
+
+    coverage = produced / max(total, 1)
+    log(f"Kare: {total}, Model: {produced} (%{coverage * 100:.0f}), Aykırı: {len(failures)}")
+    for s, lateral, lane, error in failures[:20]:
+        log(f"  s={s:.1f} cm, kayma={lateral:+.0f} cm: {lane} (hata {error:.1f} cm)")
+
+    if failures:
+        log(f"BAŞARISIZ: {len(failures)} modelin ileri bakış hatası {args.tolerance} cm'den büyük veya yönü makul değil")
+        return 1
+    if coverage < args.min_coverage:
+        log(f"BAŞARISIZ: model üretilen kare oranı çok düşük (%{coverage * 100:.0f})")
+        return 1
+    log("BAŞARILI: kesik şerit boşluklarında dışkestirim yok")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
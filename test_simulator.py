@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Simülatör duman testi - Kontrol döngüsünün düz pisti baştan sona tamamladığını kontrol eder
+Düz pistte zemin geçidi ve sağ şeritte engel vardır. Robot geçitte durup devam etmeli, yanından
+geçtiği engel için kaçınma manevrasına girmeden (engel yolu kapatmıyor) bitiş çizgisine
+ulaşmalıdır. Erken kaçınma veya manevra döngüsü gibi gerilemelerde robot takılır ve
+çıkış kodu 1 olur.
+
+Kullanım:
+    python3 test_simulator.py
+    python3 test_simulator.py --runs 4 --compute-scale 3
+"""
+
+import sys
+import argparse
+from loguru import logger
+
+# Loglama ayarları - kontrol döngüsü logları çıktıyı kalabalıklaştırmasın
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+from synthetic_track import straight_track
+from track_simulator import TrackSimulator, GPIOZERO_AVAILABLE
+
+def log(message):
+    print(f"[SIMTEST] {message}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Düz pistte kapalı döngü simülasyon duman testi")
+    parser.add_argument("--runs", type=int, default=2, help="Farklı gürültü tohumlarıyla çalıştırma sayısı")
+    parser.add_argument("--compute-scale", type=float, default=1.0,
+                        help="İşlem süresi çarpanı (hedef donanım bu makineden kaç kat yavaş)")
+    parser.add_argument("--max-time", type=float, default=40.0, help="Süre sınırı (simüle saniye)")
+    args = parser.parse_args()
+
+    if not GPIOZERO_AVAILABLE:
+        return 1
+
+    failures = []
+    for seed in range(args.runs):
+        simulator = TrackSimulator(straight_track(), max_time=args.max_time,
+                                   compute_scale=args.compute_scale, seed=seed)
+        report = simulator.run()
+        log(f"Tohum {seed}: {report['result']}, Tur süresi: {report['lap_time_s']} s, "
+            f"Mesafe: {report['distance_cm']:.0f}/{report['finish_cm']:.0f} cm, Çarpışma: {len(report['collisions'])}")
+
+        if report["result"] != "finished" or report["collisions"]:
+            failures.append(seed)
+
+    if failures:
+        log(f"BAŞARISIZ: {len(failures)}/{args.runs} çalıştırmada robot bitişe çarpışmasız ulaşamadı (tohum: {failures})")
+        return 1
+    log("BAŞARILI: düz pist çarpışmasız tamamlandı")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
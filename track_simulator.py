@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Kapalı döngü pist simülatörü - main.run_robot kontrol döngüsünü kamera ve robot olmadan sürer
+Kareler synthetic_track ile robotun o anki pozundan üretilir, motor komutları gerçek
+MotorController üzerinden gpiozero'nun sahte (mock) pin fabrikasına yazılır ve pin
+değerleri diferansiyel sürüş modeli ile robotun pozunu hareket ettirir.
+
+Zaman simüle edilir: bekleme (sleep) anında geçer, yalnızca kontrol kodunun gerçek işlem
+süresi simülasyon saatine eklenir. Böylece simülasyon gerçek zamandan hızlı çalışır ve
+tur süresi, şerit sapması ve döngü gecikmesi raporlanır.
+
+Kullanım:
+    python3 track_simulator.py
+    python3 track_simulator.py --track straight --max-time 30 --output sim_result.json
+"""
+
+import sys
+import math
+import json
+import time
+import argparse
+import config
+import numpy as np
+from loguru import logger
+
+# Loglama ayarları - simülasyon raporunu kontrol döngüsü logları bastırmasın
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+import cv2
+from frame_context import FrameContext
+from frame_source import FrameSource
+from lens_correction import set_lens_correction
+from latency_profiler import LatencyProfiler
+from synthetic_track import competition_track, straight_track
+
+# gpiozero modülünü kontrol et ve içe aktar (sahte pin fabrikası için)
+try:
+    from gpiozero import Device
+    from gpiozero.pins.mock import MockFactory, MockPWMPin
+    GPIOZERO_AVAILABLE = True
+except ImportError:
+    logger.error("gpiozero modülü bulunamadı! Lütfen şu komutu çalıştırın:")
+    logger.error("pip install gpiozero")
+    GPIOZERO_AVAILABLE = False
+
+def log(message):
+    print(f"[SIM] {message}")
+
+class SimulatedClock:
+    def __init__(self, start=1000.0):
+        """
+        Simülasyon saati başlatıcı
+
+        time modülünün kontrol döngüsünde kullanılan fonksiyonlarını taklit eder;
+        sleep() beklemez, saati ilerletir ve dinleyicileri (fizik modeli) çağırır.
+
+        Args:
+            start (float): Başlangıç zamanı (saniye)
+        """
+        self.now = start
+        self.start = start
+        self._epoch = time.time() - start
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """
+        Saat ilerlediğinde callback(dt) çağrılır
+        """
+        self._listeners.append(callback)
+
+    def advance(self, seconds):
+        """
+        Saati ilerletir
+        """
+        if seconds <= 0:
+            return
+        self.now += seconds
+        for callback in self._listeners:
+            callback(seconds)
+
+    @property
+    def elapsed(self):
+        return self.now - self.start
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return self._epoch + self.now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def __getattr__(self, name):
+        # strftime vb. diğer fonksiyonlar gerçek time modülünden
+        return getattr(time, name)
+
+class DifferentialDriveModel:
+    def __init__(self, pose, max_wheel_speed=config.SIM_MAX_WHEEL_SPEED,
+                 wheel_base=config.SIM_WHEEL_BASE, time_constant=config.SIM_MOTOR_TIME_CONSTANT):
+        """
+        Diferansiyel sürüş modeli başlatıcı
+
+        Args:
+            pose: Başlangıç pozu (x, y, heading) - synthetic_track dünya koordinatları
+            max_wheel_speed (float): Tam PWM'de tekerlek hızı (cm/s)
+            wheel_base (float): Tekerlekler arası mesafe (cm)
+            time_constant (float): Motor tepki zaman sabiti (saniye)
+        """
+        self.x, self.y, self.heading = pose
+        self.max_wheel_speed = max_wheel_speed
+        self.wheel_base = wheel_base
+        self.time_constant = time_constant
+        self.left_velocity = 0.0
+        self.right_velocity = 0.0
+
+    @property
+    def pose(self):
+        return self.x, self.y, self.heading
+
+    @property
+    def speed(self):
+        return (self.left_velocity + self.right_velocity) / 2
+
+    def step(self, dt, left_command, right_command):
+        """
+        Modeli dt kadar ilerletir
+
+        Args:
+            dt (float): Adım süresi (saniye)
+            left_command, right_command (float): Tekerlek komutu (-1.0 - 1.0, işaret yönü verir)
+        """
+        # Motor tepkisi: birinci dereceden gecikme
+        alpha = min(1.0, dt / self.time_constant) if self.time_constant > 0 else 1.0
+        self.left_velocity += (left_command * self.max_wheel_speed - self.left_velocity) * alpha
+        self.right_velocity += (right_command * self.max_wheel_speed - self.right_velocity) * alpha
+
+        # Dünya y aşağı: sola dönüş yön açısını azaltır
+        v = self.speed
+        omega = (self.right_velocity - self.left_velocity) / self.wheel_base
+        self.heading -= omega * dt
+        self.x += v * math.cos(self.heading) * dt
+        self.y += v * math.sin(self.heading) * dt
+
+class SimulatedCamera(FrameSource):
+    def __init__(self, world, robot, clock, frame_rate=config.CAMERA_FRAMERATE,
+                 noise_sigma=config.SIM_NOISE_SIGMA, lores_size=None, compute_scale=1.0, seed=0):
+        """
+        Simüle kamera başlatıcı - CameraCapture ile aynı read() arayüzü
+
+        Args:
+            world: TrackWorld
+            robot: DifferentialDriveModel (kare bu pozdan üretilir)
+            clock: SimulatedClock
+            frame_rate (float): Sensör kare hızı
+            noise_sigma (float): Görüntü gürültüsü
+            lores_size (tuple): Verilirse lores Y düzlemi taklit edilir (genişlik, yükseklik)
+            compute_scale (float): Kontrol kodunun gerçek işlem süresinin simülasyon saatine
+                eklenirken çarpılacağı katsayı (ör. Raspberry Pi daha yavaşsa > 1)
+            seed (int): Gürültü için rastgele sayı tohumu
+        """
+        self.world = world
+        self.robot = robot
+        self.clock = clock
+        self.frame_period = 1.0 / frame_rate
+        self.noise_sigma = noise_sigma
+        self.lores_size = lores_size
+        self.compute_scale = compute_scale
+        self.rng = np.random.default_rng(seed)
+
+        # Gürültü bankası: her karede yeni Gauss gürültüsü üretmek kareden pahalı, önceden üretilir
+        self._noise_bank = []
+        if noise_sigma > 0:
+            shape = (world.camera.height_px, world.camera.width, 3)
+            self._noise_bank = [np.clip(self.rng.normal(0, noise_sigma, shape), -128, 127).astype(np.int8)
+                                for _ in range(8)]
+
+        self._throttle = None
+        self._next_frame_time = clock.now
+        self._latest = None
+        self._frame_id = 0
+        self._returned_wall = None
+
+        # Kontrol kodunun iki read() arasındaki gerçek işlem süreleri (ms)
+        self.loop_latencies = []
+        self.frames_rendered = 0
+        self.frames_reused = 0
+
+    def set_throttle(self, interval):
+        """
+        Kare üretim aralığını sınırlar (None: sensör hızı)
+        """
+        self._throttle = interval
+
+    def _render(self):
+        frame = self.world.render_view(self.robot.pose)
+        if self._noise_bank:
+            noise = self._noise_bank[self.rng.integers(len(self._noise_bank))]
+            frame = cv2.add(frame, noise, dtype=cv2.CV_8U)
+        gray = None
+        if self.lores_size is not None:
+            gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), self.lores_size,
+                              interpolation=cv2.INTER_AREA)
+        return FrameContext(frame, gray=gray)
+
+    def read(self, wait_new=False, timeout=None):
+        """
+        Simülasyon saatine göre en yeni kareyi döndürür
+
+        Returns:
+            ctx, frame_id, timestamp, is_new: CameraCapture.read() ile aynı
+        """
+        # Önceki read()'den bu yana geçen gerçek süre = kontrol kodunun işlem süresi
+        wall = time.perf_counter()
+        if self._returned_wall is not None:
+            compute = wall - self._returned_wall
+            self.loop_latencies.append(compute * 1000.0)
+            self.clock.advance(compute * self.compute_scale)
+
+        if wait_new and self.clock.now < self._next_frame_time:
+            self.clock.advance(self._next_frame_time - self.clock.now)
+
+        is_new = False
+        if self.clock.now + 1e-9 >= self._next_frame_time:
+            self._frame_id += 1
+            self._latest = (self._render(), self._frame_id, self.clock.now)
+            self.frames_rendered += 1
+            period = max(self.frame_period, self._throttle or 0.0)
+            self._next_frame_time = max(self._next_frame_time + period, self.clock.now + period / 2)
+            is_new = True
+        else:
+            self.frames_reused += 1
+
+        self._returned_wall = time.perf_counter()
+        ctx, frame_id, timestamp = self._latest
+        return ctx, frame_id, timestamp, is_new
+
+    def get_stats(self):
+        return {"frames": self.frames_rendered, "reused": self.frames_reused}
+
+    def format_stats(self):
+        return f"Üretilen kare: {self.frames_rendered}, Tekrar kullanılan: {self.frames_reused}"
+
+class TrackSimulator:
+    def __init__(self, world, start_s=20.0, start_lateral=-config.TRACK_WIDTH / 4,
+                 target_lateral=-config.TRACK_WIDTH / 4, max_time=120.0,
+                 stuck_time=config.CROSSWALK_STOP_TIME + 5.0, finish_margin=config.SIM_FINISH_MARGIN,
+                 lores=config.CAMERA_MODE == "video", compute_scale=1.0,
+                 noise_sigma=config.SIM_NOISE_SIGMA, seed=0, log_level="ERROR"):
+        """
+        Pist simülatörü başlatıcı
+
+        Args:
+            world: TrackWorld
+            start_s (float): Başlangıç konumu (merkez çizgisi boyunca, cm)
+            start_lateral (float): Başlangıç yanal konumu (cm, sol pozitif)
+            target_lateral (float): Sapmanın ölçüleceği şerit merkezi (cm, varsayılan sağ şerit)
+            max_time (float): Simülasyon süre sınırı (simüle saniye)
+            stuck_time (float): Bu süre boyunca ilerleme olmazsa robot takıldı sayılır
+            finish_margin (float): Bitiş çizgisinin pist sonundan önceki mesafesi (cm) - çizgiler pist
+                                   sonunda biter, robot son santimetrelerde şeridi kaybedip durur
+            lores (bool): Lores Y düzlemini taklit et
+            compute_scale (float): İşlem süresi çarpanı (SimulatedCamera)
+            noise_sigma (float): Görüntü gürültüsü
+            seed (int): Rastgele sayı tohumu
+            log_level (str): Kontrol döngüsü log seviyesi
+        """
+        self.world = world
+        self.log_level = log_level
+        self.target_lateral = target_lateral
+        self.max_time = max_time
+        self.stuck_time = stuck_time
+        self.finish_s = world.length - finish_margin
+
+        self.clock = SimulatedClock()
+        self.robot = DifferentialDriveModel(world.pose_at(start_s, start_lateral))
+        lores_size = config.CAMERA_LORES_RESOLUTION if lores else None
+        self.camera = SimulatedCamera(world, self.robot, self.clock, noise_sigma=noise_sigma,
+                                      lores_size=lores_size, compute_scale=compute_scale, seed=seed)
+        self.motors = None
+
+        # Pist üzerindeki konum ve ölçümler
+        self.s, self.lateral, self._track_index = world.locate(self.robot.x, self.robot.y)
+        self.result = None
+        self.lap_time = None
+        self.max_s = self.s
+        self._progress_time = self.clock.now
+        self._deviation_sq_sum = 0.0
+        self._deviation_abs_sum = 0.0
+        self._deviation_max = 0.0
+        self._sampled_time = 0.0
+        self._touching = set()
+        self.collisions = []
+
+        self._physics_remainder = 0.0
+        self.clock.add_listener(self._on_clock_advance)
+
+    def _wheel_commands(self):
+        """
+        Sahte GPIO pinlerinden tekerlek komutlarını okur (PWM görev oranı x yön)
+        """
+        motors = self.motors
+        if motors is None or not getattr(motors, "gpio_ok", False):
+            return 0.0, 0.0
+        left = motors.left_ena.value * motors.left_motor.value
+        right = motors.right_ena.value * motors.right_motor.value
+        return left, right
+
+    def _on_clock_advance(self, dt):
+        """
+        Saat ilerledikçe fizik modelini sabit adımlarla entegre eder
+        """
+        left, right = self._wheel_commands()
+        self._physics_remainder += dt
+        step = config.SIM_PHYSICS_STEP
+        while self._physics_remainder > 1e-9:
+            h = min(step, self._physics_remainder)
+            self.robot.step(h, left, right)
+            self._physics_remainder -= h
+            self._update_track_state(h)
+
+    def _update_track_state(self, dt):
+        """
+        Pist üzerindeki konumu, sapma istatistiklerini ve çarpışmaları günceller
+        """
+        self.s, self.lateral, self._track_index = self.world.locate(
+            self.robot.x, self.robot.y, hint=self._track_index)
+
+        deviation = abs(self.lateral - self.target_lateral)
+        self._deviation_sq_sum += deviation * deviation * dt
+        self._deviation_abs_sum += deviation * dt
+        self._deviation_max = max(self._deviation_max, deviation)
+        self._sampled_time += dt
+
+        if self.s > self.max_s + 1.0:
+            self.max_s = self.s
+            self._progress_time = self.clock.now
+
+        # Engel ile temas: robot ve engel ayak izleri pist koordinatlarında örtüşüyor mu?
+        for i, obstacle in enumerate(self.world.obstacles):
+            width, length, _ = obstacle.size
+            touching = (abs(self.s - obstacle.s) < (length + config.ROBOT_LENGTH) / 2 and
+                        abs(self.lateral - obstacle.lateral) < (width + config.ROBOT_WIDTH) / 2)
+            if touching and i not in self._touching:
+                self.collisions.append({"color": obstacle.color, "time": round(self.clock.elapsed, 3)})
+                log(f"{obstacle.color} engele çarpıldı (t={self.clock.elapsed:.2f} s)")
+                self._touching.add(i)
+            elif not touching:
+                self._touching.discard(i)
+
+    def should_stop(self):
+        """
+        Kontrol döngüsünün bitip bitmeyeceğine karar verir (run_robot için)
+        """
+        if self.s >= self.finish_s:
+            self.result = "finished"
+            self.lap_time = self.clock.elapsed
+        elif abs(self.lateral) > config.TRACK_WIDTH / 2 + config.ROBOT_WIDTH:
+            self.result = "off_track"
+        elif self.clock.elapsed >= self.max_time:
+            self.result = "timeout"
+        elif self.clock.now - self._progress_time >= self.stuck_time:
+            self.result = "stuck"
+        return self.result is not None
+
+    def run(self):
+        """
+        Simülasyonu çalıştırır
+
+        Returns:
+            report: Sonuç sözlüğü (tur süresi, şerit sapması, döngü gecikmesi)
+        """
+        logger.remove()
+        logger.add(sys.stderr, level=self.log_level)
+
+        # main modülü içe aktarılırken kamera bulunamadı hataları basılmasın
+        logger.disable("main")
+        import main as robot_main
+        logger.enable("main")
+
+        # main.py içe aktarılırken eklenen log hedeflerini kaldır
+        logger.remove()
+        logger.add(sys.stderr, level=self.log_level)
+
+        import motor_controller
+        import loop_scheduler
+        import maneuver
+        import line_detector
+        import obstacle_detector
+        from line_detector import LineDetector
+        from obstacle_detector import ObstacleDetector
+
+        # Sentetik kareler ideal iğne deliği kamerasıyla üretilir, lens düzeltmesi uygulanmaz
+        set_lens_correction(None)
+
+        # Kontrol döngüsünün kullandığı time modülünü simülasyon saati ile değiştir
+        patched_modules = [robot_main, motor_controller, loop_scheduler, maneuver,
+                           line_detector, obstacle_detector]
+        originals = [module.time for module in patched_modules]
+        for module in patched_modules:
+            module.time = self.clock
+
+        # Gerçek MotorController sahte pinlere yazar
+        Device.pin_factory = MockFactory(pin_class=MockPWMPin)
+        self.motors = motor_controller.MotorController()
+
+        self.profiler = LatencyProfiler()
+        wall_start = time.perf_counter()
+        scheduler = None
+        try:
+            scheduler = robot_main.run_robot(self.camera, self.motors, LineDetector(), ObstacleDetector(),
+                                             should_stop=self.should_stop, profiler=self.profiler)
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            for module, original in zip(patched_modules, originals):
+                module.time = original
+            self.motors.cleanup()
+            Device.pin_factory.close()
+
+        return self._build_report(wall_time, scheduler)
+
+    def _build_report(self, wall_time, scheduler):
+        """
+        Simülasyon sonucunu özetler
+        """
+        latencies = np.array(self.camera.loop_latencies) if self.camera.loop_latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        sampled = max(self._sampled_time, 1e-9)
+        sim_time = self.clock.elapsed
+
+        return {
+            "result": self.result,
+            "lap_time_s": round(self.lap_time, 3) if self.lap_time is not None else None,
+            "sim_time_s": round(sim_time, 3),
+            "wall_time_s": round(wall_time, 3),
+            "realtime_factor": round(sim_time / wall_time, 2) if wall_time > 0 else None,
+            "distance_cm": round(self.max_s, 1),
+            "track_length_cm": round(self.world.length, 1),
+            "finish_cm": round(self.finish_s, 1),
+            "lane_deviation_cm": {
+                "mean": round(float(self._deviation_abs_sum / sampled), 2),
+                "rms": round(math.sqrt(self._deviation_sq_sum / sampled), 2),
+                "max": round(float(self._deviation_max), 2),
+            },
+            "collisions": self.collisions,
+            "loop_latency_ms": {
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(latencies.max()), 3),
+            },
+            "iterations": len(self.camera.loop_latencies),
+            "frames": self.camera.frames_rendered,
+            "loop_timing": scheduler.get_stats() if scheduler is not None else None,
+            "stage_latency_ms": {stage: {key: round(value, 3) for key, value in stats.items()}
+                                 for stage, stats in self.profiler.get_stats().items()},
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Kapalı döngü pist simülatörü")
+    parser.add_argument("--track", choices=["competition", "straight"], default="competition", help="Pist")
+    parser.add_argument("--start-s", type=float, default=20.0, help="Başlangıç konumu (cm)")
+    parser.add_argument("--start-lateral", type=float, default=-config.TRACK_WIDTH / 4,
+                        help="Başlangıç yanal konumu (cm, sol pozitif)")
+    parser.add_argument("--max-time", type=float, default=120.0, help="Süre sınırı (simüle saniye)")
+    parser.add_argument("--compute-scale", type=float, default=1.0,
+                        help="İşlem süresi çarpanı (hedef donanım bu makineden kaç kat yavaş)")
+    parser.add_argument("--noise", type=float, default=config.SIM_NOISE_SIGMA, help="Görüntü gürültüsü")
+    parser.add_argument("--no-lores", action="store_true", help="Lores Y düzlemini taklit etme")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgele sayı tohumu")
+    parser.add_argument("--log-level", default="ERROR", help="Kontrol döngüsü log seviyesi (ör. INFO)")
+    parser.add_argument("--output", help="Sonuç JSON dosyası")
+    args = parser.parse_args()
+
+    if not GPIOZERO_AVAILABLE:
+        return 1
+
+    world = competition_track() if args.track == "competition" else straight_track()
+    simulator = TrackSimulator(world, start_s=args.start_s, start_lateral=args.start_lateral,
+                               max_time=args.max_time, lores=not args.no_lores and config.CAMERA_MODE == "video",
+                               compute_scale=args.compute_scale, noise_sigma=args.noise, seed=args.seed,
+                               log_level=args.log_level)
+
+    log(f"Pist: {args.track} ({world.length:.0f} cm), simülasyon başlıyor...")
+    report = simulator.run()
+
+    deviation = report["lane_deviation_cm"]
+    latency = report["loop_latency_ms"]
+    log(f"Sonuç: {report['result']}, Tur süresi: {report['lap_time_s']} s, "
+        f"Mesafe: {report['distance_cm']:.0f}/{report['finish_cm']:.0f} cm (pist {report['track_length_cm']:.0f} cm)")
+    log(f"Şerit sapması: ort {deviation['mean']:.1f} cm, RMS {deviation['rms']:.1f} cm, maks {deviation['max']:.1f} cm")
+    log(f"Döngü gecikmesi: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, p99 {latency['p99']:.2f} ms")
+    log(f"Çarpışma: {len(report['collisions'])}, Simüle süre: {report['sim_time_s']} s, "
+        f"Gerçek süre: {report['wall_time_s']} s (x{report['realtime_factor']})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        log(f"Sonuçlar kaydedildi: {args.output}")
+
+    return 0 if report["result"] == "finished" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())